@@ -0,0 +1,72 @@
+"""
+Compare the HTML table renderers: fasthtml elements appended row by row (the
+previous `DataTable`), a per-row f-string loop (the previous `NotesTable`)
+and the column-at-a-time `render_table`.
+
+Run from the project root:
+
+    python benchmarks/bench_html_table.py [max_rows]
+"""
+import sys
+import timeit
+from html import escape
+from pathlib import Path
+
+import pandas as pd
+from fasthtml.common import Table, Td, Th, Tr, to_xml
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root / "report"))
+
+from base_components.data_table import iter_table, render_table
+
+# The element-per-row table is quadratic; larger sizes would take minutes
+MAX_ELEMENT_ROWS = 10_000
+
+
+def notes_frame(rows):
+    dates = pd.date_range("2023-01-01", periods=rows, freq="h").strftime("%Y-%m-%d")
+    notes = [f"Note {i} <mentions> \"quotes\" & ampersands" for i in range(rows)]
+    return pd.DataFrame({"note_date": dates, "note": notes})
+
+
+def element_table(df):
+    table = Table(Tr(Th(column) for column in df.columns))
+    for data_row in df.to_numpy():
+        table.children = (*table.children, Tr(Td(val) for val in data_row))
+    return to_xml(table)
+
+
+def loop_table(df):
+    header = "".join(f"<th>{escape(str(column))}</th>" for column in df.columns)
+    rows = "".join(
+        f"<tr><td>{escape(str(note_date))}</td><td>{escape(str(note))}</td></tr>"
+        for note_date, note in zip(df["note_date"], df["note"])
+    )
+    return f"<table><thead><tr>{header}</tr></thead><tbody>{rows}</tbody></table>"
+
+
+def best_of(function, df, repeat=3):
+    return min(timeit.repeat(lambda: function(df), number=1, repeat=repeat))
+
+
+def main(max_rows=100_000):
+    sizes = [rows for rows in (1_000, 10_000, 100_000, 1_000_000) if rows <= max_rows]
+    print(f"{'rows':>9}{'elements':>12}{'loop':>10}{'columns':>10}{'us/row':>8}{'speedup':>9}")
+    for rows in sizes:
+        df = notes_frame(rows)
+        assert render_table(df) == loop_table(df)
+        elements = f"{best_of(element_table, df, 1):>11.3f}s" if rows <= MAX_ELEMENT_ROWS else f"{'-':>12}"
+        loop = best_of(loop_table, df)
+        columns = best_of(render_table, df)
+        print(f"{rows:>9}{elements}{loop:>9.3f}s{columns:>9.3f}s{columns / rows * 1e6:>8.2f}{loop / columns:>8.2f}x")
+
+    # Streaming yields the same table in bounded chunks
+    df = notes_frame(sizes[-1])
+    chunks = list(iter_table(df))
+    assert "".join(chunks) == render_table(df)
+    print(f"Streamed {len(df)} rows in {len(chunks)} chunks of at most {max(map(len, chunks))} characters")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
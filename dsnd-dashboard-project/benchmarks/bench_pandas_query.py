@@ -0,0 +1,83 @@
+"""
+Compare `pd.read_sql_query` with the typed columnar path of `pandas_query`.
+
+Run from the project root:
+
+    python benchmarks/bench_pandas_query.py [repeat]
+"""
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import pandas as pd
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from python_package.employee_events import Employee, configure_cache, configure_pool, get_pool
+from python_package.employee_events.migrations import migrate
+from python_package.employee_events.query_base import COLUMN_DTYPES
+from python_package.employee_events.sql_execution import typed_frame
+
+QUERIES = {
+    "event_counts": """
+        SELECT event_date,
+            SUM(positive_events) AS total_positive_events,
+            SUM(negative_events) AS total_negative_events
+        FROM employee_events
+        WHERE employee_id = ?
+        GROUP BY event_date
+        ORDER BY event_date
+    """,
+    "notes": "SELECT note_date, note FROM notes WHERE employee_id = ? ORDER BY note_date",
+    "model_data": """
+        SELECT SUM(positive_events) AS positive_events,
+            SUM(negative_events) AS negative_events
+        FROM employee_events
+        WHERE employee_id = ?
+    """,
+}
+
+
+def main(repeat=2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / "employee_events.db"
+        shutil.copy(project_root / "python_package" / "employee_events" / "employee_events.db", db_copy)
+        migrate(db_copy)
+        configure_pool(db_path=db_copy)
+        # Measure the fetch itself, not the result cache
+        configure_cache(maxsize=0)
+        connection = get_pool().connection()
+
+        def read_sql(sql):
+            return pd.read_sql_query(sql, connection, params=[1])
+
+        def typed(sql):
+            cursor = connection.execute(sql, [1])
+            try:
+                return typed_frame(cursor, COLUMN_DTYPES)
+            finally:
+                cursor.close()
+
+        print(f"{'query':<14}{'read_sql_query':>16}{'typed':>12}{'speedup':>10}")
+        for name, sql in QUERIES.items():
+            assert read_sql(sql).equals(typed(sql))
+            baseline = timeit.timeit(lambda: read_sql(sql), number=repeat) / repeat
+            fast = timeit.timeit(lambda: typed(sql), number=repeat) / repeat
+            print(f"{name:<14}{baseline * 1e6:>14.1f}us{fast * 1e6:>10.1f}us{baseline / fast:>9.2f}x")
+
+        # End to end through Employee, still with the cache disabled
+        employee = Employee()
+        with contextlib.redirect_stdout(io.StringIO()):
+            per_call = timeit.timeit(lambda: employee.event_counts(1), number=repeat) / repeat
+        print(f"Employee.event_counts: {per_call * 1e6:.1f}us per call")
+
+        configure_pool()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
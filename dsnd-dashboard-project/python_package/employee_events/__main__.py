@@ -2,6 +2,11 @@ import sys
 from .query_base import QueryBase
 from .employee import Employee
 from .team import Team
+from .sql_execution import db_path
+from .migrations import migrate, MIGRATIONS
+from .rollups import refresh_rollups
+from .ingest import ingest_csv
+from .risk import load_predictor, model_version, refresh_risk_scores
 
 def display_help():
     print("Usage: python -m employee_events [command] [options]")
@@ -9,6 +14,10 @@ def display_help():
     print("  query_base: Test QueryBase functionality.")
     print("  employee: Test Employee functionality.")
     print("  team: Test Team functionality.")
+    print("  migrate [db_path]: Apply pending schema migrations and run ANALYZE.")
+    print("  refresh [db_path] [--full]: Refresh the event rollup tables.")
+    print("  ingest events|notes csv_path [db_path]: Append a CSV batch of events or notes.")
+    print("  score model_path [db_path] [--force]: Re-score recruitment risk if the data or model changed.")
 
 def main():
     if len(sys.argv) < 2:
@@ -29,6 +38,32 @@ def main():
         team = Team()
         print("Testing Team:")
         print(team.names())
+    elif command == "migrate":
+        path = sys.argv[2] if len(sys.argv) > 2 else db_path
+        applied = migrate(path)
+        if applied:
+            print(f"Applied migrations {applied} to {path}")
+        else:
+            print(f"{path} is already at schema version {len(MIGRATIONS)}")
+    elif command == "refresh":
+        args = [arg for arg in sys.argv[2:] if arg != "--full"]
+        path = args[0] if args else db_path
+        result = refresh_rollups(path, full="--full" in sys.argv[2:])
+        print(f"Rolled up {result['days']} employee-days from {result['start'] or 'the beginning'} "
+              f"to {result['watermark']} in {path}")
+    elif command == "ingest" and len(sys.argv) >= 4:
+        path = sys.argv[4] if len(sys.argv) > 4 else db_path
+        result = ingest_csv(sys.argv[2], sys.argv[3], path)
+        print(f"Batch {result['batch_id']}: wrote {result['events']} events and {result['notes']} notes to {path}")
+    elif command == "score" and len(sys.argv) >= 3:
+        args = [arg for arg in sys.argv[2:] if arg != "--force"]
+        path = args[1] if len(args) > 1 else db_path
+        result = refresh_risk_scores(load_predictor(args[0]), model_version(args[0]), path,
+                                     force="--force" in sys.argv[2:])
+        if result["scored"]:
+            print(f"Scored {result['employees']} employees and {result['teams']} teams in {path}")
+        else:
+            print(f"Risk scores in {path} are up to date")
     else:
         print(f"Unknown command: {command}")
         display_help()
@@ -1,5 +1,6 @@
-from .query_base import QueryBase
-from .sql_execution import QueryMixin
+from .query_base import QueryBase, ids_param, COLUMN_DTYPES
+from .sql_execution import QueryMixin, async_method
+import pandas as pd
 
 class Employee(QueryBase, QueryMixin):
     """
@@ -13,6 +14,10 @@ class Employee(QueryBase, QueryMixin):
 
     name = "employee"
 
+    async_username = async_method("username")
+    async_model_data = async_method("model_data")
+    async_model_data_many = async_method("model_data_many")
+
     def names(self):
         """
         Retrieves a list of all employees with their full names and IDs.
@@ -73,6 +78,8 @@ class Employee(QueryBase, QueryMixin):
         """
         Retrieves aggregated event data for a specific employee.
 
+        Reads the `employee_event_totals` rollup when it is fresh.
+
         SQL Query:
         ----------
         SELECT SUM(positive_events) AS positive_events,
@@ -96,13 +103,58 @@ class Employee(QueryBase, QueryMixin):
         if not isinstance(id, int):
             raise ValueError(f"Expected an integer for ID, but got {type(id).__name__}")
 
-        sql_query = """
+        source = "employee_event_totals" if self.rollups_fresh() else "employee_events"
+        sql_query = f"""
             SELECT 
                 SUM(positive_events) AS positive_events,
                 SUM(negative_events) AS negative_events
             FROM employee
-            JOIN employee_events
+            JOIN {source}
             USING(employee_id)
             WHERE employee.employee_id = ?
         """
-        return self.pandas_query(sql_query, [id])
+        return self.pandas_query(sql_query, [id], dtypes=COLUMN_DTYPES)
+
+    def model_data_many(self, ids):
+        """
+        Retrieves aggregated event data for several employees in one query.
+
+        Reads the `employee_event_totals` rollup when it is fresh.
+
+        SQL Query:
+        ----------
+        SELECT employee_id,
+               SUM(positive_events) AS positive_events,
+               SUM(negative_events) AS negative_events
+        FROM employee_events
+        WHERE employee_id IN (SELECT value FROM json_each(?))
+        GROUP BY employee_id
+
+        Parameters:
+        ----------
+        ids : iterable of int
+            The employees' IDs.
+
+        Returns:
+        -------
+        pandas.DataFrame
+            A DataFrame with one row per employee containing:
+            - Employee ID
+            - Sum of positive events
+            - Sum of negative events
+        """
+        source = "employee_event_totals" if self.rollups_fresh() else "employee_events"
+        sql_query = f"""
+            SELECT 
+                employee_id,
+                SUM(positive_events) AS positive_events,
+                SUM(negative_events) AS negative_events
+            FROM {source}
+            WHERE employee_id IN (SELECT value FROM json_each(?))
+            GROUP BY employee_id
+            ORDER BY employee_id
+        """
+        df = self.pandas_query(sql_query, [ids_param(ids)], dtypes=COLUMN_DTYPES)
+        if df.empty:
+            return pd.DataFrame(columns=["employee_id", "positive_events", "negative_events"])
+        return df
@@ -0,0 +1,157 @@
+import csv
+from pathlib import Path
+from .sql_execution import connect_writer, transaction
+from .migrations import schema_version
+from . import rollups
+
+# Schema version that added the unique indexes the upserts rely on
+INGEST_SCHEMA_VERSION = 7
+
+EVENT_COLUMNS = ["event_date", "employee_id", "team_id", "positive_events", "negative_events"]
+NOTE_COLUMNS = ["employee_id", "team_id", "note", "note_date"]
+
+# A missing team_id is looked up from the employee table
+INSERT_EVENT_SQL = """
+    INSERT INTO employee_events (event_date, employee_id, team_id, positive_events, negative_events)
+    VALUES (
+        :event_date,
+        :employee_id,
+        COALESCE(:team_id, (SELECT team_id FROM employee WHERE employee_id = :employee_id)),
+        :positive_events,
+        :negative_events
+    )
+    ON CONFLICT (employee_id, event_date) DO UPDATE SET
+        team_id = excluded.team_id,
+        positive_events = excluded.positive_events,
+        negative_events = excluded.negative_events
+"""
+
+# Notes keep team_id as given: an employee note has none, or it would also
+# be listed on its team's report
+INSERT_NOTE_SQL = """
+    INSERT INTO notes (employee_id, team_id, note, note_date)
+    VALUES (:employee_id, :team_id, :note, :note_date)
+    ON CONFLICT (employee_id, note_date, note) DO NOTHING
+"""
+
+# Team notes have no employee_id, which never conflicts on the index above
+INSERT_TEAM_NOTE_SQL = """
+    INSERT INTO notes (employee_id, team_id, note, note_date)
+    VALUES (:employee_id, :team_id, :note, :note_date)
+    ON CONFLICT (team_id, note_date, note) WHERE employee_id IS NULL DO NOTHING
+"""
+
+
+def _records(rows, columns, owners=("employee_id",)):
+    """
+    Normalize rows (mappings or a DataFrame) to dicts holding every column.
+
+    Every row must have at least one of the `owners` columns.
+    """
+    if hasattr(rows, "to_dict"):
+        rows = rows.to_dict("records")
+    records = []
+    for row in rows:
+        record = {column: row.get(column) for column in columns}
+        if all(record[owner] is None for owner in owners):
+            raise ValueError(f"Row is missing {' or '.join(owners)}: {row}")
+        records.append(record)
+    return records
+
+
+def _log_batch(connection, kind, rows) -> int:
+    """
+    Record a batch in `ingest_log`, bumping the ingested data version.
+    """
+    return connection.execute(
+        "INSERT INTO ingest_log (kind, rows, ingested_at) VALUES (?, ?, datetime('now'))",
+        [kind, rows],
+    ).lastrowid
+
+
+def ingest(events=(), notes=(), db_path=None) -> dict:
+    """
+    Append a batch of events and notes in one transaction and update the rollups.
+
+    Events are de-duplicated on `(employee_id, event_date)`: a row for an
+    existing employee and day replaces its counts. Notes that already exist
+    are skipped; notes of an employee are unique per employee, day and
+    text, team notes (no `employee_id`) per team, day and text. Readers
+    keep querying the previous snapshot (WAL) until the transaction
+    commits.
+
+    Parameters:
+    ----------
+    events : iterable of dict or pandas.DataFrame, optional
+        Rows with `event_date`, `employee_id`, `positive_events`,
+        `negative_events` and optionally `team_id`.
+    notes : iterable of dict or pandas.DataFrame, optional
+        Rows with `note`, `note_date` and `employee_id` (an employee's note)
+        or `team_id` (a team's note).
+    db_path : str or pathlib.Path, optional
+        Path to the SQLite database. Defaults to the configured database.
+
+    Returns:
+    -------
+    dict
+        `batch_id` (the new data version), `events` and `notes` (rows written).
+
+    Raises:
+    ------
+    RuntimeError
+        If the database has not been migrated far enough.
+    ValueError
+        If an event has no `employee_id`, or a note has neither `employee_id` nor `team_id`.
+    """
+    events = _records(events, EVENT_COLUMNS)
+    notes = _records(notes, NOTE_COLUMNS, owners=("employee_id", "team_id"))
+    employee_notes = [row for row in notes if row["employee_id"] is not None]
+    team_notes = [row for row in notes if row["employee_id"] is None]
+
+    connection = connect_writer(db_path)
+    try:
+        if schema_version(connection) < INGEST_SCHEMA_VERSION:
+            raise RuntimeError(
+                "Database schema is too old for ingestion; run `python -m employee_events migrate` first."
+            )
+        with transaction(connection):
+            written_events = written_notes = 0
+            if events:
+                written_events = connection.executemany(INSERT_EVENT_SQL, events).rowcount
+                rollups.refresh(connection, since=min(str(row["event_date"]) for row in events))
+            if employee_notes:
+                written_notes += connection.executemany(INSERT_NOTE_SQL, employee_notes).rowcount
+            if team_notes:
+                written_notes += connection.executemany(INSERT_TEAM_NOTE_SQL, team_notes).rowcount
+            kind = "+".join(kind for kind, rows in (("events", events), ("notes", notes)) if rows)
+            batch_id = _log_batch(connection, kind or "empty", written_events + written_notes)
+    finally:
+        connection.close()
+
+    return {"batch_id": batch_id, "events": written_events, "notes": written_notes}
+
+
+def ingest_csv(kind, csv_path, db_path=None) -> dict:
+    """
+    Ingest a CSV file of events or notes whose header names the columns.
+
+    Parameters:
+    ----------
+    kind : str
+        `events` or `notes`.
+    csv_path : str or pathlib.Path
+        Path to the CSV file.
+    db_path : str or pathlib.Path, optional
+        Path to the SQLite database. Defaults to the configured database.
+
+    Returns:
+    -------
+    dict
+        See `ingest`.
+    """
+    if kind not in ("events", "notes"):
+        raise ValueError(f"Expected 'events' or 'notes', but got {kind!r}")
+
+    with Path(csv_path).open(newline="") as file:
+        rows = [{key: value or None for key, value in row.items()} for row in csv.DictReader(file)]
+    return ingest(**{kind: rows}, db_path=db_path)
@@ -0,0 +1,295 @@
+from sqlite3 import complete_statement
+from .sql_execution import connect_writer, transaction
+from . import rollups
+
+
+def _execute_all(connection, sql_script):
+    """
+    Execute `;`-separated statements inside the caller's transaction.
+
+    Unlike `executescript`, this never commits a pending transaction.
+    Statements with nested `;` (trigger bodies) are kept whole.
+    """
+    statement = ""
+    for part in sql_script.split(";"):
+        statement += part + ";"
+        if complete_statement(statement):
+            if statement.strip(" \n;"):
+                connection.execute(statement)
+            statement = ""
+
+
+def _drop_pandas_index(connection, table):
+    """
+    Drop the `index` column (and its index) that `DataFrame.to_sql` adds to a table.
+    """
+    columns = [row[1] for row in connection.execute(f'PRAGMA table_info("{table}")')]
+    if "index" in columns:
+        connection.execute(f'DROP INDEX IF EXISTS "ix_{table}_index"')
+        connection.execute(f'ALTER TABLE "{table}" DROP COLUMN "index"')
+
+
+def migration_1(connection):
+    """
+    Drop the pandas `index` columns and add covering indexes for the report queries.
+
+    The event indexes hold every column the per-entity queries read, so
+    `WHERE employee_id = ?` / `WHERE team_id = ?` with `GROUP BY event_date`
+    are answered by an index-only scan in date order.
+    """
+    for table in ("employee", "team", "notes", "employee_events"):
+        _drop_pandas_index(connection, table)
+
+    _execute_all(connection, """
+        CREATE UNIQUE INDEX IF NOT EXISTS employee_employee_id
+            ON employee (employee_id);
+        CREATE UNIQUE INDEX IF NOT EXISTS team_team_id
+            ON team (team_id);
+        CREATE INDEX IF NOT EXISTS employee_events_employee_covering
+            ON employee_events (employee_id, event_date, positive_events, negative_events);
+        CREATE INDEX IF NOT EXISTS employee_events_team_covering
+            ON employee_events (team_id, event_date, positive_events, negative_events);
+        CREATE INDEX IF NOT EXISTS notes_employee_covering
+            ON notes (employee_id, note_date, note);
+        CREATE INDEX IF NOT EXISTS notes_team_covering
+            ON notes (team_id, note_date, note);
+    """)
+
+
+def migration_2(connection):
+    """
+    Add the daily/lifetime event rollup tables.
+
+    See `rollups.refresh` for the contents of each table. The `event_date`
+    indexes let incremental refreshes touch only the newest days.
+    """
+    _execute_all(connection, """
+        CREATE INDEX IF NOT EXISTS employee_events_event_date
+            ON employee_events (event_date);
+        CREATE TABLE IF NOT EXISTS employee_daily_events (
+            employee_id INTEGER NOT NULL,
+            event_date TEXT NOT NULL,
+            team_id INTEGER NOT NULL,
+            positive_events INTEGER NOT NULL,
+            negative_events INTEGER NOT NULL,
+            PRIMARY KEY (employee_id, event_date, team_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS employee_daily_events_event_date
+            ON employee_daily_events (event_date);
+        CREATE TABLE IF NOT EXISTS team_daily_events (
+            team_id INTEGER NOT NULL,
+            event_date TEXT NOT NULL,
+            positive_events INTEGER NOT NULL,
+            negative_events INTEGER NOT NULL,
+            PRIMARY KEY (team_id, event_date)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS team_daily_events_event_date
+            ON team_daily_events (event_date);
+        CREATE TABLE IF NOT EXISTS employee_event_totals (
+            employee_id INTEGER NOT NULL,
+            team_id INTEGER NOT NULL,
+            positive_events INTEGER NOT NULL,
+            negative_events INTEGER NOT NULL,
+            PRIMARY KEY (employee_id, team_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS employee_event_totals_team_covering
+            ON employee_event_totals (team_id, employee_id, positive_events, negative_events);
+        CREATE TABLE IF NOT EXISTS rollup_state (
+            name TEXT PRIMARY KEY,
+            watermark TEXT,
+            max_rowid INTEGER,
+            refreshed_at TEXT
+        );
+    """)
+
+
+def migration_3(connection):
+    """
+    Add the cumulative event series tables kept next to the daily rollups.
+    """
+    for name in ("employee", "team"):
+        _execute_all(connection, f"""
+            CREATE TABLE IF NOT EXISTS {name}_cumulative_events (
+                {name}_id INTEGER NOT NULL,
+                event_date TEXT NOT NULL,
+                positive_events INTEGER NOT NULL,
+                negative_events INTEGER NOT NULL,
+                PRIMARY KEY ({name}_id, event_date)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS {name}_cumulative_events_event_date
+                ON {name}_cumulative_events (event_date);
+        """)
+
+
+def migration_4(connection):
+    """
+    Make events unique per employee and day, notes unique per employee, day and text,
+    and add the ingestion log.
+
+    Existing duplicates are removed, keeping the most recently inserted row.
+    The unique indexes are the conflict targets of the ingestion upserts.
+    """
+    _execute_all(connection, """
+        DELETE FROM employee_events
+        WHERE rowid NOT IN (
+            SELECT MAX(rowid) FROM employee_events GROUP BY employee_id, event_date
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS employee_events_employee_date
+            ON employee_events (employee_id, event_date);
+        DELETE FROM notes
+        WHERE rowid NOT IN (
+            SELECT MAX(rowid) FROM notes GROUP BY employee_id, note_date, note
+        );
+        DROP INDEX IF EXISTS notes_employee_covering;
+        CREATE UNIQUE INDEX IF NOT EXISTS notes_employee_covering
+            ON notes (employee_id, note_date, note);
+        CREATE TABLE IF NOT EXISTS ingest_log (
+            batch_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            rows INTEGER NOT NULL,
+            ingested_at TEXT NOT NULL
+        );
+    """)
+
+
+def migration_5(connection):
+    """
+    Add the `notes_fts` full-text index over the note texts.
+
+    `notes_fts` is an external-content FTS5 table: it stores only the
+    index and reads the texts from `notes` by rowid. Triggers keep it in
+    sync with every insert, update and delete on `notes`, so the build and
+    ingestion paths need no changes of their own. Search terms are matched
+    as prefixes (see `query_base.fts_query`), so the index keeps 2- and
+    3-character prefix entries instead of stemming words.
+    """
+    _execute_all(connection, """
+        CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+            note,
+            content = 'notes',
+            content_rowid = 'rowid',
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        );
+        CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN
+            INSERT INTO notes_fts (rowid, note) VALUES (new.rowid, new.note);
+        END;
+        CREATE TRIGGER IF NOT EXISTS notes_fts_delete AFTER DELETE ON notes BEGIN
+            INSERT INTO notes_fts (notes_fts, rowid, note) VALUES ('delete', old.rowid, old.note);
+        END;
+        CREATE TRIGGER IF NOT EXISTS notes_fts_update AFTER UPDATE OF note ON notes BEGIN
+            INSERT INTO notes_fts (notes_fts, rowid, note) VALUES ('delete', old.rowid, old.note);
+            INSERT INTO notes_fts (rowid, note) VALUES (new.rowid, new.note);
+        END;
+        INSERT INTO notes_fts (notes_fts) VALUES ('rebuild');
+    """)
+
+
+def migration_6(connection):
+    """
+    Add the `risk_scores` table of batch-scored recruitment risks.
+
+    See `risk.refresh` for its contents. `risk_state` records the data and
+    model versions the scores were computed from.
+    """
+    _execute_all(connection, """
+        CREATE TABLE IF NOT EXISTS risk_scores (
+            profile TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            risk REAL NOT NULL,
+            PRIMARY KEY (profile, id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS risk_scores_rank
+            ON risk_scores (profile, risk);
+        CREATE TABLE IF NOT EXISTS risk_state (
+            name TEXT PRIMARY KEY,
+            source_version TEXT,
+            model_version TEXT,
+            scored_at TEXT
+        );
+    """)
+
+
+def migration_7(connection):
+    """
+    Make team notes (notes without an employee) unique per team, day and text.
+
+    NULL employee IDs never conflict on the employee notes index, so team
+    notes need their own conflict target. Existing duplicates are removed,
+    keeping the most recently inserted row.
+    """
+    _execute_all(connection, """
+        DELETE FROM notes
+        WHERE employee_id IS NULL AND rowid NOT IN (
+            SELECT MAX(rowid) FROM notes WHERE employee_id IS NULL GROUP BY team_id, note_date, note
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS notes_team_note
+            ON notes (team_id, note_date, note) WHERE employee_id IS NULL;
+    """)
+
+
+# Ordered list of schema migrations; a migration's version is its position + 1
+MIGRATIONS = [
+    migration_1,
+    migration_2,
+    migration_3,
+    migration_4,
+    migration_5,
+    migration_6,
+    migration_7,
+]
+
+
+def schema_version(connection) -> int:
+    """
+    Returns the schema version recorded in the database.
+
+    Parameters:
+    ----------
+    connection : sqlite3.Connection
+        A connection to the database.
+
+    Returns:
+    -------
+    int
+        The number of migrations applied, stored in `PRAGMA user_version`.
+    """
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db_path=None) -> list:
+    """
+    Apply every pending migration to the database, then refresh the planner statistics.
+
+    Each migration runs in its own transaction together with the bump of
+    `PRAGMA user_version`, so an interrupted run can simply be repeated.
+    When any migration was applied the rollup tables are rebuilt in full.
+
+    Parameters:
+    ----------
+    db_path : str or pathlib.Path, optional
+        Path to the SQLite database. Defaults to the configured database.
+
+    Returns:
+    -------
+    list[int]
+        The versions of the migrations that were applied.
+    """
+    connection = connect_writer(db_path)
+    applied = []
+    try:
+        current = schema_version(connection)
+        for version, migration in enumerate(MIGRATIONS, start=1):
+            if version <= current:
+                continue
+            with transaction(connection):
+                migration(connection)
+                connection.execute(f"PRAGMA user_version = {version}")
+            applied.append(version)
+        if applied:
+            with transaction(connection):
+                rollups.refresh(connection, full=True)
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+    return applied
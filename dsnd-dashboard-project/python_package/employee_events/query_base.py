@@ -1,5 +1,130 @@
+import json
+import re
 import pandas as pd
-from .sql_execution import QueryMixin
+from .sql_execution import QueryMixin, async_method
+from .rollups import ROLLUPS_FRESH_SQL
+from .risk import RISK_SCORES_FRESH_SQL
+
+# Result column dtypes for the columnar fast path of `pandas_query`
+COLUMN_DTYPES = {
+    "employee_id": "int64",
+    "team_id": "int64",
+    "event_date": object,
+    "note_date": object,
+    "note": object,
+    "note_id": "int64",
+    "positive_events": "int64",
+    "negative_events": "int64",
+    "total_positive_events": "int64",
+    "total_negative_events": "int64",
+    "cumulative_positive_events": "int64",
+    "cumulative_negative_events": "int64",
+    "employee_name": object,
+    "team_name": object,
+    "snippet": object,
+    "rank": "float64",
+    "risk": "float64",
+}
+
+# Markers around the matched terms in `search_notes` snippets; callers
+# replace them (e.g. with <mark> tags) after escaping the text
+SNIPPET_START = "\x02"
+SNIPPET_END = "\x03"
+
+
+def ids_param(ids) -> str:
+    """
+    Encodes a collection of IDs as one JSON array parameter for `json_each`.
+
+    Parameters:
+    ----------
+    ids : iterable of int
+        The unique identifiers of the employees or teams.
+
+    Returns:
+    -------
+    str
+        A JSON array of the sorted, de-duplicated IDs.
+    """
+    ids = set(ids)
+    for id in ids:
+        if not isinstance(id, int):
+            raise ValueError(f"Expected integer IDs, but got {type(id).__name__}")
+    return json.dumps(sorted(ids))
+
+
+def date_range_filters(column: str, start: str = None, end: str = None) -> tuple:
+    """
+    Builds the SQL conditions restricting a date column to an inclusive range.
+
+    Parameters:
+    ----------
+    column : str
+        The date column to filter on.
+    start : str, optional
+        First date (`YYYY-MM-DD`) to keep, default is no lower bound.
+    end : str, optional
+        Last date (`YYYY-MM-DD`) to keep, default is no upper bound.
+
+    Returns:
+    -------
+    tuple
+        The `AND ...` conditions to append to a `WHERE` clause and their parameters.
+    """
+    filters, params = "", []
+    if start is not None:
+        filters += f" AND {column} >= ?"
+        params.append(str(start))
+    if end is not None:
+        filters += f" AND {column} <= ?"
+        params.append(str(end))
+    return filters, params
+
+
+def fts_query(text: str) -> str:
+    """
+    Turns free text into an FTS5 query that matches notes containing every word.
+
+    Words are quoted, so FTS5 operators and punctuation in the input are
+    searched literally. Each word matches as a prefix, so `improve` finds
+    "improvement" and a half-typed last word still matches.
+
+    Parameters:
+    ----------
+    text : str
+        The search box input.
+
+    Returns:
+    -------
+    str
+        An FTS5 `MATCH` expression, or None if the text holds no words.
+    """
+    terms = re.findall(r"\w+", text or "")
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def limit_clause(limit: int = None) -> tuple:
+    """
+    Builds a `LIMIT` clause for a page of results.
+
+    Parameters:
+    ----------
+    limit : int, optional
+        Maximum number of rows, default is no limit.
+
+    Returns:
+    -------
+    tuple
+        The ` LIMIT ?` clause (empty without a limit) and its parameters.
+    """
+    if limit is None:
+        return "", []
+    if not isinstance(limit, int) or limit < 1:
+        raise ValueError(f"Expected a positive integer limit, but got {limit!r}")
+    return " LIMIT ?", [limit]
+
 
 class QueryBase(QueryMixin):
     """
@@ -15,6 +140,16 @@ class QueryBase(QueryMixin):
 
     name = ""
 
+    # Awaitable counterparts of the query methods, run on the query executor
+    async_names = async_method("names")
+    async_event_counts = async_method("event_counts")
+    async_cumulative_event_counts = async_method("cumulative_event_counts")
+    async_notes = async_method("notes")
+    async_event_counts_many = async_method("event_counts_many")
+    async_notes_many = async_method("notes_many")
+    async_search_notes = async_method("search_notes")
+    async_risk_score = async_method("risk_score")
+
     @staticmethod
     def names() -> list:
         """
@@ -27,14 +162,57 @@ class QueryBase(QueryMixin):
         """
         return []
 
-    def event_counts(self, id: int) -> pd.DataFrame:
+    def rollups_fresh(self) -> bool:
+        """
+        Checks whether the rollup tables exist and reflect every row in `employee_events`.
+
+        The answer is cached with the other query results until the data changes.
+
+        Returns:
+        -------
+        bool
+            True if the event queries can read the rollup tables.
+        """
+        return self.has_table("rollup_state") and bool(self.query(ROLLUPS_FRESH_SQL))
+
+    def has_table(self, table: str) -> bool:
+        """
+        Checks whether a table (or virtual table) exists, i.e. whether its migration was applied.
+
+        Parameters:
+        ----------
+        table : str
+            The table name.
+
+        Returns:
+        -------
+        bool
+            True if the table exists.
+        """
+        return bool(self.query("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", [table]))
+
+    def event_counts(self, id: int, start: str = None, end: str = None,
+                     limit: int = None, after: str = None) -> pd.DataFrame:
         """
         Retrieves the total positive and negative events grouped by date for a specific ID.
 
+        Reads the pre-aggregated `<name>_daily_events` rollup when it is fresh
+        and falls back to aggregating `employee_events` otherwise. The date
+        range and page are applied in SQL; pass the last `event_date` of a
+        page as `after` to fetch the next one.
+
         Parameters:
         ----------
         id : int
             The unique identifier for the employee or team.
+        start : str, optional
+            First date (`YYYY-MM-DD`) to return, default is the first event.
+        end : str, optional
+            Last date (`YYYY-MM-DD`) to return, default is the last event.
+        limit : int, optional
+            Maximum number of dates to return, default is all of them.
+        after : str, optional
+            Keyset cursor: only return dates after this one.
 
         Returns:
         -------
@@ -43,43 +221,326 @@ class QueryBase(QueryMixin):
             Returns an empty DataFrame if no data is found.
         """
         table_column = f"{self.name}_id"  # Dynamically determine the column (employee_id or team_id)
+        source = f"{self.name}_daily_events" if self.rollups_fresh() else "employee_events"
+        filters, params = date_range_filters("event_date", start, end)
+        if after is not None:
+            filters += " AND event_date > ?"
+            params.append(str(after))
+        limit_sql, limit_params = limit_clause(limit)
         sql_query = f"""
         SELECT event_date,
             SUM(positive_events) AS total_positive_events,
             SUM(negative_events) AS total_negative_events
-        FROM employee_events
-        WHERE {table_column} = ?
+        FROM {source}
+        WHERE {table_column} = ?{filters}
         GROUP BY event_date
-        ORDER BY event_date;
+        ORDER BY event_date{limit_sql};
         """
-        df = self.pandas_query(sql_query, [id])
+        df = self.pandas_query(sql_query, [id, *params, *limit_params], dtypes=COLUMN_DTYPES)
         if df.empty:
             return pd.DataFrame(columns=["event_date", "total_positive_events", "total_negative_events"])
         return df
 
 
-    def notes(self, id: int) -> pd.DataFrame:
+    def cumulative_event_counts(self, id: int, start: str = None, end: str = None) -> pd.DataFrame:
+        """
+        Retrieves the running totals of positive and negative events by date for a specific ID.
+
+        Reads the precomputed `<name>_cumulative_events` series when the rollups
+        are fresh and computes it with a window function otherwise. Running
+        totals always count from the first event, also when `start` is given.
+
+        Parameters:
+        ----------
+        id : int
+            The unique identifier for the employee or team.
+        start : str, optional
+            First date (`YYYY-MM-DD`) to return, default is the first event.
+        end : str, optional
+            Last date (`YYYY-MM-DD`) to return, default is the last event.
+
+        Returns:
+        -------
+        pandas.DataFrame
+            A DataFrame containing `event_date`, `cumulative_positive_events` and
+            `cumulative_negative_events`, ordered by date.
+            Returns an empty DataFrame if no data is found.
+        """
+        table_column = f"{self.name}_id"
+        if self.rollups_fresh():
+            series = f"""
+            SELECT event_date, positive_events, negative_events
+            FROM {self.name}_cumulative_events
+            WHERE {table_column} = ?
+            """
+        else:
+            series = f"""
+            SELECT event_date,
+                SUM(SUM(positive_events)) OVER (ORDER BY event_date) AS positive_events,
+                SUM(SUM(negative_events)) OVER (ORDER BY event_date) AS negative_events
+            FROM employee_events
+            WHERE {table_column} = ?
+            GROUP BY event_date
+            """
+        date_filters, params = date_range_filters("event_date", start, end)
+
+        sql_query = f"""
+        SELECT event_date,
+            positive_events AS cumulative_positive_events,
+            negative_events AS cumulative_negative_events
+        FROM ({series})
+        WHERE 1 = 1{date_filters}
+        ORDER BY event_date;
+        """
+        df = self.pandas_query(sql_query, [id, *params], dtypes=COLUMN_DTYPES)
+        if df.empty:
+            return pd.DataFrame(columns=["event_date", "cumulative_positive_events", "cumulative_negative_events"])
+        return df
+
+    def notes(self, id: int, start: str = None, end: str = None,
+              limit: int = None, after: tuple = None) -> pd.DataFrame:
         """
         Retrieves notes associated with a specific ID, ordered by date.
 
+        Notes on the same date are ordered by their text and then by
+        `note_id` (the row ID), which makes every row's `(note_date, note,
+        note_id)` unique: pass that tuple of the last row of a page as `after`
+        to fetch the next one. Both the range and the page are answered from
+        the notes covering indexes, which hold the row ID of every entry.
+
         Parameters:
         ----------
         id : int
             The unique identifier for the employee or team.
+        start : str, optional
+            First date (`YYYY-MM-DD`) to return, default is the first note.
+        end : str, optional
+            Last date (`YYYY-MM-DD`) to return, default is the last note.
+        limit : int, optional
+            Maximum number of notes to return, default is all of them.
+        after : tuple, optional
+            Keyset cursor `(note_date, note, note_id)`: only return notes after it.
+
+        Returns:
+        -------
+        pandas.DataFrame
+            A DataFrame containing `note_date`, `note` and `note_id`.
+            Returns an empty DataFrame if no data is found.
+        """
+        filters, params = date_range_filters("note_date", start, end)
+        if after is not None:
+            if isinstance(after, str) or len(after) != 3:
+                raise ValueError(f"Expected a (note_date, note, note_id) cursor, but got {after!r}")
+            note_date, note, note_id = after
+            try:
+                note_id = int(note_id)
+            except (TypeError, ValueError) as error:
+                raise ValueError(f"Expected a (note_date, note, note_id) cursor, but got {after!r}") from error
+            filters += " AND (note_date, note, rowid) > (?, ?, ?)"
+            params.extend([str(note_date), str(note), note_id])
+        limit_sql, limit_params = limit_clause(limit)
+        sql_query = f"""
+        SELECT note_date, note, rowid AS note_id
+        FROM notes
+        WHERE {self.name}_id = ?{filters}
+        ORDER BY note_date, note, rowid{limit_sql};
+        """
+        df = self.pandas_query(sql_query, [id, *params, *limit_params], dtypes=COLUMN_DTYPES)
+        if df.empty:
+            return pd.DataFrame(columns=["note_date", "note", "note_id"])
+        return df
+
+
+    def event_counts_many(self, ids) -> pd.DataFrame:
+        """
+        Retrieves the daily positive and negative event totals for several IDs in one query.
+
+        Like `event_counts`, reads the daily rollup when it is fresh.
+
+        Parameters:
+        ----------
+        ids : iterable of int
+            The unique identifiers of the employees or teams.
+
+        Returns:
+        -------
+        pandas.DataFrame
+            A long-format DataFrame containing `<name>_id`, `event_date`,
+            `total_positive_events` and `total_negative_events`, ordered by ID and date.
+            Use `groupby("<name>_id")` to split it per entity.
+            Returns an empty DataFrame if no data is found.
+        """
+        table_column = f"{self.name}_id"
+        source = f"{self.name}_daily_events" if self.rollups_fresh() else "employee_events"
+        sql_query = f"""
+        SELECT {table_column},
+            event_date,
+            SUM(positive_events) AS total_positive_events,
+            SUM(negative_events) AS total_negative_events
+        FROM {source}
+        WHERE {table_column} IN (SELECT value FROM json_each(?))
+        GROUP BY {table_column}, event_date
+        ORDER BY {table_column}, event_date;
+        """
+        df = self.pandas_query(sql_query, [ids_param(ids)], dtypes=COLUMN_DTYPES)
+        if df.empty:
+            return pd.DataFrame(columns=[table_column, "event_date", "total_positive_events", "total_negative_events"])
+        return df
+
+    def notes_many(self, ids) -> pd.DataFrame:
+        """
+        Retrieves the notes for several IDs in one query.
+
+        Parameters:
+        ----------
+        ids : iterable of int
+            The unique identifiers of the employees or teams.
 
         Returns:
         -------
         pandas.DataFrame
-            A DataFrame containing `note_date` and `note`.
+            A long-format DataFrame containing `<name>_id`, `note_date` and `note`,
+            ordered by ID and date.
             Returns an empty DataFrame if no data is found.
         """
+        table_column = f"{self.name}_id"
         sql_query = f"""
-        SELECT note_date, note
+        SELECT {table_column}, note_date, note
         FROM notes
-        WHERE {self.name}_id = ?
-        ORDER BY note_date;
+        WHERE {table_column} IN (SELECT value FROM json_each(?))
+        ORDER BY {table_column}, note_date;
         """
-        df = self.pandas_query(sql_query, [id])
+        df = self.pandas_query(sql_query, [ids_param(ids)], dtypes=COLUMN_DTYPES)
         if df.empty:
-            return pd.DataFrame(columns=["note_date", "note"])
-        return df
\ No newline at end of file
+            return pd.DataFrame(columns=[table_column, "note_date", "note"])
+        return df
+
+    def search_notes(self, query: str, limit: int = 20, id: int = None) -> pd.DataFrame:
+        """
+        Searches the text of every note through the `notes_fts` full-text index.
+
+        Matches contain every word of `query` (see `fts_query`) and are
+        ranked by BM25, best first. The snippet is the matching passage of
+        the note with each matched term between `SNIPPET_START` and
+        `SNIPPET_END`; the rest of the text is returned unescaped.
+
+        Parameters:
+        ----------
+        query : str
+            The words to search for.
+        limit : int, optional
+            Maximum number of notes to return, default is 20.
+        id : int, optional
+            Only search the notes of this employee or team, default is every note.
+
+        Returns:
+        -------
+        pandas.DataFrame
+            A DataFrame containing `employee_id`, `team_id`, `employee_name`,
+            `team_name`, `note_date`, `snippet` and `rank`.
+            Returns an empty DataFrame if nothing matches.
+
+        Raises:
+        ------
+        RuntimeError
+            If the database has not been migrated to include `notes_fts`.
+        """
+        columns = ["employee_id", "team_id", "employee_name", "team_name", "note_date", "snippet", "rank"]
+        if not self.has_table("notes_fts"):
+            raise RuntimeError("Note search needs the notes_fts index; run `python -m employee_events migrate` first.")
+        match = fts_query(query)
+        if match is None:
+            return pd.DataFrame(columns=columns)
+
+        params = [SNIPPET_START, SNIPPET_END, match]
+        scope = ""
+        if id is not None and self.name:
+            scope = f" AND notes.{self.name}_id = ?"
+            params.append(id)
+        limit_sql, limit_params = limit_clause(limit)
+        sql_query = f"""
+        SELECT notes.employee_id,
+            notes.team_id,
+            employee.first_name || ' ' || employee.last_name AS employee_name,
+            team.team_name,
+            notes.note_date,
+            snippet(notes_fts, 0, ?, ?, '…', 16) AS snippet,
+            notes_fts.rank AS rank
+        FROM notes_fts
+        JOIN notes ON notes.rowid = notes_fts.rowid
+        LEFT JOIN employee ON employee.employee_id = notes.employee_id
+        LEFT JOIN team ON team.team_id = notes.team_id
+        WHERE notes_fts MATCH ?{scope}
+        ORDER BY notes_fts.rank{limit_sql};
+        """
+        df = self.pandas_query(sql_query, [*params, *limit_params], dtypes=COLUMN_DTYPES)
+        if df.empty:
+            return pd.DataFrame(columns=columns)
+        return df
+
+    def risk_scores_fresh(self, model_version: str) -> bool:
+        """
+        Checks whether `risk_scores` exists and was computed from the current data with this model.
+
+        Parameters:
+        ----------
+        model_version : str
+            Version of the predictor in use, see `risk.model_version`.
+
+        Returns:
+        -------
+        bool
+            True if the risk lookups can be served from `risk_scores`.
+        """
+        return self.has_table("risk_state") and bool(self.query(RISK_SCORES_FRESH_SQL, [model_version]))
+
+    def risk_score(self, id: int, model_version: str):
+        """
+        Looks up the batch-scored recruitment risk of an employee or team.
+
+        Parameters:
+        ----------
+        id : int
+            The unique identifier for the employee or team.
+        model_version : str
+            Version of the predictor in use, see `risk.model_version`.
+
+        Returns:
+        -------
+        float or None
+            The risk, or None if the scores are stale (see `risk.refresh_risk_scores`)
+            or the entity has no events.
+        """
+        if not self.risk_scores_fresh(model_version):
+            return None
+        result = self.query("SELECT risk FROM risk_scores WHERE profile = ? AND id = ?", [self.name, id])
+        return result[0][0] if result else None
+
+    def risk_ranking(self, model_version: str, limit: int = 10) -> pd.DataFrame:
+        """
+        Retrieves the employees or teams with the highest recruitment risk.
+
+        Parameters:
+        ----------
+        model_version : str
+            Version of the predictor in use, see `risk.model_version`.
+        limit : int, optional
+            Maximum number of entities to return, default is 10.
+
+        Returns:
+        -------
+        pandas.DataFrame
+            A DataFrame containing `<name>_id` and `risk`, highest risk first.
+            Returns an empty DataFrame if the scores are stale.
+        """
+        table_column = f"{self.name}_id"
+        if not self.risk_scores_fresh(model_version):
+            return pd.DataFrame(columns=[table_column, "risk"])
+        limit_sql, limit_params = limit_clause(limit)
+        sql_query = f"""
+        SELECT id AS {table_column}, risk
+        FROM risk_scores
+        WHERE profile = ?
+        ORDER BY risk DESC{limit_sql};
+        """
+        return self.pandas_query(sql_query, [self.name, *limit_params], dtypes=COLUMN_DTYPES)
@@ -0,0 +1,316 @@
+import hashlib
+import json
+import pickle
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from .sql_execution import connect_reader, connect_writer, transaction
+from .migrations import schema_version
+from .rollups import ROLLUPS_FRESH_SQL
+
+# Schema version that added the risk_scores table
+RISK_SCHEMA_VERSION = 6
+
+# Features the recruitment risk model was trained on, in order
+FEATURE_COLUMNS = ["positive_events", "negative_events"]
+
+# Version of the JSON model artifact written by `export_model`
+MODEL_FORMAT_VERSION = 1
+
+# Changes whenever events are appended (rowid/date) or ingested in place
+# (ingest_log), i.e. whenever the lifetime totals may have changed
+RISK_SOURCE_VERSION_SQL = """
+    SELECT printf('%s:%s:%s',
+        (SELECT MAX(rowid) FROM employee_events),
+        (SELECT MAX(event_date) FROM employee_events),
+        (SELECT COALESCE(MAX(batch_id), 0) FROM ingest_log))
+"""
+
+# True when risk_scores were computed from the current data with the given model
+RISK_SCORES_FRESH_SQL = f"""
+    SELECT 1
+    FROM risk_state
+    WHERE name = 'risk'
+      AND model_version = ?
+      AND source_version IS ({RISK_SOURCE_VERSION_SQL})
+"""
+
+
+def model_version(path) -> str:
+    """
+    Returns a version string for a model artifact: the start of its SHA-256 digest.
+
+    Parameters:
+    ----------
+    path : str or pathlib.Path
+        Path to the model file.
+
+    Returns:
+    -------
+    str
+        The first 16 hex digits of the file's SHA-256 digest.
+    """
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+
+
+class LogisticPredictor:
+    """
+    A binary logistic regression evaluated with NumPy alone.
+
+    Holds the coefficients of a fitted scikit-learn `LogisticRegression`
+    (see `export_model`) and reproduces its `predict_proba` without
+    importing scikit-learn or SciPy.
+
+    Attributes:
+    ----------
+    coef : numpy.ndarray
+        Coefficients, one per feature.
+    intercept : float
+        The intercept.
+    classes : numpy.ndarray
+        The two class labels.
+    feature_names : list[str]
+        Names of the features, in coefficient order.
+    """
+
+    def __init__(self, coef, intercept, classes=(0, 1), feature_names=FEATURE_COLUMNS):
+        self.coef = np.asarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(np.ravel(intercept)[0])
+        self.classes = np.asarray(classes)
+        self.feature_names = list(feature_names)
+
+    @classmethod
+    def from_json(cls, path):
+        """
+        Loads a predictor from a JSON artifact written by `export_model`.
+
+        Parameters:
+        ----------
+        path : str or pathlib.Path
+            Path to the JSON file.
+
+        Returns:
+        -------
+        LogisticPredictor
+            The predictor.
+
+        Raises:
+        ------
+        ValueError
+            If the file is not a supported model artifact.
+        """
+        artifact = json.loads(Path(path).read_text())
+        if artifact.get("format_version") != MODEL_FORMAT_VERSION or artifact.get("kind") != "logistic_regression":
+            raise ValueError(f"Unsupported model artifact: {path}")
+        return cls(artifact["coef"], artifact["intercept"], artifact["classes"], artifact["feature_names"])
+
+    def decision_function(self, X) -> np.ndarray:
+        """
+        Returns the log-odds of the positive class for each row of `X`.
+
+        Parameters:
+        ----------
+        X : pandas.DataFrame or array-like
+            Feature rows. DataFrame columns are selected by `feature_names`.
+
+        Returns:
+        -------
+        numpy.ndarray
+            One log-odds value per row.
+        """
+        if isinstance(X, pd.DataFrame):
+            X = X[self.feature_names]
+        X = np.asarray(X, dtype=np.float64)
+        return X @ self.coef + self.intercept
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Returns the class probabilities for each row of `X`, like `LogisticRegression.predict_proba`.
+
+        Parameters:
+        ----------
+        X : pandas.DataFrame or array-like
+            Feature rows. DataFrame columns are selected by `feature_names`.
+
+        Returns:
+        -------
+        numpy.ndarray
+            An `(n, 2)` array with the probabilities of `classes[0]` and `classes[1]`.
+        """
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Returns the more likely class label for each row of `X`.
+        """
+        return self.classes[(self.decision_function(X) > 0).astype(int)]
+
+
+def load_predictor(path):
+    """
+    Loads a predictor from a model artifact.
+
+    Parameters:
+    ----------
+    path : str or pathlib.Path
+        A JSON artifact written by `export_model`, or a pickled scikit-learn model.
+
+    Returns:
+    -------
+    object
+        The predictor, with a `predict_proba` method.
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        return LogisticPredictor.from_json(path)
+    with path.open("rb") as file:
+        return pickle.load(file)
+
+
+def export_model(model, path):
+    """
+    Writes the coefficients of a fitted binary `LogisticRegression` to a JSON artifact.
+
+    Floats are written with full round-trip precision, so
+    `LogisticPredictor.from_json` rebuilds exactly the same model.
+
+    Parameters:
+    ----------
+    model : sklearn.linear_model.LogisticRegression
+        A fitted binary logistic regression.
+    path : str or pathlib.Path
+        Path of the JSON file to write.
+    """
+    feature_names = getattr(model, "feature_names_in_", FEATURE_COLUMNS)
+    artifact = {
+        "format_version": MODEL_FORMAT_VERSION,
+        "kind": "logistic_regression",
+        "feature_names": [str(name) for name in feature_names],
+        "classes": np.asarray(model.classes_).tolist(),
+        "coef": np.asarray(model.coef_, dtype=np.float64).ravel().tolist(),
+        "intercept": float(np.ravel(model.intercept_)[0]),
+    }
+    Path(path).write_text(json.dumps(artifact, indent=2) + "\n")
+
+
+def _lifetime_totals(connection) -> pd.DataFrame:
+    """
+    Lifetime event totals per employee and team, from the rollup when it is fresh.
+    """
+    fresh = connection.execute(ROLLUPS_FRESH_SQL).fetchone() is not None
+    source = "employee_event_totals" if fresh else "employee_events"
+    return pd.read_sql_query(f"""
+        SELECT employee_id, team_id,
+            SUM(positive_events) AS positive_events,
+            SUM(negative_events) AS negative_events
+        FROM {source}
+        GROUP BY employee_id, team_id
+    """, connection)
+
+
+def refresh(connection, predictor, model_version: str) -> dict:
+    """
+    Score every employee and team and replace `risk_scores` inside the caller's transaction.
+
+    All lifetime totals are read in one query and scored in one
+    vectorized `predict_proba` call. An employee's risk is scored on their
+    totals over all teams. A team's risk is the mean risk of its members,
+    each scored on the events they logged in that team, which is what the
+    per-request bar chart computed.
+
+    Table:
+    ----------
+    risk_scores
+        `profile` (`employee` or `team`), `id` and `risk` (probability of being recruited).
+
+    Parameters:
+    ----------
+    connection : sqlite3.Connection
+        A writable connection with an open transaction.
+    predictor : object
+        A fitted classifier with `predict_proba`, trained on `FEATURE_COLUMNS`.
+    model_version : str
+        Identifies the predictor, e.g. `model_version(model_path)`.
+
+    Returns:
+    -------
+    dict
+        `employees` and `teams` (number of scores written).
+    """
+    totals = _lifetime_totals(connection)
+    employee_features = totals.groupby("employee_id")[FEATURE_COLUMNS].sum()
+    member_features = totals[FEATURE_COLUMNS]
+
+    risks = predictor.predict_proba(pd.concat([employee_features, member_features], ignore_index=True))[:, 1]
+    employee_risk = pd.Series(risks[:len(employee_features)], index=employee_features.index)
+    team_risk = (
+        pd.Series(risks[len(employee_features):], index=totals.index)
+        .groupby(totals["team_id"]).mean()
+    )
+
+    scores = [("employee", int(id), float(risk)) for id, risk in employee_risk.items()]
+    scores += [("team", int(id), float(risk)) for id, risk in team_risk.items()]
+    connection.execute("DELETE FROM risk_scores")
+    connection.executemany("INSERT INTO risk_scores (profile, id, risk) VALUES (?, ?, ?)", scores)
+    connection.execute(f"""
+        INSERT OR REPLACE INTO risk_state (name, source_version, model_version, scored_at)
+        VALUES ('risk', ({RISK_SOURCE_VERSION_SQL}), ?, datetime('now'))
+    """, [model_version])
+
+    return {"employees": len(employee_risk), "teams": len(team_risk)}
+
+
+def _scores_fresh(connection, model_version) -> bool:
+    """
+    Whether `risk_scores` were computed from the current data with the given model.
+    """
+    return connection.execute(RISK_SCORES_FRESH_SQL, [model_version]).fetchone() is not None
+
+
+def refresh_risk_scores(predictor, model_version: str, db_path=None, force=False) -> dict:
+    """
+    Re-score every employee and team if the data or the model changed since the last run.
+
+    Parameters:
+    ----------
+    predictor : object
+        A fitted classifier with `predict_proba`, trained on `FEATURE_COLUMNS`.
+    model_version : str
+        Identifies the predictor, e.g. `model_version(model_path)`.
+    db_path : str or pathlib.Path, optional
+        Path to the SQLite database. Defaults to the configured database.
+    force : bool, optional
+        Re-score even if the scores are fresh, default is False.
+
+    Returns:
+    -------
+    dict
+        `scored` (whether scores were written) plus the counts from `refresh`.
+
+    Raises:
+    ------
+    RuntimeError
+        If the database has not been migrated far enough.
+    """
+    # Check read-only first, so an unmigrated database or fresh scores are never written to
+    connection = connect_reader(db_path)
+    try:
+        if schema_version(connection) < RISK_SCHEMA_VERSION:
+            raise RuntimeError(
+                "Database schema has no risk_scores table; run `python -m employee_events migrate` first."
+            )
+        if not force and _scores_fresh(connection, model_version):
+            return {"scored": False, "employees": 0, "teams": 0}
+    finally:
+        connection.close()
+
+    connection = connect_writer(db_path)
+    try:
+        with transaction(connection):
+            # Another process may have re-scored while this one waited for the lock
+            if not force and _scores_fresh(connection, model_version):
+                return {"scored": False, "employees": 0, "teams": 0}
+            return {"scored": True, **refresh(connection, predictor, model_version)}
+    finally:
+        connection.close()
@@ -0,0 +1,169 @@
+from .sql_execution import connect_writer, transaction
+
+# True when the rollups reflect every row of employee_events: the watermark
+# is the newest event date and no row was appended since the last refresh
+ROLLUPS_FRESH_SQL = """
+    SELECT 1
+    FROM rollup_state
+    WHERE name = 'events'
+      AND watermark IS (SELECT MAX(event_date) FROM employee_events)
+      AND max_rowid IS (SELECT MAX(rowid) FROM employee_events)
+"""
+
+
+def _refresh_cumulative(connection, name, since):
+    """
+    Rebuild the running totals of `<name>_cumulative_events` from `since` onwards.
+
+    Each entity's series continues from its last running total before
+    `since`, so only the refreshed days are summed.
+    """
+    connection.execute(f"DELETE FROM {name}_cumulative_events WHERE event_date >= :since", {"since": since})
+    connection.execute(f"""
+        WITH daily AS (
+            SELECT {name}_id, event_date,
+                SUM(positive_events) AS positive_events,
+                SUM(negative_events) AS negative_events
+            FROM {name}_daily_events
+            WHERE event_date >= :since
+            GROUP BY {name}_id, event_date
+        ),
+        base AS (
+            SELECT {name}_id, positive_events, negative_events
+            FROM {name}_cumulative_events AS c
+            WHERE event_date = (
+                SELECT MAX(event_date) FROM {name}_cumulative_events
+                WHERE {name}_id = c.{name}_id
+            )
+        )
+        INSERT INTO {name}_cumulative_events
+        SELECT daily.{name}_id, daily.event_date,
+            COALESCE(base.positive_events, 0)
+                + SUM(daily.positive_events) OVER (PARTITION BY daily.{name}_id ORDER BY daily.event_date),
+            COALESCE(base.negative_events, 0)
+                + SUM(daily.negative_events) OVER (PARTITION BY daily.{name}_id ORDER BY daily.event_date)
+        FROM daily
+        LEFT JOIN base USING ({name}_id)
+    """, {"since": since})
+
+
+def refresh(connection, full=False, since=None) -> dict:
+    """
+    Bring the rollup tables up to date inside the caller's transaction.
+
+    Only dates from the last watermark onwards are re-aggregated, plus any
+    earlier dates that received rows appended since the last refresh. The
+    watermark day itself is always rebuilt because it may have been
+    incomplete when it was last rolled up.
+
+    Rollup tables:
+    ----------
+    employee_daily_events
+        Positive/negative event sums per employee, team and day.
+    team_daily_events
+        Positive/negative event sums per team and day.
+    employee_event_totals
+        Lifetime positive/negative event sums per employee and team.
+    employee_cumulative_events, team_cumulative_events
+        Running positive/negative event totals per employee or team and day.
+
+    Parameters:
+    ----------
+    connection : sqlite3.Connection
+        A writable connection with an open transaction.
+    full : bool, optional
+        Rebuild every date instead of refreshing incrementally, default is False.
+    since : str, optional
+        Also rebuild every date from this one onwards, for rows that were
+        updated in place rather than appended.
+
+    Returns:
+    -------
+    dict
+        `start` (first date rebuilt, None for a full rebuild), `watermark`
+        (newest date rolled up) and `days` (number of employee-days rebuilt).
+    """
+    state = connection.execute(
+        "SELECT watermark, max_rowid FROM rollup_state WHERE name = 'events'"
+    ).fetchone()
+
+    start = None
+    if not full and state is not None and state[0] is not None:
+        watermark, max_rowid = state
+        earliest_new = connection.execute(
+            "SELECT MIN(event_date) FROM employee_events WHERE rowid > ?", [max_rowid or 0]
+        ).fetchone()[0]
+        start = min(date for date in (watermark, earliest_new, since) if date)
+
+    since = start or ""
+    affected_employees = "SELECT DISTINCT employee_id FROM employee_events WHERE event_date >= :since"
+
+    connection.execute("DELETE FROM employee_daily_events WHERE event_date >= :since", {"since": since})
+    days = connection.execute("""
+        INSERT INTO employee_daily_events
+        SELECT employee_id, event_date, team_id,
+            SUM(positive_events), SUM(negative_events)
+        FROM employee_events
+        WHERE event_date >= :since
+        GROUP BY employee_id, event_date, team_id
+    """, {"since": since}).rowcount
+
+    connection.execute("DELETE FROM team_daily_events WHERE event_date >= :since", {"since": since})
+    connection.execute("""
+        INSERT INTO team_daily_events
+        SELECT team_id, event_date,
+            SUM(positive_events), SUM(negative_events)
+        FROM employee_events
+        WHERE event_date >= :since
+        GROUP BY team_id, event_date
+    """, {"since": since})
+
+    connection.execute(f"""
+        DELETE FROM employee_event_totals
+        WHERE employee_id IN ({affected_employees})
+    """, {"since": since})
+    connection.execute(f"""
+        INSERT INTO employee_event_totals
+        SELECT employee_id, team_id,
+            SUM(positive_events), SUM(negative_events)
+        FROM employee_daily_events
+        WHERE employee_id IN ({affected_employees})
+        GROUP BY employee_id, team_id
+    """, {"since": since})
+
+    for name in ("employee", "team"):
+        _refresh_cumulative(connection, name, since)
+
+    watermark, max_rowid = connection.execute(
+        "SELECT MAX(event_date), MAX(rowid) FROM employee_events"
+    ).fetchone()
+    connection.execute("""
+        INSERT OR REPLACE INTO rollup_state (name, watermark, max_rowid, refreshed_at)
+        VALUES ('events', ?, ?, datetime('now'))
+    """, [watermark, max_rowid])
+
+    return {"start": start, "watermark": watermark, "days": days}
+
+
+def refresh_rollups(db_path=None, full=False) -> dict:
+    """
+    Refresh the rollup tables of a migrated database in one transaction.
+
+    Parameters:
+    ----------
+    db_path : str or pathlib.Path, optional
+        Path to the SQLite database. Defaults to the configured database.
+    full : bool, optional
+        Rebuild every date instead of refreshing incrementally, default is False.
+
+    Returns:
+    -------
+    dict
+        See `refresh`.
+    """
+    connection = connect_writer(db_path)
+    try:
+        with transaction(connection):
+            return refresh(connection, full=full)
+    finally:
+        connection.close()
@@ -1,26 +1,847 @@
-from sqlite3 import connect
+from sqlite3 import connect, OperationalError
 from pathlib import Path
-from functools import wraps
+from functools import wraps, partial
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+import asyncio
+import inspect
+import logging
+import os
+import threading
+import time
+import numpy as np
 import pandas as pd
 
 db_path = Path(__file__).parent / "employee_events.db"
 
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """
+    A pool of long-lived, read-only SQLite connections, one per thread.
+
+    Connections are opened lazily through a `file:...?mode=ro` URI the first
+    time a thread runs a query and are reused for every later query on that
+    thread. Connection-level pragmas (mmap, page cache) are applied once per
+    connection. The pool never writes to the database: its journal mode is
+    left as it is unless `journal_mode` is given, and `migrate` and
+    `connect_writer` switch it to WAL.
+
+    In snapshot mode the database is copied into a shared in-memory database
+    with the SQLite backup API and every connection reads that copy, so
+    queries never touch the disk. When the file on disk changes, a new copy
+    is loaded next to the old one and swapped in atomically; threads move to
+    it on their next query while in-flight queries finish on the old copy.
+    Connections to the old copy are closed as soon as they are idle, so no
+    thread keeps it in memory.
+
+    Attributes:
+    ----------
+    db_path : pathlib.Path
+        Path to the SQLite database.
+    mmap_size : int
+        Bytes of the database file to memory-map on each connection.
+    cache_size : int
+        SQLite page cache size (negative values are KiB).
+    journal_mode : str or None
+        Journal mode set once on the database, default None (leave it unchanged).
+    snapshot : bool
+        Serve queries from an in-memory copy of the database.
+    """
+
+    def __init__(self, db_path, mmap_size=256 * 1024 * 1024, cache_size=-16000, journal_mode=None, snapshot=False):
+        self.db_path = Path(db_path)
+        self.mmap_size = int(mmap_size)
+        self.cache_size = int(cache_size)
+        self.journal_mode = journal_mode
+        self.snapshot = snapshot
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._connections = {}
+        self._busy = set()
+        self._generation = 0
+        self._prepared = False
+        self._snapshots = 0
+        self._snapshot_uri = None
+        self._snapshot_anchor = None
+        self._snapshot_version = None
+
+    def _prepare(self):
+        """
+        Apply database-level pragmas once, before the first read-only connection is opened.
+
+        A `journal_mode`, if given, is persistent and cannot be changed from a
+        read-only connection, so it is set through a short-lived writable one.
+        A database on a read-only filesystem keeps its current journal mode.
+        In snapshot mode the first in-memory copy is loaded here.
+        """
+        with self._lock:
+            if self._prepared:
+                return
+            if self.journal_mode:
+                try:
+                    connection = connect(self.db_path)
+                    try:
+                        connection.execute(f"PRAGMA journal_mode={self.journal_mode}")
+                    finally:
+                        connection.close()
+                except OperationalError as e:
+                    logger.warning("Could not set journal_mode=%s on %s: %s", self.journal_mode, self.db_path, e)
+            if self.snapshot:
+                self._load_snapshot()
+            self._prepared = True
+
+    def _disk_uri(self):
+        return f"{self.db_path.resolve().as_uri()}?mode=ro"
+
+    def _load_snapshot(self):
+        """
+        Copy the database on disk into a new shared in-memory database and switch to it.
+
+        The version is read before the copy starts, so a write that lands
+        during the copy makes the snapshot look stale and triggers another load.
+        """
+        version = file_version(self.db_path)
+        self._snapshots += 1
+        uri = f"file:employee_events_snapshot_{id(self)}_{self._snapshots}?mode=memory&cache=shared"
+
+        # The anchor connection keeps the in-memory database alive
+        anchor = connect(uri, uri=True, check_same_thread=False)
+        source = connect(self._disk_uri(), uri=True)
+        try:
+            source.backup(anchor)
+        finally:
+            source.close()
+
+        old_anchor = self._snapshot_anchor
+        self._snapshot_uri, self._snapshot_anchor, self._snapshot_version = uri, anchor, version
+        self._generation += 1
+        if old_anchor is not None:
+            old_anchor.close()
+        # Idle connections to the old copy are closed now rather than on their thread's next query
+        for connection, generation in list(self._connections.items()):
+            if generation != self._generation and connection not in self._busy:
+                del self._connections[connection]
+                connection.close()
+
+    def refresh_snapshot(self, block=True) -> bool:
+        """
+        Reload the in-memory snapshot if the database on disk has changed.
+
+        Parameters:
+        ----------
+        block : bool, optional
+            Wait for a refresh already running in another thread, default is True.
+            When False, callers keep reading the current snapshot instead.
+
+        Returns:
+        -------
+        bool
+            True if a new snapshot was loaded.
+        """
+        if not self.snapshot or not self._prepared:
+            return False
+        if file_version(self.db_path) == self._snapshot_version:
+            return False
+        if not self._snapshot_lock.acquire(blocking=block):
+            return False
+        try:
+            if file_version(self.db_path) == self._snapshot_version:
+                return False
+            with self._lock:
+                self._load_snapshot()
+            return True
+        finally:
+            self._snapshot_lock.release()
+
+    def data_version(self) -> str:
+        """
+        Returns the version token of the data this pool's connections read.
+
+        Returns:
+        -------
+        str
+            The file version on disk, or the version of the loaded snapshot.
+        """
+        if self.snapshot:
+            self._prepare()
+            self.refresh_snapshot(block=False)
+            return self._snapshot_version
+        return file_version(self.db_path)
+
+    def _open(self):
+        """
+        Open a new read-only connection with the per-connection pragmas applied.
+
+        Returns:
+        -------
+        sqlite3.Connection
+            The new connection.
+        """
+        if self.snapshot:
+            connection = connect(self._snapshot_uri, uri=True, check_same_thread=False)
+            connection.execute("PRAGMA query_only=ON")
+        else:
+            connection = connect(self._disk_uri(), uri=True, check_same_thread=False)
+            connection.execute(f"PRAGMA mmap_size={self.mmap_size}")
+        connection.execute(f"PRAGMA cache_size={self.cache_size}")
+        return connection
+
+    def connection(self):
+        """
+        Returns the calling thread's connection, opening it on first use.
+
+        Returns:
+        -------
+        sqlite3.Connection
+            A read-only connection owned by the calling thread.
+        """
+        local = self._local
+        if self.snapshot:
+            self.refresh_snapshot(block=False)
+        if getattr(local, "generation", None) != self._generation:
+            self._prepare()
+            with self._lock:
+                stale = getattr(local, "connection", None)
+                if stale in self._connections:
+                    # Only this thread uses it, and it is between queries
+                    del self._connections[stale]
+                    stale.close()
+                connection = self._open()
+                self._connections[connection] = self._generation
+                local.connection, local.generation = connection, self._generation
+                local.version = self._snapshot_version
+        return local.connection
+
+    @contextmanager
+    def reading(self):
+        """
+        Check out the calling thread's connection for one query, with the version of the data it reads.
+
+        The version is taken together with the connection, so a snapshot
+        swapped in while the query runs cannot make an old copy's result
+        look current. A connection to an old snapshot is closed when the
+        query finishes.
+
+        Yields:
+        -------
+        tuple
+            The `(connection, version)` pair; `version` is what `data_version` returned
+            for that connection.
+        """
+        local = self._local
+        while True:
+            # Read the file version first: a write after it only makes the result newer than its key
+            version = None if self.snapshot else file_version(self.db_path)
+            connection = self.connection()
+            with self._lock:
+                # A snapshot swap may have closed it since `connection` returned it
+                if connection in self._connections:
+                    self._busy.add(connection)
+                    if self.snapshot:
+                        version = local.version
+                    break
+        try:
+            yield connection, version
+        finally:
+            with self._lock:
+                self._busy.discard(connection)
+                if connection in self._connections and self._connections[connection] != self._generation:
+                    del self._connections[connection]
+                    connection.close()
+
+    def close(self):
+        """
+        Close every connection opened by the pool.
+
+        Threads that query again afterwards transparently open a new connection
+        (and, in snapshot mode, a fresh snapshot is loaded).
+        """
+        with self._lock:
+            connections, self._connections = list(self._connections), {}
+            self._busy.clear()
+            if self._snapshot_anchor is not None:
+                connections.append(self._snapshot_anchor)
+                self._snapshot_anchor = self._snapshot_version = None
+            self._generation += 1
+            self._prepared = False
+        for connection in connections:
+            connection.close()
+
+
+_pool = None
+_pool_options = {}
+_pool_lock = threading.Lock()
+
+
+def configure_pool(db_path=None, **options):
+    """
+    Configure the connection pool used by `QueryMixin` and the `query` decorator.
+
+    Any existing pool is closed and the query result cache is cleared;
+    the new pool opens its connections lazily.
+
+    Parameters:
+    ----------
+    db_path : str or pathlib.Path, optional
+        Path to the SQLite database. Defaults to the packaged `employee_events.db`.
+    **options
+        Keyword arguments passed to `ConnectionPool`
+        (`mmap_size`, `cache_size`, `journal_mode`, `snapshot`).
+    """
+    global _pool_options
+    close_pool()
+    with _pool_lock:
+        _set_db_path(db_path if db_path is not None else Path(__file__).parent / "employee_events.db")
+        _pool_options = options
+    query_cache.clear()
+
+
+def _set_db_path(path):
+    global db_path
+    db_path = Path(path)
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Returns the process-wide connection pool, creating it on first use.
+
+    Returns:
+    -------
+    ConnectionPool
+        The configured connection pool.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(db_path, **_pool_options)
+    return _pool
+
+
+def close_pool():
+    """
+    Close the process-wide connection pool, e.g. when the web application shuts down.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+def connect_reader(path=None):
+    """
+    Open a read-only connection for maintenance jobs that may have nothing to write.
+
+    Unlike `connect_writer`, it leaves the journal mode alone, so checking a
+    database never rewrites it.
+
+    Parameters:
+    ----------
+    path : str or pathlib.Path, optional
+        Path to the SQLite database. Defaults to the configured database.
+
+    Returns:
+    -------
+    sqlite3.Connection
+        The read-only connection.
+    """
+    return connect(f"{Path(path or db_path).resolve().as_uri()}?mode=ro", uri=True)
+
+
+def connect_writer(path=None):
+    """
+    Open a writable connection for maintenance jobs (migrations, refreshes, loads).
+
+    The connection is in autocommit mode so callers control transactions
+    explicitly with `transaction`, and waits for concurrent writers instead
+    of failing with "database is locked". Readers using WAL are not blocked.
+
+    Parameters:
+    ----------
+    path : str or pathlib.Path, optional
+        Path to the SQLite database. Defaults to the configured database.
+
+    Returns:
+    -------
+    sqlite3.Connection
+        The writable connection.
+    """
+    connection = connect(Path(path or db_path), isolation_level=None, timeout=30)
+    connection.execute("PRAGMA journal_mode=wal")
+    return connection
+
+
+@contextmanager
+def transaction(connection):
+    """
+    Run a block inside one write transaction, rolling back if it raises.
+
+    Parameters:
+    ----------
+    connection : sqlite3.Connection
+        A connection opened with `connect_writer`.
+    """
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield connection
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def file_version(path) -> str:
+    """
+    Returns a token that changes whenever the database file at `path` is written.
+
+    The token is built from the modification time and size of the database
+    file and of its write-ahead log, so it is cheap to compute and identical
+    in every process and thread reading the same file.
+
+    Parameters:
+    ----------
+    path : pathlib.Path
+        Path to the SQLite database.
+
+    Returns:
+    -------
+    str
+        The file version token.
+    """
+    parts = []
+    for file in (path, path.with_name(path.name + "-wal")):
+        try:
+            stat = os.stat(file)
+            parts.append(f"{stat.st_mtime_ns:x}.{stat.st_size:x}")
+        except FileNotFoundError:
+            parts.append("-")
+    return ":".join(parts)
+
+
+def data_version() -> str:
+    """
+    Returns a token that changes whenever the data served by the pool changes.
+
+    This is the `file_version` of the database, or in snapshot mode the
+    version of the in-memory copy currently being served.
+
+    Returns:
+    -------
+    str
+        The current data version token.
+    """
+    return get_pool().data_version()
+
+
+class QueryCache:
+    """
+    A size-bounded, thread-safe LRU cache of query results with a time-to-live.
+
+    Attributes:
+    ----------
+    maxsize : int
+        Maximum number of cached results; 0 disables caching.
+    ttl : float
+        Seconds a cached result stays valid.
+    hits : int
+        Number of lookups answered from the cache.
+    misses : int
+        Number of lookups that had to run the query.
+    """
+
+    def __init__(self, maxsize=256, ttl=300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Look up a cached result, counting the hit or miss.
+
+        Parameters:
+        ----------
+        key : tuple
+            The cache key.
+
+        Returns:
+        -------
+        object or None
+            The cached result, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """
+        Store a result, evicting the least recently used entries beyond `maxsize`.
+
+        Parameters:
+        ----------
+        key : tuple
+            The cache key.
+        value : object
+            The result to cache.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove every cached result and reset the hit/miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        """
+        Returns the cache statistics.
+
+        Returns:
+        -------
+        dict
+            `hits`, `misses`, `size`, `maxsize` and `ttl`.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+query_cache = QueryCache()
+
+
+def configure_cache(maxsize=256, ttl=300.0):
+    """
+    Resize the query result cache and change its time-to-live.
+
+    The cache is cleared. Passing `maxsize=0` disables caching.
+
+    Parameters:
+    ----------
+    maxsize : int, optional
+        Maximum number of cached results, default is 256.
+    ttl : float, optional
+        Seconds a cached result stays valid, default is 300.
+    """
+    query_cache.clear()
+    query_cache.maxsize = maxsize
+    query_cache.ttl = ttl
+
+
+def cache_info() -> dict:
+    """
+    Returns the hit/miss counters and size of the query result cache.
+
+    Returns:
+    -------
+    dict
+        See `QueryCache.info`.
+    """
+    return query_cache.info()
+
+
+_executor = None
+_executor_workers = 4
+_executor_lock = threading.Lock()
+
+
+def configure_executor(max_workers=4):
+    """
+    Set the number of threads used to run queries for the async API.
+
+    Any running executor is shut down; the new one starts on first use.
+
+    Parameters:
+    ----------
+    max_workers : int, optional
+        Maximum number of concurrent queries, default is 4.
+    """
+    global _executor_workers
+    shutdown_executor()
+    _executor_workers = max_workers
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the bounded thread pool that runs queries for the async API.
+
+    Each worker thread gets its own pooled connection on first use, so
+    async queries never share a connection with the web server's threads.
+
+    Returns:
+    -------
+    concurrent.futures.ThreadPoolExecutor
+        The query executor.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_executor_workers,
+                    thread_name_prefix="employee-events-query",
+                )
+    return _executor
+
+
+def shutdown_executor():
+    """
+    Shut down the query executor, waiting for running queries to finish.
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def run_in_executor(func, *args, **kwargs):
+    """
+    Run a blocking function on the query executor without blocking the event loop.
+
+    Parameters:
+    ----------
+    func : callable
+        The blocking function to run.
+    *args, **kwargs
+        Arguments passed to `func`.
+
+    Returns:
+    -------
+    object
+        The value returned by `func`.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+
+def async_method(name):
+    """
+    Build an awaitable counterpart of the blocking query method `name`.
+
+    The method is looked up on the instance when called, so subclasses that
+    override `name` get a matching async version for free.
+
+    Parameters:
+    ----------
+    name : str
+        Name of the blocking method.
+
+    Returns:
+    -------
+    coroutine function
+        A method that runs `name` on the query executor.
+    """
+    async def method(self, *args, **kwargs):
+        return await run_in_executor(getattr(self, name), *args, **kwargs)
+
+    method.__name__ = f"async_{name}"
+    method.__doc__ = f"Awaitable version of `{name}`, run on the query executor."
+    return method
+
+
+class DataLoader:
+    """
+    A request-scoped view of a model that runs each distinct query at most once.
+
+    Wraps an `Employee` or `Team` and exposes the same attributes and query
+    methods, so it can be passed wherever the model is. The first call of a
+    method with given arguments runs it; later calls, and calls made at the
+    same time from other threads, share that result. Arguments are bound to
+    the method's signature first, so `notes(1)` and `notes(id=1)` are the
+    same query. Results are kept per `data_version`, so a write made during
+    the request (e.g. re-scoring risks) is seen by the queries after it.
+
+    `async_<method>` runs the memoized method on the query executor, so the
+    queries of a page can be started together and read back by the
+    components afterwards.
+
+    Create one loader per request and drop it afterwards. Results are shared
+    between callers, so they must not be modified.
+
+    Attributes:
+    ----------
+    model : QueryBase
+        The wrapped model.
+    queries : int
+        Number of method calls that ran a query.
+    hits : int
+        Number of method calls answered from the loader.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.queries = 0
+        self.hits = 0
+        self._results = {}
+        self._signatures = {}
+        self._lock = threading.Lock()
+
+    def _key(self, method: str, args: tuple, kwargs: dict) -> tuple:
+        signature = self._signatures.get(method)
+        if signature is None:
+            signature = self._signatures[method] = inspect.signature(getattr(self.model, method))
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return (method, tuple(bound.arguments.items()), data_version())
+
+    def load(self, method: str, *args, **kwargs):
+        """
+        Call a method of the model, or return the result of an earlier identical call.
+
+        Parameters:
+        ----------
+        method : str
+            Name of the model's method, e.g. `username`.
+        *args, **kwargs
+            Arguments passed to the method.
+
+        Returns:
+        -------
+        object
+            The method's result. Errors are raised to every caller of the same query;
+            an interrupt (e.g. `KeyboardInterrupt`) is not kept, so a later call runs
+            the query again.
+        """
+        key = self._key(method, args, kwargs)
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = self._results[key] = Future()
+                self.queries += 1
+            else:
+                self.hits += 1
+        if owner:
+            try:
+                future.set_result(getattr(self.model, method)(*args, **kwargs))
+            except Exception as error:
+                future.set_exception(error)
+            except BaseException as error:
+                # Release the callers waiting on the future before the interrupt propagates
+                with self._lock:
+                    self._results.pop(key, None)
+                future.set_exception(error)
+                raise
+        return future.result()
+
+    def __getattr__(self, name):
+        # Only called for attributes the loader does not define itself
+        if name.startswith("async_"):
+            method = name[len("async_"):]
+
+            async def load_async(*args, **kwargs):
+                return await run_in_executor(self.load, method, *args, **kwargs)
+            return load_async
+
+        value = getattr(self.model, name)
+        if callable(value) and not name.startswith("_"):
+            return partial(self.load, name)
+        return value
+
+
+# Python types of the SQLite values each dtype kind holds exactly; other
+# values (NULLs, text, REALs in an integer column) fall back to inference
+EXACT_TYPES = {
+    "i": {int},
+    "f": {int, float},
+}
+
+
+def typed_frame(cursor, dtypes: dict) -> pd.DataFrame:
+    """
+    Build a DataFrame from an executed cursor with declared column dtypes.
+
+    Rows are transposed once and every declared column is materialized
+    straight into a NumPy array of its dtype, skipping the per-call type
+    inference of `pd.read_sql_query`. Numeric columns are only cast when
+    every value is of a type in `EXACT_TYPES`, so nothing is truncated or
+    parsed on the way. A column that does not fit its dtype (e.g. a NULL
+    aggregate or a REAL in an integer column) is inferred instead, which
+    gives the same result as `pd.read_sql_query`. Empty results keep their
+    declared dtypes.
+
+    Parameters:
+    ----------
+    cursor : sqlite3.Cursor
+        A cursor on which the query has been executed.
+    dtypes : dict
+        NumPy dtypes keyed by result column name. Undeclared columns are inferred.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        The query result as a DataFrame.
+    """
+    columns = [description[0] for description in cursor.description]
+    rows = cursor.fetchall()
+    values = zip(*rows) if rows else ([] for _ in columns)
+
+    data = {}
+    for column, column_values in zip(columns, values):
+        dtype = dtypes.get(column)
+        try:
+            if dtype is None:
+                raise TypeError
+            exact = EXACT_TYPES.get(np.dtype(dtype).kind)
+            if exact is not None and not set(map(type, column_values)) <= exact:
+                raise TypeError
+            data[column] = np.array(column_values, dtype=dtype)
+        except (TypeError, ValueError, OverflowError):
+            data[column] = pd.Series(column_values)
+    return pd.DataFrame(data, columns=columns, copy=False)
+
+
 class QueryMixin:
     """
     A mixin class providing methods to execute SQL queries
     and retrieve results as pandas DataFrames or lists of tuples.
     """
 
-    def pandas_query(self, sql_query: str, params: list = None) -> pd.DataFrame:
+    def pandas_query(self, sql_query: str, params: list = None, dtypes: dict = None) -> pd.DataFrame:
         """
         Executes a SQL query and returns the result as a pandas DataFrame.
 
+        Results are cached per SQL text, parameters and `data_version()`;
+        every call returns its own copy, so callers may modify it freely.
+        Queries with a fixed result shape should declare `dtypes` to take
+        the columnar fast path (see `typed_frame`).
+
         Parameters:
         ----------
         sql_query : str
             The SQL query to execute.
         params : list, optional
             Parameters for the SQL query, default is None.
+        dtypes : dict, optional
+            NumPy dtypes keyed by result column name, default is None
+            (use `pd.read_sql_query`).
 
         Returns:
         -------
@@ -30,17 +851,27 @@ class QueryMixin:
         if params is None:
             params = []
 
-        connection = connect(db_path)
-        try:
-            result = pd.read_sql_query(sql_query, connection, params=params)
-        finally:
-            connection.close()
-        return result
+        with get_pool().reading() as (connection, version):
+            key = ("pandas", sql_query, tuple(params), version, tuple((dtypes or {}).items()))
+            result = query_cache.get(key)
+            if result is None:
+                if dtypes is None:
+                    result = pd.read_sql_query(sql_query, connection, params=params)
+                else:
+                    cursor = connection.execute(sql_query, params)
+                    try:
+                        result = typed_frame(cursor, dtypes)
+                    finally:
+                        cursor.close()
+                query_cache.put(key, result)
+        return result.copy()
 
     def query(self, sql_query: str, params: list = None) -> list[tuple]:
         """
         Executes a SQL query and returns the result as a list of tuples.
 
+        Results are cached per SQL text, parameters and `data_version()`.
+
         Parameters:
         ----------
         sql_query : str
@@ -53,24 +884,67 @@ class QueryMixin:
         list[tuple]
             The query result as a list of tuples.
         """
-        print(f"Executing SQL Query: {sql_query}")
-        print(f"With Parameters: {params}")
-        print(f"Using Database Path: {db_path}")
+        with get_pool().reading() as (connection, version):
+            key = ("list", sql_query, tuple(params or ()), version)
+            result = query_cache.get(key)
+            if result is not None:
+                return list(result)
 
-        connection = connect(db_path)
-        cursor = connection.cursor()
-        try:
-            if params is not None:
-                cursor.execute(sql_query, params)
-            else:
-                cursor.execute(sql_query)
-            result = cursor.fetchall()
-            print(f"Query Result: {result}")
-        finally:
-            connection.close()
-        return result
+            print(f"Executing SQL Query: {sql_query}")
+            print(f"With Parameters: {params}")
+            print(f"Using Database Path: {db_path}")
+
+            cursor = connection.cursor()
+            try:
+                if params is not None:
+                    cursor.execute(sql_query, params)
+                else:
+                    cursor.execute(sql_query)
+                result = cursor.fetchall()
+                print(f"Query Result: {result}")
+            finally:
+                cursor.close()
+        query_cache.put(key, result)
+        return list(result)
+
+    async def async_pandas_query(self, sql_query: str, params: list = None, dtypes: dict = None) -> pd.DataFrame:
+        """
+        Awaitable version of `pandas_query`, run on the query executor.
+
+        Parameters:
+        ----------
+        sql_query : str
+            The SQL query to execute.
+        params : list, optional
+            Parameters for the SQL query, default is None.
+        dtypes : dict, optional
+            NumPy dtypes keyed by result column name, default is None.
+
+        Returns:
+        -------
+        pandas.DataFrame
+            The query result as a DataFrame.
+        """
+        return await run_in_executor(self.pandas_query, sql_query, params, dtypes)
+
+    async def async_query(self, sql_query: str, params: list = None) -> list[tuple]:
+        """
+        Awaitable version of `query`, run on the query executor.
+
+        Parameters:
+        ----------
+        sql_query : str
+            The SQL query to execute.
+        params : list, optional
+            Parameters for the SQL query. Defaults to None.
+
+        Returns:
+        -------
+        list[tuple]
+            The query result as a list of tuples.
+        """
+        return await run_in_executor(self.query, sql_query, params)
 
-# Leave this code unchanged
 def query(func):
     """
     Decorator that executes a SQL query and returns the result as a list of tuples.
@@ -85,12 +959,12 @@ def query(func):
     @wraps(func)
     def run_query(*args, **kwargs):
         query_string = func(*args, **kwargs)
-        connection = connect(db_path)
-        cursor = connection.cursor()
-        try:
-            result = cursor.execute(query_string).fetchall()
-        finally:
-            connection.close()
+        with get_pool().reading() as (connection, _):
+            cursor = connection.cursor()
+            try:
+                result = cursor.execute(query_string).fetchall()
+            finally:
+                cursor.close()
         return result
 
     return run_query
@@ -1,5 +1,5 @@
-from .query_base import QueryBase
-from .sql_execution import QueryMixin
+from .query_base import QueryBase, ids_param, COLUMN_DTYPES
+from .sql_execution import QueryMixin, async_method
 import pandas as pd
 
 
@@ -15,6 +15,10 @@ class Team(QueryBase, QueryMixin):
 
     name = "team"
 
+    async_username = async_method("username")
+    async_model_data = async_method("model_data")
+    async_model_data_many = async_method("model_data_many")
+
     def names(self):
         """
         Retrieves a list of all teams with their names and IDs.
@@ -74,6 +78,8 @@ class Team(QueryBase, QueryMixin):
         """
         Retrieves model data for a given team.
 
+        Reads the `employee_event_totals` rollup when it is fresh.
+
         SQL Query:
         ----------
         SELECT positive_events, negative_events
@@ -103,7 +109,8 @@ class Team(QueryBase, QueryMixin):
         if not isinstance(id, int):
             raise ValueError(f"Expected an integer for ID, but got {type(id).__name__}")
 
-        sql_query = """
+        source = "employee_event_totals" if self.rollups_fresh() else "employee_events"
+        sql_query = f"""
             SELECT 
                 positive_events, 
                 negative_events 
@@ -113,10 +120,57 @@ class Team(QueryBase, QueryMixin):
                     SUM(positive_events) AS positive_events,
                     SUM(negative_events) AS negative_events
                 FROM team
-                JOIN employee_events
+                JOIN {source}
                 USING(team_id)
                 WHERE team.team_id = ?
                 GROUP BY employee_id
             );
         """
-        return self.pandas_query(sql_query, [id])
+        return self.pandas_query(sql_query, [id], dtypes=COLUMN_DTYPES)
+
+    def model_data_many(self, ids):
+        """
+        Retrieves model data for the members of several teams in one query.
+
+        Reads the `employee_event_totals` rollup when it is fresh.
+
+        SQL Query:
+        ----------
+        SELECT team_id,
+               employee_id,
+               SUM(positive_events) AS positive_events,
+               SUM(negative_events) AS negative_events
+        FROM employee_events
+        WHERE team_id IN (SELECT value FROM json_each(?))
+        GROUP BY team_id, employee_id
+
+        Parameters:
+        ----------
+        ids : iterable of int
+            The teams' IDs.
+
+        Returns:
+        -------
+        pandas.DataFrame
+            A long-format DataFrame with one row per team member containing:
+            - Team ID
+            - Employee ID
+            - Positive events count
+            - Negative events count
+        """
+        source = "employee_event_totals" if self.rollups_fresh() else "employee_events"
+        sql_query = f"""
+            SELECT 
+                team_id,
+                employee_id,
+                SUM(positive_events) AS positive_events,
+                SUM(negative_events) AS negative_events
+            FROM {source}
+            WHERE team_id IN (SELECT value FROM json_each(?))
+            GROUP BY team_id, employee_id
+            ORDER BY team_id, employee_id
+        """
+        df = self.pandas_query(sql_query, [ids_param(ids)], dtypes=COLUMN_DTYPES)
+        if df.empty:
+            return pd.DataFrame(columns=["team_id", "employee_id", "positive_events", "negative_events"])
+        return df
@@ -2,4 +2,4 @@ from .base_component import BaseComponent
 from .dropdown import Dropdown
 from .radio import Radio
 from .matplotlib_viz import MatplotlibViz
-from .data_table import DataTable
\ No newline at end of file
+from .data_table import DataTable, iter_table, render_rows, render_table
\ No newline at end of file
@@ -1,5 +1,110 @@
+from html import escape
+
+import pandas as pd
+from fasthtml.common import NotStr
+
 from .base_component import BaseComponent
-from fasthtml.common import Table, Tr, Th, Td
+
+# Rows rendered per chunk when a table is streamed
+CHUNK_ROWS = 10_000
+
+# Joins a column's values so the whole column is escaped with one call
+_SEPARATOR = "\0"
+
+
+def escape_column(column):
+    """
+    HTML-escape every value of a column at once.
+
+    The values are joined into one string, escaped with a single call and
+    split again, so the work per value happens in C rather than in a Python
+    loop. Missing values become empty cells.
+
+    Args:
+        column (array-like): The cell values.
+
+    Returns:
+        list: The escaped values as strings.
+    """
+    values = column.tolist() if hasattr(column, "tolist") else list(column)
+    try:
+        joined = _SEPARATOR.join(values)
+    except TypeError:
+        # Not only strings: convert the whole column, missing values to ""
+        column = pd.Series(values, dtype=object)
+        values = column.where(column.notna(), "").astype(str).tolist()
+        joined = _SEPARATOR.join(values)
+    cells = escape(joined).split(_SEPARATOR)
+    if len(cells) != len(values):
+        # A value contains the separator itself
+        cells = [escape(value) for value in values]
+    return cells
+
+
+def render_rows(df, columns=None):
+    """
+    Render the rows of a DataFrame as HTML table rows.
+
+    Each column is escaped as a whole and the cells are interleaved with the
+    row and cell tags by slice assignment, so the rows are built with one
+    join whatever the number of rows.
+
+    Args:
+        df (pandas.DataFrame): The rows to render.
+        columns (list, optional): The columns to show, default all of them.
+
+    Returns:
+        str: The `<tr>` rows.
+    """
+    columns = list(df.columns if columns is None else columns)
+    if not columns or df.empty:
+        return ""
+    rows, step = len(df), 2 * len(columns) + 1
+    pieces = ["</td><td>"] * (rows * step)
+    pieces[0::step] = ["<tr><td>"] * rows
+    for i, column in enumerate(columns):
+        pieces[2 * i + 1::step] = escape_column(df[column])
+    pieces[step - 1::step] = ["</td></tr>"] * rows
+    return "".join(pieces)
+
+
+def iter_table(df, columns=None, headers=None, chunk_rows=CHUNK_ROWS, attrs=""):
+    """
+    Render a DataFrame as an HTML table in chunks, for streaming large tables.
+
+    Args:
+        df (pandas.DataFrame): The rows to render.
+        columns (list, optional): The columns to show, default all of them.
+        headers (list, optional): The header labels, default the column names.
+        chunk_rows (int, optional): Rows per chunk, default `CHUNK_ROWS`.
+        attrs (str, optional): Attributes of the `<table>` tag, e.g. `' class="notes-table"'`.
+
+    Yields:
+        str: The table's opening tags and header, its rows `chunk_rows` at a time and its closing tags.
+    """
+    columns = list(df.columns if columns is None else columns)
+    headers = columns if headers is None else headers
+    header = "".join(f"<th>{escape(str(label))}</th>" for label in headers)
+    yield f"<table{attrs}><thead><tr>{header}</tr></thead><tbody>"
+    for start in range(0, len(df), chunk_rows):
+        yield render_rows(df.iloc[start:start + chunk_rows], columns)
+    yield "</tbody></table>"
+
+
+def render_table(df, columns=None, headers=None, attrs=""):
+    """
+    Render a DataFrame as an HTML table.
+
+    Args:
+        df (pandas.DataFrame): The rows to render.
+        columns (list, optional): The columns to show, default all of them.
+        headers (list, optional): The header labels, default the column names.
+        attrs (str, optional): Attributes of the `<table>` tag.
+
+    Returns:
+        str: The HTML table.
+    """
+    return "".join(iter_table(df, columns, headers, attrs=attrs))
 
 
 class DataTable(BaseComponent):
@@ -11,21 +116,5 @@ class DataTable(BaseComponent):
 
             data = self.component_data(entity_id, model)
 
-            table = Table(
-                Tr(
-                    Th(column) for column in data.columns
-                )
-            )
-
-            for data_row in data.to_numpy():
-
-                table_row = Tr(
-                    Td(val) for val in data_row
-                )
+            return NotStr(render_table(data))
 
-                children = (*table.children, table_row)
-                table.children = children
-            
-            return table
-            
-        
\ No newline at end of file
@@ -0,0 +1,224 @@
+import io
+import multiprocessing
+import os
+import threading
+import concurrent.futures
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+# Seconds to wait for a worker before giving up on a chart
+RENDER_TIMEOUT = 30.0
+
+_renderer = None
+_renderer_workers = 0
+_renderer_lock = threading.Lock()
+_renderer_init_lock = threading.Lock()
+
+
+def _init_worker():
+    """
+    Prepare a render worker: import matplotlib once with the Agg backend and the report styling.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    matplotlib.rcParams["savefig.transparent"] = True
+    matplotlib.rcParams["savefig.format"] = "png"
+    import matplotlib.backends.backend_agg  # noqa: F401
+    import matplotlib.figure  # noqa: F401
+
+
+def _figure():
+    """
+    Create a figure and axes without pyplot, so no global state is shared between renders.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def _png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", transparent=True)
+    return buffer.getvalue()
+
+
+def line_chart_png(spec):
+    """
+    Draw a line chart with one line per series.
+
+    Args:
+        spec (dict): `x` (dates as YYYY-MM-DD strings), `series` (label to
+            array of y values), `title`, `xlabel` and `ylabel`.
+
+    Returns:
+        bytes: The PNG image.
+    """
+    fig, ax = _figure()
+    x = np.asarray(spec["x"], dtype="datetime64[D]")
+    for label, y in spec["series"].items():
+        ax.plot(x, y, label=label)
+    ax.legend()
+    ax.set_title(spec["title"])
+    ax.set_xlabel(spec.get("xlabel", ""))
+    ax.set_ylabel(spec.get("ylabel", ""))
+    fig.autofmt_xdate()
+    return _png(fig)
+
+
+def bar_chart_png(spec):
+    """
+    Draw a single horizontal bar, e.g. a probability.
+
+    Args:
+        spec (dict): `value`, `title` and optionally `xlim` (default `(0, 1)`),
+            `color` and `fontsize`.
+
+    Returns:
+        bytes: The PNG image.
+    """
+    fig, ax = _figure()
+    ax.barh([""], [spec["value"]], color=spec.get("color", "blue"))
+    ax.set_xlim(*spec.get("xlim", (0, 1)))
+    ax.set_title(spec["title"], fontsize=spec.get("fontsize", 20))
+    return _png(fig)
+
+
+# Plot spec renderers by chart kind
+RENDERERS = {
+    "line": line_chart_png,
+    "bar": bar_chart_png,
+}
+
+
+def _render(kind, spec):
+    return RENDERERS[kind](spec)
+
+
+def _pool(max_workers):
+    # spawn: workers must not inherit the server's threads or open connections
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    )
+
+
+def configure_renderer(max_workers=None):
+    """
+    Replace the chart render process pool.
+
+    Args:
+        max_workers (int, optional): Number of worker processes. Defaults to
+            `EMPLOYEE_EVENTS_CHART_WORKERS`, else up to 4 depending on the CPU
+            count. 0 renders every chart in the calling thread instead.
+    """
+    global _renderer, _renderer_workers
+    if max_workers is None:
+        max_workers = int(os.environ.get("EMPLOYEE_EVENTS_CHART_WORKERS", min(4, os.cpu_count() or 1)))
+    shutdown_renderer()
+    with _renderer_lock:
+        _renderer_workers = max_workers
+        if max_workers > 0:
+            _renderer = _pool(max_workers)
+        else:
+            _renderer = False
+
+
+def get_renderer():
+    """
+    Return the chart render process pool, creating it on first use.
+
+    Returns:
+        ProcessPoolExecutor: The pool, or None if charts are rendered in the calling thread.
+    """
+    if _renderer is None:
+        with _renderer_init_lock:
+            if _renderer is None:
+                configure_renderer()
+    return _renderer or None
+
+
+def warm_renderer():
+    """
+    Start every render worker now instead of on the first chart.
+    """
+    renderer = get_renderer()
+    if renderer is not None:
+        for _ in range(_renderer_workers):
+            renderer.submit(_init_worker)
+
+
+def shutdown_renderer():
+    """
+    Shut the render process pool down; the next chart starts a new one.
+    """
+    global _renderer
+    with _renderer_lock:
+        renderer, _renderer = _renderer, None
+    if renderer:
+        renderer.shutdown(wait=True, cancel_futures=True)
+
+
+def _replace_broken_renderer(broken):
+    """
+    Replace a broken render pool with a new one of the same size.
+
+    Args:
+        broken (ProcessPoolExecutor): The pool a render failed on; if another
+            thread already replaced it, it is left alone.
+    """
+    global _renderer
+    with _renderer_lock:
+        if _renderer is not broken:
+            return
+        _renderer = _pool(_renderer_workers)
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def render_chart(kind, spec):
+    """
+    Render a chart from its plot spec on the render process pool.
+
+    The calling thread only waits on the result, so other requests keep
+    being served while the chart is drawn. If a worker dies, the pool is
+    rebuilt once and the chart retried on it. The chart is only drawn in the
+    calling thread if the pool is disabled.
+
+    Args:
+        kind (str): A key of `RENDERERS`.
+        spec (dict): The plot spec the renderer takes.
+
+    Returns:
+        bytes: The PNG image.
+
+    Raises:
+        ValueError: If `kind` is not a key of `RENDERERS`.
+        concurrent.futures.TimeoutError: If no worker answers within `RENDER_TIMEOUT`; the
+            caller shows its "not available" fallback instead of drawing a
+            chart the pool could not.
+        BrokenProcessPool: If the rebuilt pool breaks as well.
+    """
+    if kind not in RENDERERS:
+        raise ValueError(f"Unknown chart kind: {kind!r}")
+    for retry in (True, False):
+        renderer = get_renderer()
+        if renderer is None:
+            return _render(kind, spec)
+        try:
+            return renderer.submit(_render, kind, spec).result(timeout=RENDER_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            # Not the builtin TimeoutError before Python 3.11
+            raise concurrent.futures.TimeoutError(
+                f"No chart render worker answered within {RENDER_TIMEOUT}s"
+            ) from None
+        except BrokenProcessPool as e:
+            if not retry:
+                raise
+            print(f"Chart render pool broken, starting a new one: {e!r}")
+            _replace_broken_renderer(renderer)
+
@@ -0,0 +1,205 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+
+# The URL of a stored chart in a rendered page
+CHART_URL = re.compile(r"/charts/([0-9a-f]{64})\.png")
+
+
+def chart_key(*parts):
+    """
+    Build the cache key of a chart from everything its image depends on.
+
+    Args:
+        *parts: E.g. the entity type, entity ID, chart kind, data version and
+            any options (date range, model version) of the chart.
+
+    Returns:
+        str: A hex digest identifying the chart's inputs.
+    """
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def chart_digests(html):
+    """
+    Find the stored charts a rendered page shows.
+
+    Args:
+        html (str or bytes): The page.
+
+    Returns:
+        tuple: The sorted digests of the charts in the page.
+    """
+    if isinstance(html, bytes):
+        html = html.decode()
+    return tuple(sorted(set(CHART_URL.findall(html))))
+
+
+class ChartStore:
+    """
+    A bounded, thread-safe store of rendered chart images.
+
+    Images are content-addressed: they are stored under the SHA-256 digest
+    of their bytes, which is also their URL and strong ETag, so a URL
+    always refers to the same image. A second index maps the chart's
+    inputs (see `chart_key`) to that digest, so a chart whose data did not
+    change is never rendered twice.
+
+    The least recently used images are evicted once `maxsize` images or
+    `max_bytes` bytes are held. With a `directory`, images are also
+    written there once and read back after eviction, which lets several
+    worker processes share them.
+
+    Attributes:
+        maxsize (int): Maximum number of images held in memory.
+        max_bytes (int): Maximum total size of the images held in memory.
+        directory (str): Optional directory shared by every worker, or None.
+    """
+
+    def __init__(self, maxsize=512, max_bytes=64 * 1024 * 1024, directory=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._images = OrderedDict()
+        self._digests = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, digest):
+        return os.path.join(self.directory, f"{digest}.png")
+
+    def _remember(self, digest, image):
+        """
+        Hold an image in memory and evict the least recently used ones. Call with the lock held.
+        """
+        if digest in self._images:
+            self._images.move_to_end(digest)
+            return
+        self._images[digest] = image
+        self._bytes += len(image)
+        while self._images and (len(self._images) > self.maxsize or self._bytes > self.max_bytes):
+            _, evicted = self._images.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def get(self, digest):
+        """
+        Return the image stored under a digest.
+
+        Args:
+            digest (str): The image's SHA-256 hex digest.
+
+        Returns:
+            bytes: The image, or None if it is not (or no longer) stored.
+        """
+        with self._lock:
+            image = self._images.get(digest)
+            if image is not None:
+                self._images.move_to_end(digest)
+                return image
+
+        if not self.directory or len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+            return None
+        try:
+            with open(self._path(digest), "rb") as file:
+                image = file.read()
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._remember(digest, image)
+        return image
+
+    def contains(self, digest):
+        """
+        Check whether an image can still be served.
+
+        Args:
+            digest (str): The image's SHA-256 hex digest.
+
+        Returns:
+            bool: True if the image is held in memory or in `directory`.
+        """
+        with self._lock:
+            if digest in self._images:
+                return True
+        return bool(self.directory) and os.path.exists(self._path(digest))
+
+    def lookup(self, key):
+        """
+        Return the digest of the image rendered for a chart's inputs.
+
+        Args:
+            key (str): The chart's inputs, from `chart_key`.
+
+        Returns:
+            str: The image's SHA-256 hex digest, or None if the chart must be rendered.
+        """
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is not None and (digest in self._images or self.directory):
+                self._digests.move_to_end(key)
+                self.hits += 1
+                return digest
+            self.misses += 1
+            return None
+
+    def put(self, image, key=None):
+        """
+        Store an image.
+
+        Args:
+            image (bytes): The encoded image.
+            key (str, optional): The inputs the image was rendered from, from `chart_key`.
+
+        Returns:
+            str: The image's SHA-256 hex digest.
+        """
+        digest = hashlib.sha256(image).hexdigest()
+        with self._lock:
+            self._remember(digest, image)
+            if key is not None:
+                self._digests[key] = digest
+                self._digests.move_to_end(key)
+                while len(self._digests) > self.maxsize * 4:
+                    self._digests.popitem(last=False)
+
+        if self.directory and not os.path.exists(self._path(digest)):
+            # Write under a temporary name first so readers never see a partial file
+            descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(image)
+            os.replace(temporary, self._path(digest))
+        return digest
+
+    def clear(self):
+        """
+        Drop every image held in memory (files in `directory` are kept).
+        """
+        with self._lock:
+            self._images.clear()
+            self._digests.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Return the hit/miss counters and the memory use of the store.
+
+        Returns:
+            dict: `hits`, `misses`, `images`, `bytes` and `maxsize`.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "images": len(self._images),
+                "bytes": self._bytes,
+                "maxsize": self.maxsize,
+            }
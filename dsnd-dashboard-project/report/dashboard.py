@@ -1,9 +1,17 @@
 from fasthtml.common import *
-import matplotlib.pyplot as plt
-from fastapi import FastAPI, Request, Query, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import FastAPI, Request, Query, Form, Response
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from html import escape
+from typing import Literal
+from urllib.parse import urlencode
+import asyncio
+import concurrent.futures
+import threading
+import time
 
 import os
 import sys
@@ -11,88 +19,219 @@ BASE_DIR = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
 sys.path.insert(0, BASE_DIR)
 TEMPLATES_DIR = os.path.join(BASE_DIR, "report", "templates")
 STATIC_DIR = os.path.join(BASE_DIR, "report", "static")
-from python_package.employee_events import Employee, Team
-
-from utils import load_model
+from python_package.employee_events import (
+    QueryBase,
+    Employee,
+    Team,
+    get_pool,
+    configure_pool,
+    close_pool,
+    shutdown_executor,
+    get_executor,
+    data_version,
+    DataLoader,
+)
+from python_package.employee_events.query_base import SNIPPET_START, SNIPPET_END
+from python_package.employee_events.risk import model_version, refresh_risk_scores
+
+from utils import load_model, model_artifact_path, encode_cursor, decode_cursor, columnar
+from chart_store import ChartStore, chart_key, chart_digests
+from chart_renderer import render_chart, warm_renderer, shutdown_renderer
+from downsample import CHART_WIDTH, CHART_POINTS, downsample_indices, downsample_counts
+from page_cache import PageCache, etag_matches
+from entity_index import EntityIndexes
 import pandas as pd
 
+# Rendered charts, served from /charts/{digest}. Set EMPLOYEE_EVENTS_CHART_DIR
+# to share them between worker processes through a directory.
+chart_store = ChartStore(directory=os.environ.get("EMPLOYEE_EVENTS_CHART_DIR"))
+
+# Rendered report pages. After the data or the model changes, a page is
+# served stale for up to EMPLOYEE_EVENTS_PAGE_STALE_SECONDS while it is
+# rendered again in the background.
+page_cache = PageCache(stale_seconds=float(os.environ.get("EMPLOYEE_EVENTS_PAGE_STALE_SECONDS", 60)))
+
+# Background page refreshes, referenced until they finish
+_page_refreshes = set()
+
+# Notes shown per page of the notes table; more are fetched with "Load more"
+NOTES_PAGE_SIZE = 50
+MAX_NOTES_PAGE_SIZE = 500
+
+# Entity name indexes for the typeahead, rebuilt when the data changes
+entity_indexes = EntityIndexes()
+
+# Profiles with more entities than this get a typeahead search instead of
+# a <select> listing every entity
+TYPEAHEAD_THRESHOLD = int(os.environ.get("EMPLOYEE_EVENTS_TYPEAHEAD_THRESHOLD", 200))
+
+# Matches the typeahead shows, and the most /entities/search returns
+TYPEAHEAD_LIMIT = 10
+MAX_TYPEAHEAD_LIMIT = 50
+
+# Set EMPLOYEE_EVENTS_STREAM_REPORTS=1 to stream report pages that are not
+# cached: the page shell is sent at once and the charts and notes follow as
+# they finish. `?stream=0|1` overrides it per request.
+STREAM_REPORTS = os.environ.get("EMPLOYEE_EVENTS_STREAM_REPORTS") == "1"
+
+# Where the streamed components are inserted into the page shell
+STREAM_SLOTS = "<!-- streamed components -->"
+
+# Shown in place of a notes table that failed or timed out
+NOTES_FALLBACK = "<p>Notes not available.</p>"
+
+# Optional YYYY-MM-DD query parameter; empty form fields mean "no bound"
+DATE_PARAM_PATTERN = r"^(\d{4}-\d{2}-\d{2})?$"
+
+# How report charts are drawn: "server" renders PNGs, "client" draws them in
+# the browser from the /api data routes, with the server charts as fallback
+CHART_MODE = os.environ.get("EMPLOYEE_EVENTS_CHART_MODE", "server")
+CHART_MODE_PATTERN = r"^(server|client)?$"
+
+# Seconds a report page waits for its components; slower ones are replaced
+# by a fallback so one slow query or chart cannot hold the whole page
+COMPONENT_TIMEOUT = float(os.environ.get("EMPLOYEE_EVENTS_COMPONENT_TIMEOUT", 10))
+
 """
 Below, we import the parent classes
 you will use for subclassing
 """
 from base_components import (
-    Dropdown,
     BaseComponent,
     Radio,
     MatplotlibViz,
-    DataTable
+    DataTable,
+    render_rows
     )
 
 from combined_components import FormGroup, CombinedComponent
 
 
-class ReportDropdown(Dropdown):
+def component_result(future, deadline, name, failed):
     """
-    A dropdown component for selecting an entity.
+    Wait for a report component until the page's deadline.
 
-    Methods:
-        build_component(entity_id, model):
-            Builds the dropdown HTML based on the provided entity and model.
-        component_data(entity_id, model):
-            Fetches the data required to populate the dropdown options.
+    Args:
+        future (Future): The component being built on the query executor.
+        deadline (float): `time.monotonic()` value by which the page must be assembled.
+        name (str): The component's name, for logging.
+        failed (list): Names of the components that failed; `name` is appended on failure.
+
+    Returns:
+        object: The component's result, or None if it failed or timed out.
     """
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except Exception as e:
+        # A timed-out component keeps running and warms the caches for the next page
+        future.cancel()
+        print(f"Error building {name}: {e!r}")
+        failed.append(name)
+        return None
 
-    def build_component(self, entity_id, model):
-        """
-        Build the HTML for the dropdown selector.
 
-        Args:
-            entity_id (int): The ID of the selected entity.
-            model (object): The model (Employee or Team) providing dropdown data.
+async def async_component_result(future, deadline, name, failed):
+    """
+    Await a report component until the page's deadline, without blocking the event loop.
 
-        Returns:
-            str: The HTML string for the dropdown selector.
+    Args:
+        future (Future): The component being built on the query executor.
+        deadline (float): `time.monotonic()` value by which the page must be assembled.
+        name (str): The component's name, for logging.
+        failed (list): Names of the components that failed; `name` is appended on failure.
 
-        Raises:
-            ValueError: If model or entity_id is None.
-        """
-        if model is None or entity_id is None:
-            raise ValueError("Model or entity_id is None. Please check the inputs.")
-        if type(model) == int:  # Handle swapped parameters
-            model, entity_id = entity_id, model
-        
-        self.label = model.name
-        options_html = "".join(
-            f'<option value="{item["value"]}">{item["label"]}</option>' 
-            for item in self.component_data(entity_id, model)
-        )
-        return f"""
-        <label for="entity-selector">Select {model.name.capitalize()}:</label>
-        <select id="entity-selector" name="entity">
-            {options_html}
-        </select>
-        """
+    Returns:
+        object: The component's result, or None if it failed or timed out.
+    """
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), max(0.0, deadline - time.monotonic()))
+    except Exception as e:
+        future.cancel()
+        print(f"Error building {name}: {e!r}")
+        failed.append(name)
+        return None
 
-    def component_data(self, entity_id, model):
-        """
-        Fetch the data required to populate the dropdown.
 
-        Args:
-            entity_id (int): The ID of the selected entity.
-            model (object): The model (Employee or Team) providing dropdown data.
+def entity_index(model):
+    """
+    Return the name index of a model's entities for the current data.
 
-        Returns:
-            list: A list of dictionaries containing 'value' and 'label' for dropdown options.
+    Args:
+        model (object): The model (Employee or Team), or its request's DataLoader.
 
-        Raises:
-            ValueError: If model or entity_id is None.
-        """
-        if model is None or entity_id is None:
-            raise ValueError("Model or entity_id is None. Please check the inputs.")
-        if type(model) == int:  # Handle swapped parameters
-            model, entity_id = entity_id, model
-        
-        return model.names()
+    Returns:
+        EntityIndex: The index, built from `model.names()` when the data changed.
+    """
+    return entity_indexes.get(model.name, data_version(), model.names)
+
+
+def render_typeahead(profile, index, selected=None, select_id="entity"):
+    """
+    Render a typeahead entity selector: a search box and a short <select>.
+
+    The select lists the selected entity and the first few others; as the
+    user types, the page replaces its options with the top matches from
+    `/entities/search`, so the full list of entities is never sent.
+
+    Args:
+        profile (str): "employee" or "team".
+        index (EntityIndex): The entities of the profile.
+        selected (int, optional): The ID of the selected entity.
+        select_id (str, optional): The HTML ID of the select.
+
+    Returns:
+        str: The HTML of the search box and the select.
+    """
+    entities = index.search("", TYPEAHEAD_LIMIT)
+    selected_name = index.name(selected) if selected is not None else None
+    if selected_name is not None:
+        entities = [(selected_name, selected)] + [entity for entity in entities if entity[1] != selected]
+    options_html = "".join(
+        f'<option value="{entity_id}"{" selected" if entity_id == selected else ""}>{escape(name)}</option>'
+        for name, entity_id in entities
+    )
+    return (
+        f'<input type="search" class="entity-typeahead" data-type="{profile}" data-select="{select_id}" '
+        f'value="{escape(selected_name or "")}" placeholder="Search {profile}s" autocomplete="off">'
+        f'<select id="{select_id}" name="entity">{options_html}</select>'
+    )
+
+
+def render_site_nav(entity_id=None, model=None):
+    """
+    Render the entity selector of an exported page: a dropdown and plain links per profile.
+
+    A static file server cannot answer the filters form or the dropdown and
+    typeahead routes, so every page lists every employee and team. Picking
+    one in a dropdown navigates to its page; the links work without scripts.
+
+    Args:
+        entity_id (int, optional): The ID of the entity the page is for.
+        model (object, optional): The model (Employee or Team) of the page.
+
+    Returns:
+        str: The HTML of the navigation.
+    """
+    sections = []
+    for profile_model in (Employee(), Team()):
+        profile = profile_model.name
+        current = entity_id if model is not None and model.name == profile else None
+        entities = entity_index(profile_model).entities
+        options_html = "".join(
+            f'<option value="/{profile}/{option_id}/"{" selected" if option_id == current else ""}>'
+            f'{escape(name)}</option>'
+            for name, option_id in entities
+        )
+        links_html = "".join(
+            f'<li><a href="/{profile}/{link_id}/">{escape(name)}</a></li>' for name, link_id in entities
+        )
+        sections.append(
+            f'<label for="site-{profile}">{profile.capitalize()}:</label>'
+            f'<select id="site-{profile}" onchange="if (this.value) location.href = this.value">'
+            f'<option value="">-- Select --</option>{options_html}</select>'
+            f'<details><summary>All {profile}s</summary><ul>{links_html}</ul></details>'
+        )
+    return f'<nav class="site-nav">{"".join(sections)}</nav>'
 
 
 class Header(BaseComponent):
@@ -128,27 +267,43 @@ class Header(BaseComponent):
         possessive = f"{username}'s" if not username.endswith("s") else f"{username}'"
         
         # Return header string
-        return f"<h1>{possessive} {model.name.capitalize() if isinstance(model, Employee) else ''} Report</h1>"
+        return f"<h1>{possessive} {model.name.capitalize() if model.name == 'employee' else ''} Report</h1>"
 
 class LineChart(MatplotlibViz):
     """
     A class for generating line charts visualizing cumulative events over time.
 
+    Attributes:
+        start (str): First date (YYYY-MM-DD) to plot, or None for the first event.
+        end (str): Last date (YYYY-MM-DD) to plot, or None for the last event.
+        points (int): Maximum number of dates to plot; longer histories are downsampled.
+
     Methods:
         visualization(model, entity_id):
             Prepares and saves a line chart based on the provided model and entity ID.
     """
 
+    def __init__(self, start=None, end=None, points=CHART_POINTS):
+        """
+        Initialize the LineChart with an optional date range.
+        """
+        self.start = start
+        self.end = end
+        self.points = points
+
     def visualization(self, model, entity_id):
         """
-        Generate and save a line chart for cumulative events over time.
+        Generate and store a line chart for cumulative events over time.
+
+        The chart is rendered only if the chart store holds none for this
+        entity, date range and data version.
 
         Args:
             model (object): The model (Employee or Team) providing event data.
             entity_id (int): The ID of the entity whose events are visualized.
 
         Returns:
-            str: Relative file path to the saved chart, or a message indicating no data is available.
+            str: Relative URL of the stored chart, or a message indicating no data is available.
 
         Raises:
             ValueError: If model or entity_id is None.
@@ -162,44 +317,40 @@ class LineChart(MatplotlibViz):
             model, entity_id = entity_id, model
 
         print(f"Generating LineChart for entity_id: {entity_id}, model: {model.name}")
-        
-        # Prepare data
-        data = model.event_counts(entity_id)
-        print(f"Event counts data for entity_id {entity_id}: {data}")
+        key = chart_key(model.name, entity_id, "line", data_version(), self.start, self.end, self.points)
+        digest = chart_store.lookup(key)
+        if digest is not None:
+            return f"charts/{digest}.png"
+
+        # Prepare data: running totals come precomputed and ordered by date
+        data = model.cumulative_event_counts(entity_id, self.start, self.end)
+        print(f"Cumulative event counts for entity_id {entity_id}: {data}")
         if data.empty:
             print(f"No data available for entity_id: {entity_id}")
             return f"<p>No data available to generate Line Chart for {model.name} with ID {entity_id}.</p>"
 
-        # Clean and process data
-        data.fillna(0, inplace=True)
-        data.set_index("event_date", inplace=True)
-        data.sort_index(inplace=True)
-        data = data.cumsum()
-        data.columns = ["Positive", "Negative"]
-
-        # Create chart
-        fig, ax = plt.subplots()
-        data.plot(ax=ax)
-        ax.set_title(f"Cumulative Events Over Time ({model.username(entity_id)[0][0]})")
-        ax.set_xlabel("Date")
-        ax.set_ylabel("Event Count")
-
-        # Debug and save chart
-        print(f"STATIC_DIR: {STATIC_DIR}")  # Verify STATIC_DIR
-        print(f"Static directory path: {STATIC_DIR}")  # Check the static directory path
-        print(f"Static directory exists: {os.path.exists(STATIC_DIR)}")  # Ensure the directory exists
-        os.makedirs(STATIC_DIR, exist_ok=True)
-
-        file_path = os.path.join(STATIC_DIR, f"line_chart_{entity_id}.png")
-        print(f"Saving LineChart to {file_path}")
-        try:
-            fig.savefig(file_path)
-            print(f"Chart successfully saved to: {file_path}")  # Confirm file saved
-        except Exception as e:
-            print(f"Error saving chart: {e}")  # Catch any errors
-
-        plt.close(fig)
-        return f"static/line_chart_{entity_id}.png"
+        # Keep only the dates that shape the lines at the chart's width
+        rows = downsample_indices(
+            data["event_date"],
+            [data["cumulative_positive_events"], data["cumulative_negative_events"]],
+            self.points,
+        )
+        data = data.iloc[rows]
+
+        # Render chart on the render pool
+        spec = {
+            "x": data["event_date"].to_numpy(),
+            "series": {
+                "Positive": data["cumulative_positive_events"].to_numpy(),
+                "Negative": data["cumulative_negative_events"].to_numpy(),
+            },
+            "title": f"Cumulative Events Over Time ({model.username(entity_id)[0][0]})",
+            "xlabel": "Date",
+            "ylabel": "Event Count",
+        }
+        digest = chart_store.put(render_chart("line", spec), key)
+        print(f"LineChart stored as: {digest}")
+        return f"charts/{digest}.png"
 
 class BarChart(MatplotlibViz):
     """
@@ -207,24 +358,64 @@ class BarChart(MatplotlibViz):
 
     Attributes:
         predictor: The trained model used to predict probabilities for the bar chart.
+        predictor_version (str): Version of the model file, to detect stale risk scores.
 
     Methods:
+        risk(model, entity_id):
+            Looks up the entity's predicted recruitment risk.
         visualization(model, entity_id):
             Prepares and saves a bar chart based on the provided model and entity ID.
     """
 
     predictor = load_model()
+    predictor_version = model_version(model_artifact_path())
+
+    def risk(self, model, entity_id):
+        """
+        Look up the predicted recruitment risk of an employee or team.
+
+        Risks are read from the batch-scored `risk_scores` table, which is
+        scored at startup (see `score_risks`) and by the asset build. If the
+        table is missing, or stale because the data or the model changed
+        since, this one entity is scored from its data instead, and every
+        risk is re-scored in the background (see `schedule_risk_scoring`).
+        Requests never write: an entity without a score in fresh scores has
+        no events.
+
+        Args:
+            model (object): The model (Employee or Team) providing the data.
+            entity_id (int): The ID of the entity.
+
+        Returns:
+            float: The predicted risk, or None if the entity has no data.
+        """
+        risk = model.risk_score(entity_id, self.predictor_version)
+        if risk is not None:
+            return risk
+        if model.risk_scores_fresh(self.predictor_version):
+            return None
+        schedule_risk_scoring()
+
+        data = model.model_data(entity_id)
+        print(f"Model data for entity_id {entity_id}: {data}")
+        if data.empty:
+            return None
+        probabilities = self.predictor.predict_proba(data)[:, 1]
+        return probabilities.mean() if model.name == "team" else probabilities[0]
 
     def visualization(self, model, entity_id):
         """
-        Generate and save a bar chart for predicted recruitment risk.
+        Generate and store a bar chart for predicted recruitment risk.
+
+        The chart is rendered only if the chart store holds none for this
+        entity, data version and model version.
 
         Args:
             model (object): The model (Employee or Team) providing data for the chart.
             entity_id (int): The ID of the entity being visualized.
 
         Returns:
-            str: Relative file path to the saved chart, or a message indicating no data is available.
+            str: Relative URL of the stored chart, or a message indicating no data is available.
 
         Raises:
             ValueError: If model or entity_id is None.
@@ -238,57 +429,123 @@ class BarChart(MatplotlibViz):
             model, entity_id = entity_id, model
 
         print(f"Generating BarChart for entity_id: {entity_id}, model: {model.name}")
-        
-        # Prepare data
-        data = model.model_data(entity_id)
-        print(f"Model data for entity_id {entity_id}: {data}")
-        if data.empty:
+        key = chart_key(model.name, entity_id, "bar", data_version(), self.predictor_version)
+        digest = chart_store.lookup(key)
+        if digest is not None:
+            return f"charts/{digest}.png"
+
+        # Look up the predicted risk
+        pred = self.risk(model, entity_id)
+        if pred is None:
             print(f"No model data available for entity_id: {entity_id}")
             return f"<p>No data available to generate Bar Chart for {model.name} with ID {entity_id}.</p>"
 
-        # Predict probabilities
-        probabilities = self.predictor.predict_proba(data)[:, 1]
-        pred = probabilities.mean() if model.name == "team" else probabilities[0]
-
-        # Create chart
-        fig, ax = plt.subplots()
-        ax.barh([""], [pred], color="blue")
-        ax.set_xlim(0, 1)
-        ax.set_title(f"Predicted Recruitment Risk ({model.username(entity_id)[0][0]})", fontsize=20)
-
-        # Debug and save chart
-        print(f"STATIC_DIR: {STATIC_DIR}")  # Verify STATIC_DIR
-        print(f"Static directory path: {STATIC_DIR}")  # Check the static directory path
-        print(f"Static directory exists: {os.path.exists(STATIC_DIR)}")  # Ensure the directory exists
-        os.makedirs(STATIC_DIR, exist_ok=True)
-
-        file_path = os.path.join(STATIC_DIR, f"bar_chart_{entity_id}.png")
-        print(f"Saving BarChart to {file_path}")
-        try:
-            fig.savefig(file_path)
-            print(f"Chart successfully saved to: {file_path}")  # Confirm file saved
-        except Exception as e:
-            print(f"Error saving chart: {e}")  # Catch any errors
-
-        plt.close(fig)
-        return f"static/bar_chart_{entity_id}.png"
+        # Render chart on the render pool
+        spec = {
+            "value": float(pred),
+            "title": f"Predicted Recruitment Risk ({model.username(entity_id)[0][0]})",
+        }
+        digest = chart_store.put(render_chart("bar", spec), key)
+        print(f"BarChart stored as: {digest}")
+        return f"charts/{digest}.png"
 
 class Visualizations(CombinedComponent):
     """
     A class for rendering visualizations (LineChart and BarChart) for a specific entity and model.
 
+    Attributes:
+        start (str): First date (YYYY-MM-DD) of the line chart, or None.
+        end (str): Last date (YYYY-MM-DD) of the line chart, or None.
+        mode (str): "server" to render PNG charts, or "client" to let the browser draw them.
+        failed (list): Names of the charts that failed or timed out in the last `render`.
+
     Methods:
         render(entity_id, model):
             Generates and returns HTML for visualizations (LineChart and BarChart).
+        render_client(entity_id, model):
+            Generates the canvases the browser draws the charts on.
     """
 
-    def render(self, entity_id, model):
+    def __init__(self, start=None, end=None, mode=CHART_MODE):
+        """
+        Initialize the Visualizations with an optional date range for the line chart.
+        """
+        self.start = start
+        self.end = end
+        self.mode = mode
+        self.failed = []
+
+    def chart_urls(self, entity_id, model, kind):
+        """
+        Build the URLs of a chart's data and of its server-rendered fallback.
+
+        Args:
+            entity_id (int): The ID of the entity.
+            model (object): The model (Employee or Team) providing the data.
+            kind (str): "line" or "bar".
+
+        Returns:
+            tuple: The data URL and the fallback image URL.
+        """
+        params = {"start": self.start, "end": self.end} if kind == "line" else {}
+        query = urlencode({key: value for key, value in params.items() if value is not None})
+        query = f"?{query}" if query else ""
+        data = "events" if kind == "line" else "risk"
+        return (
+            f"/api/{model.name}/{entity_id}/{data}{query}",
+            f"/{model.name}/{entity_id}/charts/{kind}{query}",
+        )
+
+    def render_client(self, entity_id, model):
+        """
+        Render canvases for the browser to draw the charts on.
+
+        No chart is rendered here: the page script fetches the chart data from
+        the JSON data routes and draws it. If that fails, or scripts are
+        disabled, the chart rendered by `LineChart`/`BarChart` is shown instead.
+
+        Args:
+            entity_id (int): The ID of the entity for which the visualizations are generated.
+            model (object): The model (Employee or Team) providing data for the visualizations.
+
+        Returns:
+            str: An HTML string containing one canvas per chart.
+        """
+        username = model.username(entity_id)[0][0]
+        charts = [
+            ("line", "Line Chart", f"Cumulative Events Over Time ({username})"),
+            ("bar", "Bar Chart", f"Predicted Recruitment Risk ({username})"),
+        ]
+        figures = []
+        for kind, alt, title in charts:
+            data_url, fallback_url = self.chart_urls(entity_id, model, kind)
+            figures.append(
+                f'<figure class="client-chart" data-kind="{kind}" data-src="{escape(data_url)}" '
+                f'data-fallback="{escape(fallback_url)}" data-title="{escape(title)}">'
+                f'<canvas width="{CHART_WIDTH}" height="480" aria-label="{alt}"></canvas>'
+                f'<noscript><img src="{escape(fallback_url)}" alt="{alt}" /></noscript>'
+                f'</figure>'
+            )
+        return f"""
+        <div class="visualizations" data-chart-mode="client">
+            {"".join(figures)}
+        </div>
+        """
+
+    def render(self, entity_id, model, deadline=None):
         """
         Render visualizations (LineChart and BarChart) for the given entity and model.
 
+        Both charts are built at once on the query executor, each drawing on
+        the render pool. A chart that fails or is not ready by the deadline
+        is replaced by a "not available" message. In client mode only the
+        canvases are rendered, see `render_client`.
+
         Args:
             entity_id (int): The ID of the entity for which the visualizations are generated.
             model (object): The model (Employee or Team) providing data for the visualizations.
+            deadline (float, optional): `time.monotonic()` value to wait for the charts until,
+                default is `COMPONENT_TIMEOUT` from now.
 
         Returns:
             str: An HTML string containing the visualizations or messages indicating their unavailability.
@@ -300,24 +557,25 @@ class Visualizations(CombinedComponent):
             Catches and logs exceptions during the chart generation process to prevent crashes.
         """
         print(f"Visualizations.render() called for entity_id: {entity_id}, model: {model.name}")  # Debug start
+        self.failed = []
+        if self.mode == "client":
+            return self.render_client(entity_id, model)
+        if deadline is None:
+            deadline = time.monotonic() + COMPONENT_TIMEOUT
+
+        # Generate both charts at once; each waits on its own render worker
+        line_chart = get_executor().submit(LineChart(self.start, self.end).visualization, model, entity_id)
+        bar_chart = get_executor().submit(BarChart().visualization, model, entity_id)
 
         # Attempt to generate LineChart
-        try:
-            print(f"Calling LineChart.visualization() for entity_id: {entity_id}")  # Debug LineChart call
-            line_chart_path = LineChart().visualization(model, entity_id)
-            print(f"LineChart path returned: {line_chart_path}")  # Debug LineChart result
-        except Exception as e:
-            print(f"Error generating LineChart: {e}")  # Catch any errors
-            line_chart_path = None
+        print(f"Calling LineChart.visualization() for entity_id: {entity_id}")  # Debug LineChart call
+        line_chart_path = component_result(line_chart, deadline, "LineChart", self.failed)
+        print(f"LineChart path returned: {line_chart_path}")  # Debug LineChart result
 
         # Attempt to generate BarChart
-        try:
-            print(f"Calling BarChart.visualization() for entity_id: {entity_id}")  # Debug BarChart call
-            bar_chart_path = BarChart().visualization(model, entity_id)
-            print(f"BarChart path returned: {bar_chart_path}")  # Debug BarChart result
-        except Exception as e:
-            print(f"Error generating BarChart: {e}")  # Catch any errors
-            bar_chart_path = None
+        print(f"Calling BarChart.visualization() for entity_id: {entity_id}")  # Debug BarChart call
+        bar_chart_path = component_result(bar_chart, deadline, "BarChart", self.failed)
+        print(f"BarChart path returned: {bar_chart_path}")  # Debug BarChart result
 
         # Validate LineChart
         if not line_chart_path:
@@ -348,13 +606,34 @@ class NotesTable(DataTable):
     """
     A class for rendering a notes table component for a specific entity and model.
 
+    Only one page of notes is rendered. When more notes exist, the last row
+    is a "Load more" button that fetches the next page from the notes
+    fragment route using a keyset cursor.
+
+    Attributes:
+        start (str): First note date (YYYY-MM-DD) to show, or None.
+        end (str): Last note date (YYYY-MM-DD) to show, or None.
+        limit (int): Number of notes per page.
+        after (tuple): Keyset cursor `(note_date, note, note_id)` of the previous page, or None.
+
     Methods:
         component_data(entity_id, model):
             Fetches and validates notes data as a pandas DataFrame.
+        build_rows(entity_id, model):
+            Builds the HTML rows of one page, including the "Load more" row.
         build_component(entity_id, model):
             Builds and returns the HTML representation of the notes table.
     """
 
+    def __init__(self, start=None, end=None, limit=NOTES_PAGE_SIZE, after=None):
+        """
+        Initialize the NotesTable with an optional date range and page.
+        """
+        self.start = start
+        self.end = end
+        self.limit = limit
+        self.after = after
+
     def component_data(self, entity_id, model):
         """
         Fetch and validate data for the notes table.
@@ -378,12 +657,63 @@ class NotesTable(DataTable):
         if isinstance(model, int):
             model, entity_id = entity_id, model
 
-        # Fetch notes data
-        df = model.notes(entity_id)
+        # Fetch one note past the page to learn whether another page exists
+        df = model.notes(entity_id, self.start, self.end, limit=self.limit + 1, after=self.after)
         if not isinstance(df, pd.DataFrame):
             raise TypeError("Expected a pandas DataFrame from model.notes().")
         return df
 
+    def next_page_url(self, entity_id, model, cursor):
+        """
+        Build the URL of the notes fragment that follows a page.
+
+        Args:
+            entity_id (int): The ID of the entity whose notes are paged.
+            model (object): The model providing notes data.
+            cursor (tuple): The `(note_date, note, note_id)` of the last row on the page.
+
+        Returns:
+            str: The URL of the next page's rows.
+        """
+        params = {"start": self.start, "end": self.end, "limit": self.limit, "after": encode_cursor(cursor)}
+        query = urlencode({key: value for key, value in params.items() if value is not None})
+        return f"/{model.name}/{entity_id}/notes?{query}"
+
+    def build_rows(self, entity_id, model):
+        """
+        Build the HTML rows for one page of notes.
+
+        Args:
+            entity_id (int): The ID of the entity for which the notes are fetched.
+            model (object): The model providing notes data.
+
+        Returns:
+            str: The `<tr>` rows of the page, followed by a "Load more" row if more notes exist.
+
+        Raises:
+            ValueError: If the DataFrame is missing required columns.
+        """
+        df = self.component_data(entity_id, model)
+
+        # Validate required columns
+        required_columns = ["note_date", "note"]
+        if not all(col in df.columns for col in required_columns):
+            raise ValueError(f"DataFrame is missing required columns: {', '.join(required_columns)}.")
+
+        page = df.iloc[:self.limit]
+        table_rows = render_rows(page, required_columns)
+
+        if len(df) > self.limit:
+            last = page.iloc[-1]
+            cursor = (last["note_date"], last["note"], int(last["note_id"]))
+            next_url = self.next_page_url(entity_id, model, cursor)
+            table_rows += (
+                f'<tr class="load-more"><td colspan="2">'
+                f'<button type="button" data-href="{escape(next_url)}">Load more</button>'
+                f'</td></tr>'
+            )
+        return table_rows
+
     def build_component(self, entity_id, model):
         """
         Build the HTML representation of the notes table.
@@ -399,23 +729,11 @@ class NotesTable(DataTable):
             ValueError: If the DataFrame is missing required columns.
 
         Process:
-            - Fetch and validate the notes data.
+            - Fetch and validate the first page of notes data.
             - Convert DataFrame rows into HTML table rows.
             - Wrap the rows in a complete HTML table structure.
         """
-        # Fetch and validate notes data
-        df = self.component_data(entity_id, model)
-
-        # Validate required columns
-        required_columns = ["note_date", "note"]
-        if not all(col in df.columns for col in required_columns):
-            raise ValueError(f"DataFrame is missing required columns: {', '.join(required_columns)}.")
-
-        # Convert rows to HTML
-        table_rows = "".join(
-            f"<tr><td>{row['note_date']}</td><td>{row['note']}</td></tr>"
-            for _, row in df.iterrows()
-        )
+        table_rows = self.build_rows(entity_id, model)
 
         # Build HTML table
         return f"""
@@ -501,13 +819,19 @@ class DashboardFilters(FormGroup):
             str: An HTML string representing the dropdown selector.
 
         Notes:
-            - If a model is provided, the dropdown is populated with its entities.
+            - If a model is provided, the dropdown is populated with its entities,
+              or is a typeahead if it has more than `TYPEAHEAD_THRESHOLD` of them.
+            - The entity whose ID is `userid` is selected.
             - If no model is provided, an empty dropdown is returned.
         """
         if model:
+            index = entity_index(model)
+            if len(index) > TYPEAHEAD_THRESHOLD:
+                return render_typeahead(model.name, index, userid)
             # Build HTML options from the model's entities
             options_html = "".join(
-                f'<option value="{entity[1]}">{entity[0]}</option>' for entity in model.names()
+                f'<option value="{entity[1]}"{" selected" if entity[1] == userid else ""}>{escape(str(entity[0]))}</option>'
+                for entity in model.names()
             )
             return f'<select id="entity" name="entity">{options_html}</select>'
         # Default empty dropdown
@@ -575,17 +899,42 @@ class Report:
         filters (DashboardFilters): Component to manage and render dashboard filters.
         visualizations (Visualizations): Component to generate visualizations.
         notes_table (NotesTable): Component to build and display the notes table.
+        start (str): First date (YYYY-MM-DD) of the report, or None.
+        end (str): Last date (YYYY-MM-DD) of the report, or None.
+        chart_mode (str): "server" or "client", see `Visualizations`.
+        timeout (float): Seconds to wait for the components before using their fallbacks.
+        static (bool): Render the page for a static export (see `render_site_nav`).
+        failed (list): Names of the components that fell back in the last `render` or `stream`.
+        html (tuple): The header, visualizations, notes table and dropdown HTML of the last
+            `stream` once it finished, or None.
     """
 
-    def __init__(self):
+    def __init__(self, start=None, end=None, notes_limit=NOTES_PAGE_SIZE, chart_mode=CHART_MODE,
+                 timeout=COMPONENT_TIMEOUT, static=False):
         """
         Initializes the Report class with all its components.
+
+        Args:
+            start (str, optional): First date (YYYY-MM-DD) of the charts and notes.
+            end (str, optional): Last date (YYYY-MM-DD) of the charts and notes.
+            notes_limit (int, optional): Number of notes on the first page.
+            chart_mode (str, optional): Where the charts are drawn, "server" or "client".
+            timeout (float, optional): Seconds to wait for the components, default `COMPONENT_TIMEOUT`.
+            static (bool, optional): Leave out the forms and scripts that need the running app,
+                and link every page instead, for `export.py`.
         """
         print("Initializing Report class")
+        self.start = start
+        self.end = end
+        self.chart_mode = chart_mode
+        self.timeout = timeout
+        self.static = static
+        self.failed = []
+        self.html = None
         self.header = Header()
         self.filters = DashboardFilters()
-        self.visualizations = Visualizations()
-        self.notes_table = NotesTable()
+        self.visualizations = Visualizations(start, end, chart_mode)
+        self.notes_table = NotesTable(start, end, notes_limit)
 
     def render(self, request: Request, entity_id, model):
         """
@@ -594,7 +943,8 @@ class Report:
         Args:
             request (Request): The incoming HTTP request object.
             entity_id (int): The ID of the entity (employee or team) to render the report for.
-            model (object): The model (Employee or Team) providing data for the report.
+            model (object): The model (Employee or Team) providing data for the report, ideally
+                wrapped in a `DataLoader` so the components share their queries.
 
         Returns:
             TemplateResponse: A rendered HTML response with all components of the report page.
@@ -602,41 +952,417 @@ class Report:
         Notes:
             - The `DashboardFilters` component renders dynamic filters.
             - The header, visualizations, and notes table are generated based on the entity and model.
+            - The components are built at the same time on the query executor, with the charts
+              drawn on the render pool, so the page takes as long as its slowest component.
+            - A component that fails or is not ready within `timeout` is replaced by a fallback
+              and listed in `failed`.
         """
         print(f"Rendering report for entity_id: {entity_id}, model: {model.name}")
+        deadline = time.monotonic() + self.timeout
+        self.failed = []
 
-        # Generate individual report components
-        header_html = self.header.build_component(entity_id, model)
-        visualizations_html = self.visualizations.render(entity_id, model)
-        notes_html = self.notes_table.build_component(entity_id, model)
+        # Generate individual report components; every task is a leaf that
+        # never waits on the executor itself, so the executor cannot deadlock
+        executor = get_executor()
+        header = executor.submit(self.header.build_component, entity_id, model)
+        notes = executor.submit(self.notes_table.build_component, entity_id, model)
+        dropdown = executor.submit(self.render_dropdown, entity_id, model)
 
-        # Render dropdown for dashboard filters
-        rendered_dropdown = self.filters.render_dropdown(entity_id, model)
+        # This thread waits for the charts while the other components load
+        visualizations_html = self.visualizations.render(entity_id, model, deadline)
+        self.failed += self.visualizations.failed
 
-        # Determine the profile type and corresponding model for rendering
-        render_model, profile_type = (
-            (Employee(), "employee") if isinstance(model, Employee) else (Team(), "team")
-        )
+        header_html = component_result(header, deadline, "Header", self.failed)
+        notes_html = component_result(notes, deadline, "NotesTable", self.failed)
+
+        # Render dropdown for dashboard filters
+        rendered_dropdown = component_result(dropdown, deadline, "Dropdown", self.failed)
 
         # Return the rendered HTML page
         return templates.TemplateResponse(
             "report_page.html",
-            {
-                "request": request,
-                "dashboard_filters": self.filters,  # Filters for rendering radio and dropdown
-                "model": render_model,  # Rendered model for dropdown selection
-                "entity_id": entity_id,  # ID of the selected entity
-                "profile_type": profile_type,  # Profile type ("employee" or "team")
-                "header_html": header_html,  # Rendered header component
-                "visualizations_html": visualizations_html,  # Rendered visualizations
-                "notes_html": notes_html,  # Rendered notes table
-                "dropdown": rendered_dropdown,  # Dropdown rendered by DashboardFilters
-                "model": model,  # Original model passed in (for context)
-            },
+            self.context(request, entity_id, model, header_html, visualizations_html, notes_html,
+                         rendered_dropdown),
+        )
+
+    def render_dropdown(self, entity_id, model):
+        """
+        Render the entity selector: the filters' dropdown, or the links of a static page.
+
+        Args:
+            entity_id (int): The ID of the selected entity.
+            model (object): The model (Employee or Team) providing entity data.
+
+        Returns:
+            str: The HTML of the selector.
+        """
+        if self.static:
+            return render_site_nav(entity_id, model)
+        return self.filters.render_dropdown(entity_id, model)
+
+    def context(self, request, entity_id, model, header_html, visualizations_html, notes_html,
+                dropdown_html, slots=""):
+        """
+        Build the `report_page.html` template context, with fallbacks for the missing components.
+
+        Args:
+            request (Request): The incoming HTTP request object.
+            entity_id (int): The ID of the entity the report is for.
+            model (object): The model (Employee or Team), or its request's DataLoader.
+            header_html (str): The rendered header, or None if it failed.
+            visualizations_html (str): The rendered visualizations.
+            notes_html (str): The rendered notes table, or None if it failed.
+            dropdown_html (str): The rendered dropdown, or None if it failed.
+            slots (str, optional): Marks where streamed components are inserted, see `stream`.
+
+        Returns:
+            dict: The template context.
+        """
+        if header_html is None:
+            header_html = f"<h1>{model.name.capitalize()} Report</h1>"
+        if notes_html is None:
+            notes_html = NOTES_FALLBACK
+        return {
+            "request": request,
+            "dashboard_filters": self.filters,  # Filters for rendering radio and dropdown
+            "entity_id": entity_id,  # ID of the selected entity
+            "profile_type": model.name,  # Profile type ("employee" or "team")
+            "header_html": header_html,  # Rendered header component
+            "visualizations_html": visualizations_html,  # Rendered visualizations
+            "notes_html": notes_html,  # Rendered notes table
+            "dropdown": dropdown_html or "",  # Dropdown rendered by DashboardFilters
+            "start": self.start,  # Date range of the report
+            "end": self.end,
+            "chart_mode": self.chart_mode,  # "server" or "client" charts
+            "model": model,  # Model (or its request's DataLoader) for the header
+            "slots": slots,  # Streamed components, see `stream`
+            "static_site": self.static,  # Exported page without the app's forms and scripts
+        }
+
+    async def stream(self, request, entity_id, model):
+        """
+        Render the report page in chunks, sending each part as soon as it is ready.
+
+        The page shell is sent as soon as the header and the dropdown are
+        built, with placeholders where the visualizations and the notes
+        table go. Those two follow in whichever order they finish, each in
+        a `<template>` that a script moves into its placeholder, so the
+        first bytes never wait for the slowest chart. Deadlines and
+        fallbacks are the same as in `render`; once the last chunk is sent
+        `html` holds every component for rendering the complete page.
+
+        Args:
+            request (Request): The incoming HTTP request object.
+            entity_id (int): The ID of the entity (employee or team) to render the report for.
+            model (object): The model (Employee or Team) providing data for the report, ideally
+                wrapped in a `DataLoader` so the components share their queries.
+
+        Yields:
+            str: The page shell, then one chunk per component, then the end of the page.
+        """
+        print(f"Streaming report for entity_id: {entity_id}, model: {model.name}")
+        deadline = time.monotonic() + self.timeout
+        self.failed = []
+        self.html = None
+
+        executor = get_executor()
+        header = executor.submit(self.header.build_component, entity_id, model)
+        notes = executor.submit(self.notes_table.build_component, entity_id, model)
+        dropdown = executor.submit(self.render_dropdown, entity_id, model)
+        # The charts wait on their own tasks, so they are awaited from a worker thread
+        visualizations = asyncio.ensure_future(
+            run_in_threadpool(self.visualizations.render, entity_id, model, deadline)
+        )
+        late = {
+            visualizations: "visualizations",
+            asyncio.ensure_future(async_component_result(notes, deadline, "NotesTable", self.failed)): "notes",
+        }
+
+        header_html = await async_component_result(header, deadline, "Header", self.failed)
+        dropdown_html = await async_component_result(dropdown, deadline, "Dropdown", self.failed)
+        placeholders = {
+            name: f'<div data-slot="{name}"><p>Loading {label}...</p></div>'
+            for name, label in (("visualizations", "charts"), ("notes", "notes"))
+        }
+        shell = templates.get_template("report_page.html").render(self.context(
+            request, entity_id, model, header_html, placeholders["visualizations"],
+            placeholders["notes"], dropdown_html, STREAM_SLOTS,
+        ))
+        shell, _, end = shell.partition(STREAM_SLOTS)
+        yield shell
+
+        parts = {}
+        pending = set(late)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = late[task]
+                try:
+                    parts[name] = task.result()
+                except Exception as e:
+                    # The notes fall back in async_component_result; only the charts can raise
+                    print(f"Error building Visualizations: {e!r}")
+                    self.failed.append("Visualizations")
+                    parts[name] = "<p>Charts not available.</p>"
+                html = NOTES_FALLBACK if parts[name] is None else parts[name]
+                yield f'<template id="slot-{name}">{html}</template><script>fillSlot("{name}")</script>'
+        self.failed += self.visualizations.failed
+        yield end
+
+        self.html = (header_html, parts["visualizations"], parts["notes"], dropdown_html)
+
+def score_risks():
+    """
+    Bring the batch-scored `risk_scores` table up to date with the data and the model.
+
+    Returns:
+        dict: See `refresh_risk_scores`, or None if the database has no `risk_scores` table yet.
+    """
+    try:
+        result = refresh_risk_scores(BarChart.predictor, BarChart.predictor_version)
+    except RuntimeError as e:
+        print(f"Risk scores unavailable, scoring per request: {e}")
+        return None
+    print(f"Risk scores: {result}")
+    return result
+
+
+# Data version the last background re-scoring was started for
+_risk_scoring_version = None
+_risk_scoring_lock = threading.Lock()
+
+
+def schedule_risk_scoring():
+    """
+    Re-score every risk on a background thread, once per data version.
+
+    Called when a request finds the risk scores stale, e.g. after an ingest
+    while the dashboard runs. The request does not wait: it scores its own
+    entity in the meantime, and later requests read the new scores.
+
+    Returns:
+        threading.Thread: The started thread, or None if this data version was already scheduled.
+    """
+    global _risk_scoring_version
+    version = data_version()
+    with _risk_scoring_lock:
+        if version == _risk_scoring_version:
+            return None
+        _risk_scoring_version = version
+    thread = threading.Thread(target=score_risks, name="risk-scoring", daemon=True)
+    thread.start()
+    return thread
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Manage resources that live as long as the application.
+
+    The SQLite connection pool is created at startup. Setting the
+    `EMPLOYEE_EVENTS_SNAPSHOT=1` environment variable serves every query from
+    an in-memory snapshot of the database that is reloaded when the file
+    changes. The chart render workers are started and stale risk scores
+    are re-scored before the first request. On shutdown the render workers
+    and the query executor are drained before every pooled connection is
+    closed.
+    """
+    if os.environ.get("EMPLOYEE_EVENTS_SNAPSHOT") == "1":
+        configure_pool(db_path=get_pool().db_path, snapshot=True)
+    get_pool().connection()
+    warm_renderer()
+    await run_in_threadpool(score_risks)
+    yield
+    shutdown_renderer()
+    shutdown_executor()
+    close_pool()
+
+
+async def prefetch_report_data(entity_id, model, start=None, end=None, notes_limit=NOTES_PAGE_SIZE,
+                               chart_mode=CHART_MODE):
+    """
+    Run every query a report page needs concurrently on the query executor.
+
+    With a `DataLoader` as the model, the results are kept for the
+    components rendered afterwards, which read them from memory instead of
+    querying SQLite one after another (a plain model still warms the query
+    cache). Errors are left for the components to surface while rendering.
+    The arguments must match the ones the page is rendered with.
+
+    Args:
+        entity_id (int): The ID of the entity (Employee or Team).
+        model (object): The model (Employee or Team) providing the data.
+        start (str, optional): First date (YYYY-MM-DD) of the report.
+        end (str, optional): Last date (YYYY-MM-DD) of the report.
+        notes_limit (int, optional): Number of notes on the first page.
+        chart_mode (str, optional): "server" or "client"; client charts fetch their own data.
+    """
+    queries = [
+        model.async_username(entity_id),
+        model.async_notes(entity_id, start, end, limit=notes_limit + 1, after=None),
+        model.async_names(),
+    ]
+    if chart_mode != "client":
+        queries += [
+            model.async_cumulative_event_counts(entity_id, start, end),
+            model.async_risk_score(entity_id, BarChart.predictor_version),
+        ]
+    await asyncio.gather(*queries, return_exceptions=True)
+
+async def render_report(request, model, entity_id, start, end, notes_limit, chart_mode):
+    """
+    Fetch the data of a report page and render it.
+
+    Args:
+        request (Request): The incoming HTTP request object.
+        model (object): The model (Employee or Team) providing the data.
+        entity_id (int): The ID of the entity.
+        start (str): First date (YYYY-MM-DD) of the report, or None.
+        end (str): Last date (YYYY-MM-DD) of the report, or None.
+        notes_limit (int): Number of notes on the first page.
+        chart_mode (str): "server" or "client" charts.
+
+    Returns:
+        tuple: The rendered HTML page (bytes) and whether every component rendered (bool).
+    """
+    # Every query of the page runs once, shared by the prefetch and all components
+    loader = DataLoader(model)
+    await prefetch_report_data(entity_id, loader, start, end, notes_limit, chart_mode)
+    report = Report(start, end, notes_limit, chart_mode)
+    response = await run_in_threadpool(report.render, request, entity_id, loader)
+    print(f"Report queries for {model.name} {entity_id}: {loader.queries} run, {loader.hits} shared")
+    return response.body, not report.failed
+
+
+async def stream_report(key, version, request, model, entity_id, start, end, notes_limit, chart_mode):
+    """
+    Stream a report page as its components finish, then cache the complete page.
+
+    Args:
+        key (tuple): The page's key in `page_cache`.
+        version (tuple): The data and model versions the page is rendered from.
+        request (Request): The incoming HTTP request object.
+        model (object): The model (Employee or Team) providing the data.
+        entity_id (int): The ID of the entity.
+        start (str): First date (YYYY-MM-DD) of the report, or None.
+        end (str): Last date (YYYY-MM-DD) of the report, or None.
+        notes_limit (int): Number of notes on the first page.
+        chart_mode (str): "server" or "client" charts.
+
+    Yields:
+        str: The chunks of `Report.stream`.
+    """
+    # The components start their queries at once, sharing them through the loader
+    loader = DataLoader(model)
+    report = Report(start, end, notes_limit, chart_mode)
+    async for chunk in report.stream(request, entity_id, loader):
+        yield chunk
+    print(f"Report queries for {model.name} {entity_id}: {loader.queries} run, {loader.hits} shared")
+
+    # Later requests get the page without placeholders, from the cache
+    if not report.failed:
+        body = templates.get_template("report_page.html").render(
+            report.context(request, entity_id, loader, *report.html)
         )
+        page_cache.put(key, version, body.encode(), chart_digests(body))
+
+
+async def refresh_report(key, version, *args):
+    """
+    Render a stale report page again in the background and cache it.
+
+    Args:
+        key (tuple): The page's key in `page_cache`.
+        version (tuple): The data and model versions the page is rendered from.
+        *args: The arguments of `render_report`.
+    """
+    try:
+        body, complete = await render_report(*args)
+        if complete:
+            page_cache.put(key, version, body, chart_digests(body))
+    except Exception as e:
+        print(f"Error refreshing report page {key}: {e}")
+    finally:
+        page_cache.finish_refresh(key)
+
+
+def cached_charts_stored(page):
+    """
+    Check that every chart a cached page shows can still be served from `chart_store`.
+
+    Args:
+        page (CachedPage): A page from `page_cache`.
+
+    Returns:
+        bool: False if an image the page links to was evicted.
+    """
+    return all(chart_store.contains(digest) for digest in page.charts)
+
+
+async def cached_report(request, model, entity_id, start, end, notes_limit, chart_mode, stream=False):
+    """
+    Serve a report page from the page cache, rendering it only when needed.
+
+    Pages are keyed on the route and its parameters and tagged with the
+    data version and the model version they were rendered from. A fresh
+    page is a memory lookup; a recently stale one is served while it is
+    rendered again in the background; anything else is rendered before
+    responding. A page linking a chart image the chart store has evicted
+    is rendered again, which stores the image again. Every response carries the strong ETag of the page, and a
+    matching `If-None-Match` is answered with 304. Pages with a component
+    that fell back (see `Report.failed`) are served but not cached.
+
+    With `stream`, a page that must be rendered is streamed instead (see
+    `Report.stream`). Its ETag is unknown until the last chunk, so it is
+    sent without one and cached for the next request.
+
+    Args:
+        request (Request): The incoming HTTP request object.
+        model (object): The model (Employee or Team) providing the data.
+        entity_id (int): The ID of the entity.
+        start (str): First date (YYYY-MM-DD) of the report, or None.
+        end (str): Last date (YYYY-MM-DD) of the report, or None.
+        notes_limit (int): Number of notes on the first page.
+        chart_mode (str): "server" or "client" charts.
+        stream (bool, optional): Stream a page that is not cached.
+
+    Returns:
+        Response: The HTML page, the streamed HTML page, or an empty 304 response.
+    """
+    key = (model.name, entity_id, start, end, notes_limit, chart_mode)
+    version = (data_version(), BarChart.predictor_version)
+    args = (request, model, entity_id, start, end, notes_limit, chart_mode)
+
+    # A page whose chart images were evicted from the chart store is rendered again
+    page, fresh = page_cache.lookup(key, version, valid=cached_charts_stored)
+    if page is None and stream:
+        return StreamingResponse(
+            stream_report(key, version, *args),
+            media_type="text/html",
+            headers={"Cache-Control": "no-store", "X-Cache": "miss"},
+        )
+    if page is None:
+        body, complete = await render_report(*args)
+        if not complete:
+            return HTMLResponse(content=body, headers={"Cache-Control": "no-store", "X-Cache": "miss"})
+        status = "miss"
+        page = page_cache.put(key, version, body, chart_digests(body))
+    elif fresh:
+        status = "hit"
+    else:
+        status = "stale"
+        if page_cache.start_refresh(key):
+            task = asyncio.create_task(refresh_report(key, version, *args))
+            _page_refreshes.add(task)
+            task.add_done_callback(_page_refreshes.discard)
+
+    headers = {"ETag": page.etag, "Cache-Control": "no-cache", "X-Cache": status}
+    if etag_matches(request.headers.get("if-none-match"), page.etag):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=page.body, headers=headers)
 
 # Initialize a FastAPI application
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Import required modules for static file handling and template rendering
 from fastapi.staticfiles import StaticFiles  # Serve static files like CSS, JS, and images
@@ -646,40 +1372,57 @@ from fastapi.templating import Jinja2Templates  # Render HTML templates using Ji
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
 
 # Mount the `/static` route for serving static files
+os.makedirs(STATIC_DIR, exist_ok=True)
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 
-# Landing Page Route
-@app.get("/", response_class=HTMLResponse)
-def landing_page(request: Request):
+# Chart route
+@app.get("/charts/{digest}.png")
+def chart(request: Request, digest: str):
     """
-    Render the landing page with default options for entity selection.
+    Serve a rendered chart from the chart store.
+
+    The digest is the SHA-256 of the image itself, so the response never
+    changes for a URL: it carries a strong ETag and may be cached forever.
 
     Args:
-        request (Request): The FastAPI request object used to handle the HTTP request.
+        request (Request): The FastAPI request object.
+        digest (str): The chart's digest, as returned by `LineChart`/`BarChart`.
 
     Returns:
-        TemplateResponse: Renders the `landing_page.html` template populated with the default context.
+        Response: The PNG image, 304 if the client already has it, or 404 if it was evicted.
+    """
+    headers = {
+        "ETag": f'"{digest}"',
+        "Cache-Control": "public, max-age=31536000, immutable",
+    }
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
 
-    Purpose:
-        - Provides the initial user interface to select a profile type (Employee or Team) and view a corresponding dropdown.
-        - Acts as the entry point for the dashboard application, setting up the default state for the filters.
+    image = chart_store.get(digest)
+    if image is None:
+        return Response(status_code=404)
+    return Response(content=image, media_type="image/png", headers=headers)
 
-    Workflow:
-        1. Instantiate the `DashboardFilters` class to generate filter options.
-        2. Use the `Employee` model as the default selection for the dropdown.
-        3. Generate the dropdown HTML by rendering the default model's entities.
-        4. Render the `landing_page.html` template with all necessary data for the user interface.
 
-    Example Usage:
-        - Accessing `/` in the browser will load the landing page with Employee profile type and dropdown by default.
+def render_landing_page(request, static=False):
+    """
+    Render the landing page with default options for entity selection.
+
+    Args:
+        request (Request): The request the page is rendered for.
+        static (bool, optional): Link every page instead of the filters form and the
+            note search, for `export.py`.
+
+    Returns:
+        TemplateResponse: Renders the `landing_page.html` template populated with the default context.
     """
     # Initialize DashboardFilters for rendering radio buttons and dropdown
     dashboard_filters = DashboardFilters()
 
     # Use Employee model as the default profile type and fetch dropdown options
     default_model = Employee()
-    rendered_dropdown = dashboard_filters.render_dropdown(None, default_model)
+    rendered_dropdown = render_site_nav() if static else dashboard_filters.render_dropdown(None, default_model)
 
     # Return the rendered landing page template
     return templates.TemplateResponse(
@@ -689,71 +1432,463 @@ def landing_page(request: Request):
             "dashboard_filters": dashboard_filters,  # Pass the filters object for rendering
             "default_model": default_model,  # Set the default profile type to Employee
             "default_dropdown": rendered_dropdown,  # Rendered dropdown for the Employee model
+            "static_site": static,  # Exported page without the app's forms and scripts
         },
     )
 
+# Landing Page Route
+@app.get("/", response_class=HTMLResponse)
+def landing_page(request: Request):
+    """
+    Render the landing page with default options for entity selection.
+
+    Args:
+        request (Request): The FastAPI request object used to handle the HTTP request.
+
+    Returns:
+        TemplateResponse: Renders the `landing_page.html` template populated with the default context.
+
+    Purpose:
+        - Provides the initial user interface to select a profile type (Employee or Team) and view a corresponding dropdown.
+        - Acts as the entry point for the dashboard application, setting up the default state for the filters.
+
+    Workflow:
+        1. Instantiate the `DashboardFilters` class to generate filter options.
+        2. Use the `Employee` model as the default selection for the dropdown.
+        3. Generate the dropdown HTML by rendering the default model's entities.
+        4. Render the `landing_page.html` template with all necessary data for the user interface.
+
+    Example Usage:
+        - Accessing `/` in the browser will load the landing page with Employee profile type and dropdown by default.
+    """
+    return render_landing_page(request)
+
 # Route to Employee Report
 @app.get("/employee/{id:int}", response_class=HTMLResponse)
-def employee_dashboard(request: Request, id: int):
+async def employee_dashboard(
+    request: Request,
+    id: int,
+    start: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    end: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    limit: int = Query(NOTES_PAGE_SIZE, ge=1, le=MAX_NOTES_PAGE_SIZE),
+    charts: str = Query(None, pattern=CHART_MODE_PATTERN),
+    stream: bool = Query(None),
+):
     """
     Render the employee dashboard for a specific employee ID.
 
     Args:
         request (Request): The FastAPI request object.
         id (int): The unique ID of the employee to generate the report for.
+        start (str, optional): First date (YYYY-MM-DD) of the charts and notes.
+        end (str, optional): Last date (YYYY-MM-DD) of the charts and notes.
+        limit (int, optional): Number of notes on the first page.
+        charts (str, optional): "server" or "client" charts, default `CHART_MODE`.
+        stream (bool, optional): Stream the page as its parts finish, default `STREAM_REPORTS`.
 
     Returns:
-        TemplateResponse: The rendered HTML page displaying the employee's dashboard report.
+        HTMLResponse: The rendered HTML page displaying the employee's dashboard report, or 304 if unchanged.
 
     Purpose:
         - Fetch data and visualizations for the given employee.
         - Display the employee-specific report in a structured format.
 
     Workflow:
-        1. Instantiate the `Report` class to generate the required components.
-        2. Pass the `Employee` model with the given ID to the `render` method.
-        3. Return the fully rendered report as a `TemplateResponse`.
+        1. Look the page up in the page cache with `cached_report`.
+        2. If it must be rendered, fetch the employee's data concurrently with `prefetch_report_data`.
+        3. Instantiate the `Report` class and pass the `Employee` model with the given ID to its `render` method.
+        4. Return the cached or rendered page with its ETag, or 304 if the client's copy is current.
 
     Example Usage:
         - Access `/employee/2` to view the report for the employee with ID 2.
+        - Access `/employee/2?start=2023-01-01&end=2023-06-30` to limit it to the first half of 2023.
+        - Access `/employee/2?charts=client` to draw the charts in the browser.
+        - Access `/employee/2?stream=1` to get the header at once and the charts as they finish.
     """
     print(f"Accessing employee dashboard for ID: {id}")
-    report = Report()
-    return report.render(request, id, Employee())
+    start, end, charts = start or None, end or None, charts or CHART_MODE
+    stream = STREAM_REPORTS if stream is None else stream
+    return await cached_report(request, Employee(), id, start, end, limit, charts, stream)
 
 
 # Route to Team Report
 @app.get("/team/{id:int}", response_class=HTMLResponse)
-def team_dashboard(request: Request, id: int):
+async def team_dashboard(
+    request: Request,
+    id: int,
+    start: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    end: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    limit: int = Query(NOTES_PAGE_SIZE, ge=1, le=MAX_NOTES_PAGE_SIZE),
+    charts: str = Query(None, pattern=CHART_MODE_PATTERN),
+    stream: bool = Query(None),
+):
     """
     Render the team dashboard for a specific team ID.
 
     Args:
         request (Request): The FastAPI request object.
         id (int): The unique ID of the team to generate the report for.
+        start (str, optional): First date (YYYY-MM-DD) of the charts and notes.
+        end (str, optional): Last date (YYYY-MM-DD) of the charts and notes.
+        limit (int, optional): Number of notes on the first page.
+        charts (str, optional): "server" or "client" charts, default `CHART_MODE`.
+        stream (bool, optional): Stream the page as its parts finish, default `STREAM_REPORTS`.
 
     Returns:
-        TemplateResponse: The rendered HTML page displaying the team's dashboard report.
+        HTMLResponse: The rendered HTML page displaying the team's dashboard report, or 304 if unchanged.
 
     Purpose:
         - Fetch data and visualizations for the given team.
         - Display the team-specific report in a structured format.
 
     Workflow:
-        1. Instantiate the `Report` class to generate the required components.
-        2. Pass the `Team` model with the given ID to the `render` method.
-        3. Return the fully rendered report as a `TemplateResponse`.
+        1. Look the page up in the page cache with `cached_report`.
+        2. If it must be rendered, fetch the team's data concurrently with `prefetch_report_data`.
+        3. Instantiate the `Report` class and pass the `Team` model with the given ID to its `render` method.
+        4. Return the cached or rendered page with its ETag, or 304 if the client's copy is current.
 
     Example Usage:
         - Access `/team/3` to view the report for the team with ID 3.
+        - Access `/team/3?start=2023-01-01&end=2023-06-30` to limit it to the first half of 2023.
+        - Access `/team/3?charts=client` to draw the charts in the browser.
+        - Access `/team/3?stream=1` to get the header at once and the charts as they finish.
     """
     print(f"Accessing team dashboard for ID: {id}")
-    report = Report()
-    return report.render(request, id, Team())
+    start, end, charts = start or None, end or None, charts or CHART_MODE
+    stream = STREAM_REPORTS if stream is None else stream
+    return await cached_report(request, Team(), id, start, end, limit, charts, stream)
+
+async def notes_page(model, id, start, end, limit, after):
+    """
+    Render one page of notes table rows for the "Load more" button.
+
+    Args:
+        model (object): The model (Employee or Team) providing notes data.
+        id (int): The ID of the entity whose notes are paged.
+        start (str): First note date (YYYY-MM-DD), or None.
+        end (str): Last note date (YYYY-MM-DD), or None.
+        limit (int): Number of notes per page.
+        after (str): Cursor token of the previous page, or None for the first page.
+
+    Returns:
+        HTMLResponse: The page's `<tr>` rows, or a 400 response for a malformed cursor.
+    """
+    loader = DataLoader(model)
+    try:
+        cursor = decode_cursor(after) if after else None
+        notes_table = NotesTable(start or None, end or None, limit, cursor)
+        await loader.async_notes(id, notes_table.start, notes_table.end, limit=limit + 1, after=cursor)
+    except ValueError as e:
+        return HTMLResponse(content=f"<p>{escape(str(e))}</p>", status_code=400)
+    return HTMLResponse(content=notes_table.build_rows(id, loader))
+
+
+# Notes fragment routes
+@app.get("/employee/{id:int}/notes", response_class=HTMLResponse)
+async def employee_notes(
+    id: int,
+    start: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    end: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    limit: int = Query(NOTES_PAGE_SIZE, ge=1, le=MAX_NOTES_PAGE_SIZE),
+    after: str = Query(None),
+):
+    """
+    Return the next page of an employee's notes as table rows.
+
+    Example Usage:
+        - Access `/employee/2/notes?limit=20&after=<cursor>` to load the notes after a page.
+    """
+    return await notes_page(Employee(), id, start, end, limit, after)
+
+
+@app.get("/team/{id:int}/notes", response_class=HTMLResponse)
+async def team_notes(
+    id: int,
+    start: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    end: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    limit: int = Query(NOTES_PAGE_SIZE, ge=1, le=MAX_NOTES_PAGE_SIZE),
+    after: str = Query(None),
+):
+    """
+    Return the next page of a team's notes as table rows.
+
+    Example Usage:
+        - Access `/team/3/notes?limit=20&after=<cursor>` to load the notes after a page.
+    """
+    return await notes_page(Team(), id, start, end, limit, after)
+
+def entity_not_found(model, id):
+    """
+    Build the JSON 404 response of a chart data route for an unknown entity.
+
+    Args:
+        model (object): The model (Employee or Team) that was queried.
+        id (int): The ID that matched no entity.
+
+    Returns:
+        JSONResponse: A 404 response with a `detail` message.
+    """
+    return JSONResponse({"detail": f"No {model.name} with ID {id}."}, status_code=404)
+
+
+async def events_data(model, id, start, end, points):
+    """
+    Return an entity's daily event counts as column-oriented JSON for client-side charts.
+
+    Histories longer than `points` days are downsampled like the server
+    charts; each returned date then counts the events since the previous
+    one, so running totals stay exact.
+
+    Args:
+        model (object): The model (Employee or Team) providing event data.
+        id (int): The ID of the entity.
+        start (str): First date (YYYY-MM-DD), or None.
+        end (str): Last date (YYYY-MM-DD), or None.
+        points (int): Maximum number of dates to return.
+
+    Returns:
+        JSONResponse: `event_date`, `positive_events` and `negative_events` lists with one item per date,
+        or a 404 response if the entity does not exist.
+    """
+    if not await model.async_username(id):
+        return entity_not_found(model, id)
+    df = await model.async_event_counts(id, start or None, end or None)
+    columns = ["total_positive_events", "total_negative_events"]
+    rows, counts = downsample_counts(df["event_date"], df[columns].to_numpy(), points)
+    if len(rows) < len(df):
+        df = pd.DataFrame(counts, columns=columns).assign(event_date=df["event_date"].to_numpy()[rows])
+    return JSONResponse(columnar(df, {
+        "event_date": "event_date",
+        "positive_events": "total_positive_events",
+        "negative_events": "total_negative_events",
+    }))
+
+
+async def risk_data(model, id):
+    """
+    Return an entity's predicted recruitment risk as JSON for client-side charts.
+
+    Args:
+        model (object): The model (Employee or Team) providing the data.
+        id (int): The ID of the entity.
+
+    Returns:
+        JSONResponse: The `risk` (None if the entity has no data) and the `model_version` it was predicted with,
+        or a 404 response if the entity does not exist.
+    """
+    if not await model.async_username(id):
+        return entity_not_found(model, id)
+    risk = await run_in_threadpool(BarChart().risk, model, id)
+    return JSONResponse({
+        "risk": None if risk is None or pd.isna(risk) else float(risk),
+        "model_version": BarChart.predictor_version,
+    })
+
+
+async def chart_image(model, id, kind, start, end):
+    """
+    Render a chart on the server, e.g. when the browser cannot draw it.
+
+    Args:
+        model (object): The model (Employee or Team) providing the data.
+        id (int): The ID of the entity.
+        kind (str): "line" or "bar".
+        start (str): First date (YYYY-MM-DD) of the line chart, or None.
+        end (str): Last date (YYYY-MM-DD) of the line chart, or None.
+
+    Returns:
+        Response: A redirect to the stored chart, a 404 response if the entity does not
+        exist or has no data, or a 503 response if no render worker answered in time.
+    """
+    loader = DataLoader(model)
+    if not await loader.async_username(id):
+        return HTMLResponse(content=f"<p>No {model.name} with ID {id}.</p>", status_code=404)
+    chart = LineChart(start or None, end or None) if kind == "line" else BarChart()
+    try:
+        path = await run_in_threadpool(chart.visualization, loader, id)
+    except concurrent.futures.TimeoutError as e:
+        print(f"Error rendering {kind} chart: {e!r}")
+        return HTMLResponse(content="<p>Chart not available.</p>", status_code=503)
+    if not path.startswith("charts/"):
+        return HTMLResponse(content=path, status_code=404)
+    return RedirectResponse(url=f"/{path}", status_code=307)
+
+
+# Chart data routes
+@app.get("/api/employee/{id:int}/events")
+async def employee_events_data(
+    id: int,
+    start: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    end: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    points: int = Query(CHART_POINTS, ge=3),
+):
+    """
+    Return an employee's daily event counts as column-oriented JSON.
+
+    Example Usage:
+        - Access `/api/employee/2/events?start=2023-01-01` for the events since 2023.
+        - Access `/api/employee/2/events?points=100` for at most 100 dates.
+    """
+    return await events_data(Employee(), id, start, end, points)
+
+
+@app.get("/api/team/{id:int}/events")
+async def team_events_data(
+    id: int,
+    start: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    end: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    points: int = Query(CHART_POINTS, ge=3),
+):
+    """
+    Return a team's daily event counts as column-oriented JSON.
+
+    Example Usage:
+        - Access `/api/team/3/events?start=2023-01-01` for the events since 2023.
+        - Access `/api/team/3/events?points=100` for at most 100 dates.
+    """
+    return await events_data(Team(), id, start, end, points)
+
+
+@app.get("/api/employee/{id:int}/risk")
+async def employee_risk_data(id: int):
+    """
+    Return an employee's predicted recruitment risk as JSON.
+
+    Example Usage:
+        - Access `/api/employee/2/risk` for the risk of the employee with ID 2.
+    """
+    return await risk_data(Employee(), id)
+
+
+@app.get("/api/team/{id:int}/risk")
+async def team_risk_data(id: int):
+    """
+    Return a team's predicted recruitment risk as JSON.
+
+    Example Usage:
+        - Access `/api/team/3/risk` for the risk of the team with ID 3.
+    """
+    return await risk_data(Team(), id)
+
+
+# Server-rendered chart fallback routes
+@app.get("/employee/{id:int}/charts/{kind}")
+async def employee_chart(
+    id: int,
+    kind: Literal["line", "bar"],
+    start: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    end: str = Query(None, pattern=DATE_PARAM_PATTERN),
+):
+    """
+    Redirect to an employee's chart rendered on the server.
+
+    Example Usage:
+        - Access `/employee/2/charts/line` for the PNG line chart of the employee with ID 2.
+    """
+    return await chart_image(Employee(), id, kind, start, end)
+
+
+@app.get("/team/{id:int}/charts/{kind}")
+async def team_chart(
+    id: int,
+    kind: Literal["line", "bar"],
+    start: str = Query(None, pattern=DATE_PARAM_PATTERN),
+    end: str = Query(None, pattern=DATE_PARAM_PATTERN),
+):
+    """
+    Redirect to a team's chart rendered on the server.
+
+    Example Usage:
+        - Access `/team/3/charts/line` for the PNG line chart of the team with ID 3.
+    """
+    return await chart_image(Team(), id, kind, start, end)
+
+def highlight_snippet(snippet):
+    """
+    Escape a note search snippet and wrap its matched terms in `<mark>` tags.
+
+    Args:
+        snippet (str): A snippet from `QueryBase.search_notes`.
+
+    Returns:
+        str: The snippet as safe HTML.
+    """
+    return escape(str(snippet)).replace(SNIPPET_START, "<mark>").replace(SNIPPET_END, "</mark>")
+
+
+# Note search route
+@app.get("/search", response_class=HTMLResponse)
+async def search(
+    request: Request,
+    q: str = Query(""),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Search the notes of every employee and team.
+
+    Args:
+        request (Request): The FastAPI request object.
+        q (str): The words to search for; each one matches as a prefix.
+        limit (int, optional): Maximum number of results.
+
+    Returns:
+        TemplateResponse: The `search_page.html` template with the ranked, highlighted results,
+        or a 503 response if the database has no notes search index yet.
+
+    Example Usage:
+        - Access `/search?q=leadership` to find every note mentioning leadership.
+    """
+    results = []
+    if q.strip():
+        try:
+            hits = await QueryBase().async_search_notes(q, limit)
+        except RuntimeError as e:
+            return HTMLResponse(content=f"<p>{escape(str(e))}</p>", status_code=503)
+
+        for hit in hits.itertuples(index=False):
+            is_employee = pd.notna(hit.employee_id)
+            results.append({
+                "url": f"/employee/{int(hit.employee_id)}" if is_employee else f"/team/{int(hit.team_id)}",
+                "name": hit.employee_name if is_employee else hit.team_name,
+                "note_date": hit.note_date,
+                "snippet_html": highlight_snippet(hit.snippet),
+            })
+
+    return templates.TemplateResponse(
+        "search_page.html",
+        {"request": request, "q": q, "results": results},
+    )
+
+# Entity typeahead route
+@app.get("/entities/search")
+async def entity_search(
+    type: Literal["employee", "team"] = Query(...),
+    q: str = Query(""),
+    limit: int = Query(TYPEAHEAD_LIMIT, ge=1, le=MAX_TYPEAHEAD_LIMIT),
+):
+    """
+    Find the employees or teams with a word of their name starting with a prefix.
+
+    Args:
+        type (str): "employee" or "team".
+        q (str): The prefix typed so far; blank returns the first entities by name.
+        limit (int, optional): Maximum number of matches.
+
+    Returns:
+        JSONResponse: `results`, a list of `{"id", "name"}` sorted by name, and
+        `total`, the number of entities of the type.
+
+    Example Usage:
+        - Access `/entities/search?type=employee&q=jo&limit=5` for up to 5 employees named Jo...
+    """
+    model = Employee() if type == "employee" else Team()
+    index = await run_in_threadpool(entity_index, model)
+    results = [{"id": entity_id, "name": name} for name, entity_id in index.search(q, limit)]
+    return JSONResponse({"results": results, "total": len(index)})
 
 # Dropdown update route
 @app.get('/update_dropdown')
-def update_dropdown(profile_type: str = Query(...)):
+async def update_dropdown(profile_type: str = Query(...)):
     """
     Dynamically update the entity dropdown based on the selected profile type.
 
@@ -776,13 +1911,15 @@ def update_dropdown(profile_type: str = Query(...)):
     """
     dashboard_filters = DashboardFilters()
     if profile_type == 'Team':
-        dropdown_html = dashboard_filters.render_dropdown(None, Team())
+        model = Team()
     elif profile_type == 'Employee':
-        dropdown_html = dashboard_filters.render_dropdown(None, Employee())
+        model = Employee()
     else:
         print("Invalid profile_type received.")
         return {"error": "Invalid profile type"}, 400
 
+    # Load the entities and their index off the event loop
+    dropdown_html = await run_in_threadpool(dashboard_filters.render_dropdown, None, model)
     return HTMLResponse(content=dropdown_html)
 
 
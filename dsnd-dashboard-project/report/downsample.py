@@ -0,0 +1,151 @@
+import numpy as np
+
+# Width of a chart in pixels: matplotlib's default 6.4in figure at 100 dpi,
+# and the canvas of the client-side charts
+CHART_WIDTH = 640
+
+# Points kept per line: about one per pixel column is all a chart can show
+CHART_POINTS = CHART_WIDTH
+
+# Candidates the min/max preselection keeps per output point before LTTB
+PRESELECT_RATIO = 4
+
+
+def _axis(x):
+    """
+    Convert an x axis to float64, reading dates (ISO strings or datetime64) as day numbers.
+    """
+    x = np.asarray(x)
+    if x.dtype.kind in "OUSM":
+        x = x.astype("datetime64[D]").astype(np.int64)
+    return x.astype(np.float64)
+
+
+def minmax_indices(y, buckets):
+    """
+    Select the minimum and the maximum of each of a number of equally sized buckets.
+
+    Args:
+        y (array-like): The values.
+        buckets (int): Number of buckets.
+
+    Returns:
+        numpy.ndarray: Sorted indices of at most `2 * buckets + 2` points,
+        including the first and the last one.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= 2 * buckets + 2:
+        return np.arange(n)
+
+    # Pad to whole buckets so every bucket is one row of a 2-D view
+    size = -(-n // buckets)
+    buckets = -(-n // size)
+    padded = np.full(buckets * size, -np.inf)
+    padded[:n] = y
+    rows = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    maxima = offsets + rows.argmax(axis=1)
+    padded[n:] = np.inf
+    minima = offsets + rows.argmin(axis=1)
+    return np.unique(np.concatenate(([0, n - 1], minima, maxima)))
+
+
+def lttb_indices(x, y, points):
+    """
+    Select points with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are kept and the rest are split into
+    `points - 2` buckets. From each bucket the point forming the largest
+    triangle with the point kept from the previous bucket and the mean of
+    the next bucket is kept, which preserves the visual shape of the line.
+
+    Args:
+        x (array-like): Ascending x values.
+        y (array-like): The values.
+        points (int): Number of points to keep, at least 3.
+
+    Returns:
+        numpy.ndarray: Sorted indices of the kept points.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+
+    # Bucket i holds the points edges[i]:edges[i + 1] between the first and the last
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / sizes
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / sizes
+    # Each bucket is compared with the mean of the next one, the last with the last point
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (next_y[i] - y[a])
+        )
+        a = lo + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_indices(x, series, points=CHART_POINTS):
+    """
+    Select the rows to plot of one or more lines sharing an x axis.
+
+    Each line is reduced to its per-bucket minima and maxima first (a fully
+    vectorized pass), so LTTB only runs over `PRESELECT_RATIO` candidates
+    per output point however long the history is. The rows kept for every
+    line are merged, splitting `points` between the lines.
+
+    Args:
+        x (array-like): Ascending x values: numbers, datetime64 or ISO dates.
+        series (list): The y values of each line.
+        points (int, optional): Maximum number of rows to keep, default `CHART_POINTS`.
+
+    Returns:
+        numpy.ndarray: Sorted indices of the rows to keep; every row if there are at most `points`.
+    """
+    n = len(x)
+    if n <= points or not series:
+        return np.arange(n)
+
+    x = _axis(x)
+    per_line = max(3, points // len(series))
+    kept = []
+    for y in series:
+        y = np.asarray(y, dtype=np.float64)
+        candidates = minmax_indices(y, PRESELECT_RATIO * per_line // 2)
+        kept.append(candidates[lttb_indices(x[candidates], y[candidates], per_line)])
+    return np.unique(np.concatenate(kept))
+
+
+def downsample_counts(x, counts, points=CHART_POINTS):
+    """
+    Downsample per-period counts so that their running totals stay exact.
+
+    Rows are selected on the running totals, which is what the charts plot,
+    and each kept row then counts everything since the previous kept row.
+
+    Args:
+        x (array-like): Ascending x values: numbers, datetime64 or ISO dates.
+        counts (array-like): 2-D array with one column of counts per line.
+        points (int, optional): Maximum number of rows to keep, default `CHART_POINTS`.
+
+    Returns:
+        tuple: The indices of the kept rows and their counts.
+    """
+    counts = np.asarray(counts)
+    totals = counts.cumsum(axis=0)
+    rows = downsample_indices(x, list(totals.T), points)
+    if len(rows) == len(counts):
+        return rows, counts
+    return rows, np.diff(totals[rows], axis=0, prepend=0)
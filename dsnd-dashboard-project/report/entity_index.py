@@ -0,0 +1,119 @@
+import bisect
+import threading
+
+
+class EntityIndex:
+    """
+    A sorted prefix index of entity names for typeahead search.
+
+    Every word of a name starts a key, so "smi" finds "John Smith" as well
+    as "Smith Jones". A search bisects to the first key with the prefix and
+    walks forward, so it costs O(log n + matches) however many entities
+    there are.
+
+    Attributes:
+        entities (list): `(name, id)` tuples sorted by name.
+    """
+
+    def __init__(self, names):
+        """
+        Build the index.
+
+        Args:
+            names (list): `(name, id)` tuples, as returned by `names()` of a model.
+        """
+        self.entities = sorted(
+            ((str(name), int(entity_id)) for name, entity_id in names),
+            key=lambda entity: (entity[0].casefold(), entity[1]),
+        )
+        self._names = {entity_id: name for name, entity_id in self.entities}
+        keys = []
+        for position, (name, _) in enumerate(self.entities):
+            words = name.casefold().split()
+            keys.extend((" ".join(words[start:]), position) for start in range(len(words)))
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._positions = [position for _, position in keys]
+
+    def __len__(self):
+        return len(self.entities)
+
+    def name(self, entity_id):
+        """
+        Look up the name of an entity.
+
+        Args:
+            entity_id (int): The ID of the entity.
+
+        Returns:
+            str: Its name, or None if there is no such entity.
+        """
+        return self._names.get(entity_id)
+
+    def search(self, q, limit=10):
+        """
+        Find the entities with a word of their name starting with a prefix.
+
+        Args:
+            q (str): The prefix; case and repeated spaces are ignored.
+            limit (int, optional): Maximum number of matches.
+
+        Returns:
+            list: Up to `limit` `(name, id)` tuples sorted by name; the first
+            entities if `q` is blank.
+        """
+        prefix = " ".join(q.casefold().split())
+        if not prefix:
+            return self.entities[:limit]
+        # Keys are ordered by the matched word, not by name, so every match
+        # is collected before the first `limit` names are taken
+        found = set()
+        for i in range(bisect.bisect_left(self._keys, prefix), len(self._keys)):
+            if not self._keys[i].startswith(prefix):
+                break
+            found.add(self._positions[i])
+        return [self.entities[position] for position in sorted(found)[:limit]]
+
+
+class EntityIndexes:
+    """
+    The entity index of each profile, rebuilt when the data version changes.
+
+    Attributes:
+        builds (int): Number of indexes built.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self, key, version, names):
+        """
+        Return the index of a profile, building it if the data changed since it was built.
+
+        Args:
+            key (str): The profile, e.g. "employee".
+            version (str): The current data version.
+            names (callable): Returns the `(name, id)` tuples to index.
+
+        Returns:
+            EntityIndex: The index of the current data.
+        """
+        with self._lock:
+            cached = self._indexes.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        # Concurrent first requests may each build it; the last one is kept
+        index = EntityIndex(names())
+        with self._lock:
+            self._indexes[key] = (version, index)
+            self.builds += 1
+        return index
+
+    def clear(self):
+        """
+        Drop every index.
+        """
+        with self._lock:
+            self._indexes.clear()
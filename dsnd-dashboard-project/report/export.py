@@ -0,0 +1,276 @@
+"""
+Export every report page to static HTML for serving from a plain file server.
+
+Renders `/` to `index.html`, every `/employee/{id}` and `/team/{id}` to
+`<profile>/<id>/index.html` and their charts to `charts/<sha256>.png`, the
+same URLs the app serves. Exported pages link every page instead of the
+filters, date range and search forms, which need the running app. A
+`manifest.json` records a hash of each entity's data, so later exports
+only render the pages whose data changed.
+
+Run from the project root:
+
+    python report/export.py OUTPUT_DIR [db_path] [--force] [--workers=N]
+"""
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+from starlette.requests import Request
+
+import dashboard
+from dashboard import BarChart, Report, render_landing_page, score_risks
+from chart_renderer import configure_renderer
+from chart_store import ChartStore, chart_digests
+from python_package.employee_events import DataLoader, Employee, Team, configure_pool, get_pool
+
+# Version of the export layout; changing it re-renders every page
+EXPORT_FORMAT = 2
+
+# A static page cannot load more notes, so it lists all of them
+EXPORT_NOTES_LIMIT = 100_000
+
+# Seconds a page may take; an export waits for every component rather than
+# publishing a page with a fallback in it
+EXPORT_TIMEOUT = 300.0
+
+REPORT_DIR = Path(__file__).resolve().parent
+PACKAGE_DIR = REPORT_DIR.parent / "python_package" / "employee_events"
+
+MODELS = {"employee": Employee, "team": Team}
+
+
+def export_request(path):
+    """
+    Build the request a page is rendered for, as if it had been served.
+
+    Args:
+        path (str): The page's URL path.
+
+    Returns:
+        Request: A GET request for the path.
+    """
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []})
+
+
+def write_file(path, content):
+    """
+    Write a file atomically, so a file server never serves a partial page.
+
+    Args:
+        path (Path): The file to write.
+        content (bytes): Its content.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(descriptor, "wb") as file:
+        file.write(content)
+    os.replace(temporary, path)
+
+
+def site_version():
+    """
+    Hash everything every page depends on: the code, the templates, the model and the entity names.
+
+    Returns:
+        str: A hex digest; when it changes every page is rendered again.
+    """
+    digest = hashlib.sha256(f"{EXPORT_FORMAT}:{BarChart.predictor_version}".encode())
+    sources = [*REPORT_DIR.rglob("*.py"), *REPORT_DIR.rglob("*.html"), *PACKAGE_DIR.glob("*.py")]
+    for path in sorted(sources):
+        if "__pycache__" not in path.parts:
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    for model in MODELS.values():
+        # Every page links every employee and team
+        digest.update(repr(model().names()).encode())
+    return digest.hexdigest()
+
+
+def entity_hashes(model):
+    """
+    Hash the events and notes of every employee or team.
+
+    Args:
+        model (object): The model (Employee or Team) to hash the entities of.
+
+    Returns:
+        dict: Maps each entity ID to a hex digest of its data.
+    """
+    table_column = f"{model.name}_id"
+    events = model.pandas_query(f"""
+        SELECT {table_column} AS id, event_date, positive_events, negative_events
+        FROM employee_events
+        ORDER BY 1, 2, 3, 4
+    """)
+    notes = model.pandas_query(f"""
+        SELECT {table_column} AS id, note_date, note
+        FROM notes
+        ORDER BY 1, 2, 3
+    """)
+    groups = [dict(tuple(df.groupby("id"))) for df in (events, notes)]
+
+    hashes = {}
+    for _, entity_id in model.names():
+        digest = hashlib.sha256()
+        for group in groups:
+            rows = group.get(entity_id)
+            if rows is not None:
+                digest.update(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes())
+            digest.update(b"|")
+        hashes[int(entity_id)] = digest.hexdigest()
+    return hashes
+
+
+def _init_worker(db_path, chart_dir):
+    """
+    Prepare an export worker: read the same database and store charts in the export.
+    """
+    # The dashboard logs every step; only the export summary is printed
+    sys.stdout = open(os.devnull, "w")
+    configure_pool(db_path=db_path)
+    # The export pool already uses every core, so each worker draws its own charts
+    configure_renderer(0)
+    dashboard.chart_store = ChartStore(directory=chart_dir)
+
+
+def render_page(profile, entity_id, output_dir):
+    """
+    Render the report page of one employee or team into the export.
+
+    Args:
+        profile (str): "employee" or "team".
+        entity_id (int): The ID of the entity.
+        output_dir (str): The export directory.
+
+    Returns:
+        list: The digests of the charts the page shows.
+
+    Raises:
+        RuntimeError: If a component of the page failed.
+    """
+    path = f"/{profile}/{entity_id}"
+    report = Report(notes_limit=EXPORT_NOTES_LIMIT, chart_mode="server", timeout=EXPORT_TIMEOUT, static=True)
+    body = report.render(export_request(path), entity_id, DataLoader(MODELS[profile]())).body
+    if report.failed:
+        raise RuntimeError(f"Could not render {', '.join(report.failed)} of {path}")
+    write_file(Path(output_dir) / profile / str(entity_id) / "index.html", body)
+    return list(chart_digests(body))
+
+
+def load_manifest(path):
+    """
+    Read the manifest of a previous export.
+
+    Args:
+        path (Path): The manifest file.
+
+    Returns:
+        dict: The manifest, or an empty one if there is none or it is unreadable.
+    """
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return {"site": None, "pages": {}}
+
+
+def export(output_dir, db_path=None, force=False, workers=None):
+    """
+    Export the landing page and every report page to static files.
+
+    Pages whose entity data, and everything shared by all pages, hashes the
+    same as in the previous export's manifest are kept as they are. Pages
+    of entities that no longer exist and charts no page shows are removed.
+
+    Args:
+        output_dir (str): The directory to write the site to.
+        db_path (str, optional): The database to export, default is the package database.
+        force (bool, optional): Render every page even if its data did not change.
+        workers (int, optional): Number of render processes, default is the CPU count.
+
+    Returns:
+        dict: The number of pages `rendered`, `skipped` and `removed`.
+    """
+    output = Path(output_dir)
+    chart_dir = output / "charts"
+    chart_dir.mkdir(parents=True, exist_ok=True)
+    if db_path is not None:
+        configure_pool(db_path=db_path)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Re-score stale risks once here, so the workers only read
+        score_risks()
+        site = site_version()
+        hashes = {
+            f"{profile}/{entity_id}": digest
+            for profile, model in MODELS.items()
+            for entity_id, digest in entity_hashes(model()).items()
+        }
+
+    manifest_path = output / "manifest.json"
+    previous = load_manifest(manifest_path)
+    # Pages are only reused if nothing they share changed; every previous page is
+    # still checked for removal below
+    rerender = force or previous.get("site") != site
+    pages = {
+        key: page for key, page in previous["pages"].items()
+        if not rerender and hashes.get(key) == page["hash"] and (output / key / "index.html").exists()
+    }
+    todo = [key for key in hashes if key not in pages]
+
+    if rerender or not (output / "index.html").exists():
+        with contextlib.redirect_stdout(io.StringIO()):
+            write_file(output / "index.html", render_landing_page(export_request("/"), static=True).body)
+
+    if todo:
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(get_pool().db_path), str(chart_dir)),
+        ) as pool:
+            futures = {}
+            for key in todo:
+                profile, entity_id = key.split("/")
+                futures[key] = pool.submit(render_page, profile, int(entity_id), str(output))
+            for key, future in futures.items():
+                pages[key] = {"hash": hashes[key], "charts": future.result()}
+
+    # Remove the pages of deleted entities and the charts no page shows any more
+    removed = [key for key in previous["pages"] if key not in hashes]
+    for key in removed:
+        with contextlib.suppress(FileNotFoundError):
+            (output / key / "index.html").unlink()
+    shown = {digest for page in pages.values() for digest in page["charts"]}
+    for chart in chart_dir.glob("*.png"):
+        if chart.stem not in shown:
+            chart.unlink()
+
+    manifest = {"site": site, "pages": dict(sorted(pages.items()))}
+    write_file(manifest_path, json.dumps(manifest, indent=2).encode())
+    return {"rendered": len(todo), "skipped": len(hashes) - len(todo), "removed": len(removed)}
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = dict(arg[2:].partition("=")[::2] for arg in sys.argv[1:] if arg.startswith("--"))
+    if not args or set(options) - {"force", "workers"}:
+        print("Usage: python report/export.py OUTPUT_DIR [db_path] [--force] [--workers=N]")
+        sys.exit(1)
+
+    workers = int(options["workers"]) if options.get("workers") else None
+    result = export(args[0], args[1] if len(args) > 1 else None, "force" in options, workers)
+    print(f"Rendered {result['rendered']} pages, kept {result['skipped']} unchanged "
+          f"and removed {result['removed']} in {args[0]}")
+
+
+if __name__ == "__main__":
+    main()
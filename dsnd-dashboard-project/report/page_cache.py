@@ -0,0 +1,175 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# A rendered page, the data/model versions it was rendered from, when
+# those versions were last confirmed to be current, and the digests of the
+# stored charts it shows
+CachedPage = namedtuple("CachedPage", ["version", "etag", "body", "checked_at", "charts"])
+
+
+def page_etag(body):
+    """
+    Build the strong ETag of a response body.
+
+    Args:
+        body (bytes): The response body.
+
+    Returns:
+        str: The quoted SHA-256 hex digest of the body.
+    """
+    return f'"{hashlib.sha256(body).hexdigest()}"'
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Check an `If-None-Match` request header against a response's ETag.
+
+    Args:
+        if_none_match (str): The header value, or None if it was not sent.
+        etag (str): The quoted ETag of the current response.
+
+    Returns:
+        bool: True if the client's copy is current and a 304 can be sent.
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
+class PageCache:
+    """
+    A bounded, thread-safe cache of rendered pages with stale-while-revalidate.
+
+    A page is fresh while the version it was rendered from (e.g. the data
+    version and the model version) is the current one. Once the version
+    changes the page is stale: for `stale_seconds` after it was last known
+    to be fresh it may still be served while a single background refresh
+    renders the new page (see `start_refresh`). Older stale pages are
+    rendered again before responding.
+
+    Attributes:
+        maxsize (int): Maximum number of cached pages.
+        stale_seconds (float): How long a stale page may be served while it is refreshed.
+    """
+
+    def __init__(self, maxsize=256, stale_seconds=60.0):
+        self.maxsize = maxsize
+        self.stale_seconds = stale_seconds
+        self._pages = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale = 0
+        self.misses = 0
+
+    def lookup(self, key, version, valid=None):
+        """
+        Look up a page, counting the hit, stale hit or miss.
+
+        Args:
+            key (tuple): The page's route and parameters.
+            version (tuple): The current version of everything the page is rendered from.
+            valid (callable, optional): Called with the cached page; if it returns False
+                the page is dropped and counted as a miss, e.g. when a chart it shows
+                is no longer stored.
+
+        Returns:
+            tuple: The cached page (or None if it must be rendered) and whether it is fresh.
+        """
+        now = time.monotonic()
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None and valid is not None and not valid(page):
+                del self._pages[key]
+                page = None
+            if page is None:
+                self.misses += 1
+                return None, False
+            self._pages.move_to_end(key)
+            if page.version == version:
+                self._pages[key] = page = page._replace(checked_at=now)
+                self.hits += 1
+                return page, True
+            if now - page.checked_at < self.stale_seconds:
+                self.stale += 1
+                return page, False
+            self.misses += 1
+            return None, False
+
+    def put(self, key, version, body, charts=()):
+        """
+        Store a rendered page, evicting the least recently used pages beyond `maxsize`.
+
+        Args:
+            key (tuple): The page's route and parameters.
+            version (tuple): The version the page was rendered from.
+            body (bytes): The rendered page.
+            charts (tuple, optional): The digests of the stored charts the page shows.
+
+        Returns:
+            CachedPage: The stored page.
+        """
+        page = CachedPage(version, page_etag(body), body, time.monotonic(), tuple(charts))
+        if self.maxsize <= 0:
+            return page
+        with self._lock:
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.maxsize:
+                self._pages.popitem(last=False)
+        return page
+
+    def start_refresh(self, key):
+        """
+        Claim the background refresh of a stale page.
+
+        Args:
+            key (tuple): The page's route and parameters.
+
+        Returns:
+            bool: True if the caller should refresh the page, False if a refresh is already running.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def finish_refresh(self, key):
+        """
+        Release a refresh claimed with `start_refresh`.
+
+        Args:
+            key (tuple): The page's route and parameters.
+        """
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def clear(self):
+        """
+        Drop every cached page and reset the counters.
+        """
+        with self._lock:
+            self._pages.clear()
+            self.hits = self.stale = self.misses = 0
+
+    def info(self):
+        """
+        Return the hit/miss counters and the size of the cache.
+
+        Returns:
+            dict: `hits`, `stale`, `misses`, `pages`, `refreshing` and `maxsize`.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale": self.stale,
+                "misses": self.misses,
+                "pages": len(self._pages),
+                "refreshing": len(self._refreshing),
+                "maxsize": self.maxsize,
+            }
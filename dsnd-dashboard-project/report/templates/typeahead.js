@@ -0,0 +1,29 @@
+// Typeahead entity selector: replace the select's options with the top matches.
+// Included in the <script> of the landing and report pages when served by the dashboard.
+const TYPEAHEAD_DELAY = 150;
+document.addEventListener("input", (event) => {
+    const input = event.target.closest(".entity-typeahead");
+    if (!input) {
+        return;
+    }
+    clearTimeout(input.searchTimer);
+    input.searchTimer = setTimeout(async () => {
+        // Only the latest search may update the select
+        const search = (input.searchCount = (input.searchCount || 0) + 1);
+        const params = new URLSearchParams({ type: input.dataset.type, q: input.value, limit: 10 });
+        try {
+            const response = await fetch(`/entities/search?${params}`);
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            const data = await response.json();
+            if (search !== input.searchCount) {
+                return;
+            }
+            const select = document.getElementById(input.dataset.select);
+            select.replaceChildren(...data.results.map((entity) => new Option(entity.name, entity.id)));
+        } catch (error) {
+            logDebugMessage(`Error Searching Entities: ${error.message}`);
+        }
+    }, TYPEAHEAD_DELAY);
+});
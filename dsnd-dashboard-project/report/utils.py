@@ -1,6 +1,11 @@
-import pickle
+import base64
+import json
 from pathlib import Path
 
+import pandas as pd
+
+from python_package.employee_events.risk import load_predictor
+
 # Using the Path object, create a `project_root` variable
 # set to the absolute path for the root of this project directory
 project_root = Path(__file__).resolve().parent.parent
@@ -11,14 +16,82 @@ project_root = Path(__file__).resolve().parent.parent
 # inside the assets directory
 model_path = project_root / "assets" / "model.pkl"
 
+# Coefficients of the same model, exported by the asset build (see `export_model`)
+model_json_path = project_root / "assets" / "model.json"
+
+
+def model_artifact_path():
+    """
+    Return the path of the model file `load_model` reads.
+
+    Returns:
+        Path: `model.json` if it exists, otherwise `model.pkl`.
+    """
+    return model_json_path if model_json_path.exists() else model_path
+
+
 def load_model():
     """
-    Load a machine learning model from the model.pkl file.
-    
+    Load the recruitment risk model.
+
+    The NumPy `LogisticPredictor` is built from `model.json` when it exists,
+    which avoids importing scikit-learn and SciPy. Otherwise the pickled
+    scikit-learn model is loaded from `model.pkl`.
+
     Returns:
-        object: The loaded machine learning model.
+        object: The loaded model, with a `predict_proba` method.
+    """
+    return load_predictor(model_artifact_path())
+
+
+def encode_cursor(key):
     """
-    with model_path.open('rb') as file:
-        model = pickle.load(file)
+    Encode a keyset cursor (e.g. the last row's sort key) as a URL-safe token.
 
-    return model
+    Args:
+        key (str or tuple): The sort key of the last row on a page.
+
+    Returns:
+        str: An opaque token for the `after` query parameter.
+    """
+    payload = json.dumps(list(key) if isinstance(key, tuple) else key).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Decode a token created by `encode_cursor`.
+
+    Args:
+        token (str): The `after` query parameter.
+
+    Returns:
+        str or tuple: The sort key of the last row on the previous page.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (ValueError, TypeError) as error:
+        raise ValueError(f"Invalid cursor: {token!r}") from error
+    return tuple(key) if isinstance(key, list) else key
+
+
+def columnar(df, columns=None):
+    """
+    Convert a DataFrame into compact column-oriented JSON data.
+
+    Args:
+        df (pandas.DataFrame): The rows to convert.
+        columns (dict, optional): Maps output names to DataFrame columns.
+            Defaults to every column under its own name.
+
+    Returns:
+        dict: One list of plain Python values per column; missing values become None.
+    """
+    columns = columns or {column: column for column in df.columns}
+    return {
+        name: [None if pd.isna(value) else value for value in df[column].tolist()]
+        for name, column in columns.items()
+    }
@@ -1,7 +1,7 @@
 import pandas as pd
 from pathlib import Path
 import numpy as np
-import random, pickle, json
+import random, pickle, json, sys
 from sqlite3 import connect
 from datetime import timedelta, date
 from sklearn.linear_model import LogisticRegression
@@ -10,6 +10,10 @@ from scipy.stats import norm, expon, uniform, skewnorm
 
 cwd = Path('.').resolve()
 
+sys.path.insert(0, str(cwd.parent / 'python_package'))
+from employee_events.migrations import migrate
+from employee_events.risk import model_version, refresh_risk_scores, export_model
+
 def left_skew(a, loc, size=500):
     r = skewnorm.rvs(a = a , loc=loc, size=size) 
     r = r - min(r)     
@@ -162,9 +166,15 @@ with model_path.open('wb') as file:
 
     pickle.dump(model, file)
 
+# Dependency-free copy of the coefficients; the dashboard loads this instead of the pickle
+model_json_path = cwd.parent / 'assets' / 'model.json'
+export_model(model, model_json_path)
+
 
-db_path = cwd.parent / 'python-package' / 'employee_events' / 'employee_events.db'
+db_path = cwd.parent / 'python_package' / 'employee_events' / 'employee_events.db'
 
+# Start from an empty file so the schema migrations below are applied from version 0
+db_path.unlink(missing_ok=True)
 connection = connect(db_path)
 
 employee.to_sql('employee', connection, if_exists='replace')
@@ -172,4 +182,7 @@ team.to_sql('team', connection, if_exists='replace')
 notes.to_sql('notes', connection, if_exists='replace')
 events.to_sql('employee_events', connection, if_exists='replace')
 
-connection.close()
\ No newline at end of file
+connection.close()
+
+migrate(db_path)
+refresh_risk_scores(model, model_version(model_json_path), db_path)
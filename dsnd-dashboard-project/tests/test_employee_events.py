@@ -1,6 +1,36 @@
 import pytest
+import asyncio
+import shutil
+import pickle
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from sqlite3 import connect
+from sqlite3 import connect, OperationalError, ProgrammingError
+
+from python_package.employee_events import (
+    Employee,
+    Team,
+    configure_pool,
+    get_pool,
+    cache_info,
+    shutdown_executor,
+    file_version,
+    DataLoader,
+    configure_cache,
+)
+from python_package.employee_events.query_base import COLUMN_DTYPES
+from python_package.employee_events.sql_execution import typed_frame
+from python_package.employee_events.migrations import migrate, MIGRATIONS
+from python_package.employee_events.rollups import refresh_rollups
+from python_package.employee_events.ingest import ingest
+from python_package.employee_events.risk import (
+    refresh_risk_scores, LogisticPredictor, export_model, load_predictor, model_version,
+)
+from python_package.employee_events import __main__ as cli
 
 # Using pathlib, create a project_root variable set to the absolute path for the root of this project
 project_root = Path(__file__).resolve().parent.parent
@@ -64,3 +94,560 @@ def test_employee_events_table_exists(table_names):
     """
     # Assert that the string 'employee_events' is in the table_names list
     assert 'employee_events' in table_names, "'employee_events' table does not exist in the database"
+
+@pytest.fixture
+def pooled_db(db_path, tmp_path):
+    """
+    Fixture that points the connection pool at a temporary copy of the database.
+    """
+    copy_path = tmp_path / "employee_events.db"
+    shutil.copy(db_path, copy_path)
+    configure_pool(db_path=copy_path)
+    yield copy_path
+    configure_pool()
+
+# Define a test function called `test_pool_reuses_read_only_connection`
+def test_pool_reuses_read_only_connection(pooled_db, db_path):
+    """
+    Test that queries on one thread share a single read-only connection.
+    """
+    pool = get_pool()
+    assert pool.connection() is pool.connection()
+    assert Employee().names() == Employee().names()
+    with pytest.raises(OperationalError):
+        pool.connection().execute("DELETE FROM employee")
+    # Reading never rewrites the database, not even its journal mode
+    assert pool.connection().execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert pooled_db.read_bytes() == db_path.read_bytes()
+
+# Define a test function called `test_pool_close_reopens_connections`
+def test_pool_close_reopens_connections(pooled_db):
+    """
+    Test that closing the pool closes its connections and later queries reconnect.
+    """
+    pool = get_pool()
+    connection = pool.connection()
+    pool.close()
+    with pytest.raises(ProgrammingError):
+        connection.execute("SELECT 1")
+    assert pool.connection() is not connection
+    assert len(Team().names()) == 5
+
+# Define a test function called `test_query_cache_hits_until_data_changes`
+def test_query_cache_hits_until_data_changes(pooled_db):
+    """
+    Test that repeated queries are served from the cache until the database is written.
+    """
+    employee = Employee()
+    first = employee.names()
+    employee.names()
+    assert cache_info()["hits"] == 1
+
+    # Mutating a returned DataFrame must not leak into the cache
+    data = employee.model_data(1)
+    data.loc[0, "positive_events"] = -1
+    assert employee.model_data(1).loc[0, "positive_events"] != -1
+
+    writer = connect(pooled_db)
+    writer.execute("UPDATE employee SET first_name = 'Changed' WHERE employee_id = 1")
+    writer.commit()
+    writer.close()
+
+    misses = cache_info()["misses"]
+    assert employee.names() != first
+    assert cache_info()["misses"] == misses + 1
+
+# Define a test function called `test_async_methods_match_blocking_methods`
+def test_async_methods_match_blocking_methods(pooled_db):
+    """
+    Test that the async counterparts return the same data on the query executor's own connections.
+    """
+    team = Team()
+
+    async def fetch():
+        return await asyncio.gather(
+            team.async_names(),
+            team.async_username(1),
+            team.async_event_counts(1),
+            team.async_query("SELECT COUNT(*) FROM employee"),
+        )
+
+    names, username, event_counts, count = asyncio.run(fetch())
+    assert names == team.names()
+    assert username == team.username(1)
+    assert event_counts.equals(team.event_counts(1))
+    assert count == [(25,)]
+    assert len(get_pool()._connections) > 1
+    shutdown_executor()
+
+# Define a test function called `test_data_loader_runs_each_query_once`
+def test_data_loader_runs_each_query_once(pooled_db):
+    """
+    Test that a request's loader shares every distinct query between its callers until the data changes.
+    """
+    configure_cache(maxsize=0)
+    # Open the pool first, as the app does: switching the file to WAL changes its version
+    get_pool().connection()
+    loader = DataLoader(Employee())
+    assert loader.name == "employee"
+
+    async def prefetch():
+        return await asyncio.gather(loader.async_username(1), loader.async_notes(1, limit=5))
+
+    username, notes = asyncio.run(prefetch())
+    assert loader.username(1) == username == Employee().username(1)
+    assert loader.notes(id=1, limit=5) is notes
+    assert loader.notes(1) is not notes
+    assert (loader.queries, loader.hits) == (3, 2)
+
+    writer = connect(pooled_db)
+    writer.execute("UPDATE employee SET first_name = 'Changed' WHERE employee_id = 1")
+    writer.commit()
+    writer.close()
+    assert loader.username(1) != username
+    assert loader.queries == 4
+
+    # An interrupted query is raised to its waiting callers too, then runs again
+    started, release = threading.Event(), threading.Event()
+
+    def interrupted(id):
+        started.set()
+        release.wait()
+        raise KeyboardInterrupt
+
+    model = Employee()
+    model.username = interrupted
+    loader = DataLoader(model)
+    with ThreadPoolExecutor(2) as threads:
+        owner = threads.submit(loader.username, 1)
+        started.wait()
+        waiter = threads.submit(loader.username, 1)
+        while loader.hits == 0:
+            time.sleep(0.01)
+        release.set()
+        assert isinstance(owner.exception(timeout=5), KeyboardInterrupt)
+        assert isinstance(waiter.exception(timeout=5), KeyboardInterrupt)
+    model.username = lambda id: [("Again",)]
+    assert loader.username(1) == [("Again",)]
+    assert loader.queries == 2
+
+    configure_cache()
+    shutdown_executor()
+
+# Define a test function called `test_many_variants_match_single_entity_queries`
+def test_many_variants_match_single_entity_queries(pooled_db):
+    """
+    Test that the batched queries split per entity into the single-entity results.
+    """
+    employee = Employee()
+    event_counts = employee.event_counts_many([2, 1, 2])
+    assert sorted(event_counts.employee_id.unique()) == [1, 2]
+    for employee_id, group in event_counts.groupby("employee_id"):
+        expected = employee.event_counts(employee_id)
+        assert group.drop(columns="employee_id").reset_index(drop=True).equals(expected)
+
+    model_data = employee.model_data_many(range(1, 26))
+    assert len(model_data) == 25
+    assert model_data.iloc[0, 1:].tolist() == employee.model_data(1).iloc[0].tolist()
+
+    team_data = Team().model_data_many([1, 2])
+    assert len(team_data[team_data.team_id == 1]) == len(Team().model_data(1))
+    assert employee.notes_many([]).empty
+    with pytest.raises(ValueError):
+        employee.notes_many(["1"])
+
+# Define a test function called `test_migrate_adds_covering_indexes`
+def test_migrate_adds_covering_indexes(pooled_db):
+    """
+    Test that migrating drops the pandas index columns, uses covering indexes and keeps query results.
+    """
+    employee = Employee()
+    before = employee.event_counts(1)
+
+    assert migrate(pooled_db) == list(range(1, len(MIGRATIONS) + 1))
+    assert migrate(pooled_db) == []
+
+    conn = connect(pooled_db)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(employee_events)")]
+    assert "index" not in columns
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT event_date, SUM(positive_events) FROM employee_events "
+        "WHERE team_id = ? GROUP BY event_date", [1]
+    ).fetchall()
+    assert "COVERING INDEX" in plan[0][-1]
+    conn.close()
+
+    assert employee.event_counts(1).equals(before)
+
+# Define a test function called `test_rollups_match_raw_aggregates_and_refresh_incrementally`
+def test_rollups_match_raw_aggregates_and_refresh_incrementally(pooled_db):
+    """
+    Test that the rollup-backed queries match the raw aggregates and catch up after new events.
+    """
+    employee, team = Employee(), Team()
+    raw = (employee.event_counts(3), team.event_counts(2), employee.model_data(3), team.model_data(2))
+
+    migrate(pooled_db)
+    assert team.rollups_fresh()
+    rolled_up = (employee.event_counts(3), team.event_counts(2), employee.model_data(3), team.model_data(2))
+    for expected, actual in zip(raw, rolled_up):
+        assert actual.equals(expected)
+
+    writer = connect(pooled_db)
+    watermark = writer.execute("SELECT watermark FROM rollup_state").fetchone()[0]
+    team_id = writer.execute("SELECT team_id FROM employee WHERE employee_id = 3").fetchone()[0]
+    writer.execute(
+        "INSERT INTO employee_events (event_date, employee_id, team_id, positive_events, negative_events) "
+        "VALUES ('2099-01-01', 3, ?, 5, 1)", [team_id]
+    )
+    writer.commit()
+    writer.close()
+
+    # Stale rollups are bypassed until they are refreshed
+    assert not team.rollups_fresh()
+    assert employee.event_counts(3).iloc[-1].tolist() == ["2099-01-01", 5, 1]
+
+    result = refresh_rollups(pooled_db)
+    assert (result["start"], result["watermark"]) == (watermark, "2099-01-01")
+    assert team.rollups_fresh()
+    assert employee.event_counts(3).iloc[-1].tolist() == ["2099-01-01", 5, 1]
+    assert employee.model_data(3).iloc[0].tolist() == [
+        raw[2].iloc[0, 0] + 5, raw[2].iloc[0, 1] + 1
+    ]
+
+# Define a test function called `test_cumulative_event_counts_match_cumsum`
+def test_cumulative_event_counts_match_cumsum(pooled_db):
+    """
+    Test that the cumulative series equals the running sum of the daily counts, with and without rollups.
+    """
+    team = Team()
+    expected = team.event_counts(4).set_index("event_date").cumsum()
+    expected.columns = ["cumulative_positive_events", "cumulative_negative_events"]
+
+    raw = team.cumulative_event_counts(4).set_index("event_date")
+    assert raw.equals(expected)
+
+    migrate(pooled_db)
+    assert team.cumulative_event_counts(4).set_index("event_date").equals(expected)
+
+    writer = connect(pooled_db)
+    writer.execute(
+        "INSERT INTO employee_events (event_date, employee_id, team_id, positive_events, negative_events) "
+        "SELECT '2099-01-01', employee_id, team_id, 1, 2 FROM employee WHERE team_id = 4"
+    )
+    writer.commit()
+    writer.close()
+    refresh_rollups(pooled_db)
+
+    members = len(Team().model_data(4))
+    last = team.cumulative_event_counts(4, start="2099-01-01")
+    assert last.values.tolist() == [[
+        "2099-01-01",
+        expected.iloc[-1, 0] + members,
+        expected.iloc[-1, 1] + 2 * members,
+    ]]
+    window = team.cumulative_event_counts(4, start=expected.index[10], end=expected.index[19])
+    assert window.set_index("event_date").equals(expected.iloc[10:20])
+
+# Define a test function called `test_ingest_upserts_events_and_updates_rollups`
+def test_ingest_upserts_events_and_updates_rollups(pooled_db):
+    """
+    Test that ingesting de-duplicates events per employee and day and keeps the rollups fresh.
+    """
+    with pytest.raises(RuntimeError):
+        ingest(events=[{"event_date": "2099-01-01", "employee_id": 1, "positive_events": 1, "negative_events": 1}])
+
+    migrate(pooled_db)
+    employee = Employee()
+    last_day = employee.event_counts(1).iloc[-1]
+
+    result = ingest(
+        events=[
+            {"event_date": "2099-01-01", "employee_id": 1, "positive_events": 1, "negative_events": 1},
+            {"event_date": "2099-01-01", "employee_id": 1, "positive_events": 7, "negative_events": 3},
+            {"event_date": last_day.event_date, "employee_id": 1, "positive_events": 0, "negative_events": 0},
+        ],
+        notes=[{"employee_id": 1, "note": "Ingested note.", "note_date": "2099-01-01"}] * 2
+        + [{"team_id": 2, "note": "Ingested team note.", "note_date": "2099-01-01"}] * 2,
+        db_path=pooled_db,
+    )
+    assert (result["events"], result["notes"]) == (3, 2)
+
+    assert employee.rollups_fresh()
+    counts = employee.event_counts(1).set_index("event_date")
+    assert counts.loc["2099-01-01"].tolist() == [7, 3]
+    assert counts.loc[last_day.event_date].tolist() == [0, 0]
+    assert employee.notes(1)[["note_date", "note"]].iloc[-1].tolist() == ["2099-01-01", "Ingested note."]
+    assert Team().notes(2)[["note_date", "note"]].iloc[-1].tolist() == ["2099-01-01", "Ingested team note."]
+
+    conn = connect(pooled_db)
+    rows = conn.execute("SELECT employee_id, team_id FROM notes WHERE note LIKE 'Ingested%' ORDER BY note").fetchall()
+    assert rows == [(1, None), (None, 2)]
+    # The employee's note is not listed on their team's report
+    (team_id,) = conn.execute("SELECT team_id FROM employee WHERE employee_id = 1").fetchone()
+    assert "Ingested note." not in Team().notes(team_id)["note"].tolist()
+    assert conn.execute("SELECT MAX(batch_id) FROM ingest_log").fetchone()[0] == result["batch_id"]
+    conn.close()
+
+# Define a test function called `test_snapshot_mode_serves_memory_copy_and_refreshes`
+def test_snapshot_mode_serves_memory_copy_and_refreshes(pooled_db):
+    """
+    Test that snapshot mode reads an in-memory copy that is reloaded when the file changes.
+    """
+    configure_pool(db_path=pooled_db, snapshot=True)
+    team = Team()
+    names = team.names()
+    connection = get_pool().connection()
+    assert connection.execute("PRAGMA database_list").fetchone()[2] == ""
+
+    writer = connect(pooled_db)
+    writer.execute("UPDATE team SET team_name = 'Renamed Team' WHERE team_id = 1")
+    writer.commit()
+    writer.close()
+
+    assert ("Renamed Team", 1) in team.names()
+    assert ("Renamed Team", 1) not in names
+    assert get_pool().connection() is not connection
+    assert get_pool().data_version() == file_version(pooled_db)
+
+# Define a test function called `test_snapshot_swap_during_a_query_is_not_cached_as_current`
+def test_snapshot_swap_during_a_query_is_not_cached_as_current(pooled_db, monkeypatch):
+    """
+    Test that a query on an old snapshot is cached under the old version and idle old connections are closed.
+    """
+    configure_pool(db_path=pooled_db, snapshot=True)
+    pool = get_pool()
+    team = Team()
+    assert ("Renamed Team", 1) not in team.names()
+    with ThreadPoolExecutor(1) as threads:
+        idle = threads.submit(lambda: (team.names(), pool.connection())[1]).result()
+
+    # The snapshot is swapped once, after the query got its connection
+    checkout = pool.connection
+    swaps = []
+
+    def connection_then_swap():
+        connection = checkout()
+        if swaps:
+            return connection
+        swaps.append(connection)
+        writer = connect(pooled_db)
+        writer.execute("UPDATE team SET team_name = 'Renamed Team' WHERE team_id = 1")
+        writer.commit()
+        writer.close()
+        assert pool.refresh_snapshot()
+        return connection
+
+    monkeypatch.setattr(pool, "connection", connection_then_swap)
+    team.query("SELECT team_name, team_id FROM team")
+    monkeypatch.undo()
+    assert len(swaps) == 1
+
+    assert ("Renamed Team", 1) in team.query("SELECT team_name, team_id FROM team")
+    assert ("Renamed Team", 1) in team.names()
+    # The other thread's connection to the old copy was closed by the swap
+    with pytest.raises(ProgrammingError):
+        idle.execute("SELECT 1")
+
+# Define a test function called `test_typed_frames_match_read_sql_query`
+def test_typed_frames_match_read_sql_query(pooled_db):
+    """
+    Test that the columnar fast path builds the same DataFrames as `pd.read_sql_query`.
+    """
+    employee = Employee()
+    connection = get_pool().connection()
+    cases = [
+        (employee.event_counts(1), "SELECT event_date, SUM(positive_events) AS total_positive_events, "
+            "SUM(negative_events) AS total_negative_events FROM employee_events "
+            "WHERE employee_id = 1 GROUP BY event_date ORDER BY event_date"),
+        (employee.notes(1), "SELECT note_date, note, rowid AS note_id FROM notes WHERE employee_id = 1 "
+            "ORDER BY note_date, note, rowid"),
+        (employee.model_data(1), "SELECT SUM(positive_events) AS positive_events, "
+            "SUM(negative_events) AS negative_events FROM employee_events WHERE employee_id = 1"),
+        # NULL aggregates do not fit int64 and fall back to inference
+        (employee.model_data(999), "SELECT SUM(positive_events) AS positive_events, "
+            "SUM(negative_events) AS negative_events FROM employee_events WHERE employee_id = 999"),
+    ]
+    for typed, sql in cases:
+        expected = pd.read_sql_query(sql, connection)
+        assert typed.equals(expected)
+        assert typed.dtypes.tolist() == expected.dtypes.tolist()
+
+    assert employee.event_counts(1).total_positive_events.dtype == "int64"
+
+    # Values an integer column cannot hold exactly are never cast
+    sql = ("SELECT 1.5 AS employee_id, '3' AS team_id, NULL AS positive_events, "
+           "9223372036854775807 * 2 AS negative_events, 2 AS risk "
+           "UNION ALL SELECT 2, 4, 5, 6, NULL")
+    typed = typed_frame(connection.execute(sql), COLUMN_DTYPES)
+    expected = pd.read_sql_query(sql, connection)
+    assert typed.equals(expected)
+    assert typed.dtypes.tolist() == expected.dtypes.tolist()
+    assert typed.employee_id.tolist() == [1.5, 2.0]
+
+# Define a test function called `test_date_ranges_and_keyset_pages`
+def test_date_ranges_and_keyset_pages(pooled_db):
+    """
+    Test that date ranges and keyset pages are pushed into SQL and walk the full history.
+    """
+    employee = Employee()
+    history = employee.event_counts(1)
+    middle = history.event_date.iloc[len(history) // 2]
+    in_range = employee.event_counts(1, start=middle, end=history.event_date.iloc[-1])
+    assert in_range.equals(history[history.event_date >= middle].reset_index(drop=True))
+
+    pages, after = [], None
+    while True:
+        page = employee.event_counts(1, limit=100, after=after)
+        if page.empty:
+            break
+        pages.append(page)
+        after = page.event_date.iloc[-1]
+    assert [len(page) for page in pages] == [100, 100, len(history) - 200]
+    assert pd.concat(pages, ignore_index=True).equals(history)
+
+    notes = Team().notes(1)
+    first = Team().notes(1, limit=1)
+    rest = Team().notes(1, after=tuple(first.iloc[-1]))
+    assert pd.concat([first, rest], ignore_index=True).equals(notes)
+    with pytest.raises(ValueError):
+        employee.notes(1, after="2023-01-01")
+    with pytest.raises(ValueError):
+        employee.notes(1, after=tuple(first[["note_date", "note"]].iloc[-1]))
+
+    # Two employees of a team can write the same note on the same day; the
+    # row ID keeps pages from skipping or repeating either of them
+    conn = connect(pooled_db)
+    with conn:
+        conn.executemany(
+            "INSERT INTO notes (employee_id, team_id, note, note_date) VALUES (?, 1, 'Same note.', '2099-01-01')",
+            conn.execute("SELECT employee_id FROM employee WHERE team_id = 1 LIMIT 3").fetchall(),
+        )
+    conn.close()
+    notes = Team().notes(1)
+    assert (notes.note == "Same note.").sum() == 3
+    pages, after = [], None
+    while True:
+        page = Team().notes(1, limit=2, after=after)
+        if page.empty:
+            break
+        pages.append(page)
+        after = tuple(page.iloc[-1])
+    assert pd.concat(pages, ignore_index=True).equals(notes)
+    with pytest.raises(ValueError):
+        employee.event_counts(1, limit=0)
+
+# Define a test function called `test_search_notes_ranks_and_follows_writes`
+def test_search_notes_ranks_and_follows_writes(pooled_db):
+    """
+    Test that the notes full-text index finds notes by word prefix and stays in sync with writes.
+    """
+    employee = Employee()
+    with pytest.raises(RuntimeError):
+        employee.search_notes("leadership")
+
+    migrate(pooled_db)
+    hits = employee.search_notes("leader")
+    assert hits.snippet.tolist() == ["Exemplary \x02leadership\x03 in Q1."]
+    assert hits.employee_name.tolist() == [employee.username(1)[0][0]]
+    assert employee.search_notes("in", id=2).note_date.tolist() == ["2023-02-10"]
+    assert employee.search_notes('"OR NEAR(').empty
+
+    ingest(notes=[{"employee_id": 1, "note": "Leadership AND delivery.", "note_date": "2099-01-01"}], db_path=pooled_db)
+    assert len(employee.search_notes("leadership")) == 2
+    assert employee.search_notes("leadership", limit=1).note_date.tolist() == ["2099-01-01"]
+
+    writer = connect(pooled_db)
+    writer.execute("DELETE FROM notes WHERE note_date = '2099-01-01'")
+    writer.commit()
+    writer.close()
+    assert employee.search_notes("delivery").empty
+
+# Define a test function called `test_risk_scores_are_batch_scored_and_invalidated`
+def test_risk_scores_are_batch_scored_and_invalidated(pooled_db):
+    """
+    Test that batch risk scores match per-entity scoring and go stale when the data or model changes.
+    """
+    class MeanPredictor:
+        """Scores the share of negative events, vectorized like predict_proba."""
+        def predict_proba(self, X):
+            risk = X["negative_events"].to_numpy() / (X["positive_events"] + X["negative_events"]).to_numpy()
+            return np.column_stack([1 - risk, risk])
+
+    predictor = MeanPredictor()
+    with pytest.raises(RuntimeError):
+        refresh_risk_scores(predictor, "v1", pooled_db)
+
+    migrate(pooled_db)
+    employee, team = Employee(), Team()
+    assert employee.risk_score(1, "v1") is None
+    assert refresh_risk_scores(predictor, "v1", pooled_db)["employees"] == 25
+    assert not refresh_risk_scores(predictor, "v1", pooled_db)["scored"]
+
+    # Fresh scores are detected without waiting for the write lock
+    writer = connect(pooled_db, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    assert not refresh_risk_scores(predictor, "v1", pooled_db)["scored"]
+    writer.rollback()
+    writer.close()
+
+    assert employee.risk_score(1, "v1") == pytest.approx(predictor.predict_proba(employee.model_data(1))[0, 1])
+    assert team.risk_score(2, "v1") == pytest.approx(predictor.predict_proba(team.model_data(2))[:, 1].mean())
+    ranking = team.risk_ranking("v1", limit=2)
+    assert ranking.risk.is_monotonic_decreasing and len(ranking) == 2
+
+    # A new model version or new data makes the scores stale
+    assert employee.risk_score(1, "v2") is None
+    ingest(events=[{"event_date": "2099-01-01", "employee_id": 1, "positive_events": 0, "negative_events": 50}],
+           db_path=pooled_db)
+    assert employee.risk_score(1, "v1") is None
+    assert refresh_risk_scores(predictor, "v1", pooled_db)["scored"]
+    assert employee.risk_score(1, "v1") == pytest.approx(predictor.predict_proba(employee.model_data(1))[0, 1])
+
+# Define a test function called `test_score_command_rescores_after_an_ingest`
+def test_score_command_rescores_after_an_ingest(pooled_db, monkeypatch, capsys):
+    """
+    Test that `python -m employee_events score` re-scores risks only when the data changed.
+    """
+    model_path = project_root / "assets" / "model.json"
+    version = model_version(model_path)
+    migrate(pooled_db)
+
+    def score():
+        monkeypatch.setattr(sys, "argv", ["employee_events", "score", str(model_path), str(pooled_db)])
+        cli.main()
+        return capsys.readouterr().out
+
+    assert "Scored 25 employees and 5 teams" in score()
+    assert "up to date" in score()
+    ingest(events=[{"event_date": "2099-01-01", "employee_id": 1, "positive_events": 0, "negative_events": 50}],
+           db_path=pooled_db)
+    assert not Employee().risk_scores_fresh(version)
+    assert "Scored" in score()
+    predictor = load_predictor(model_path)
+    assert Employee().risk_score(1, version) == pytest.approx(
+        predictor.predict_proba(Employee().model_data(1))[0, 1]
+    )
+
+# Define a test function called `test_numpy_predictor_matches_pickled_model`
+def test_numpy_predictor_matches_pickled_model(tmp_path):
+    """
+    Test that the exported NumPy predictor reproduces the pickled scikit-learn model.
+    """
+    pytest.importorskip("sklearn")
+    with (project_root / "assets" / "model.pkl").open("rb") as file:
+        model = pickle.load(file)
+
+    export_model(model, tmp_path / "model.json")
+    predictor = LogisticPredictor.from_json(tmp_path / "model.json")
+    assert (tmp_path / "model.json").read_text() == (project_root / "assets" / "model.json").read_text()
+
+    X = pd.DataFrame(
+        np.random.default_rng(0).integers(0, 5000, size=(1000, 2)),
+        columns=["positive_events", "negative_events"],
+    )
+    # NumPy's exp may differ from the libm exp behind scipy's expit in the last bit
+    np.testing.assert_allclose(predictor.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-15)
+    np.testing.assert_array_equal(predictor.predict(X), model.predict(X))
+    np.testing.assert_allclose(predictor.predict_proba(X[["negative_events", "positive_events"]]),
+                               model.predict_proba(X), rtol=0, atol=1e-15)
@@ -0,0 +1,591 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import io
+import json
+import shutil
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from report.base_components.data_table import escape_column, iter_table, render_rows, render_table
+from report import chart_renderer
+from report.chart_renderer import configure_renderer, get_renderer, render_chart, shutdown_renderer
+from report.chart_store import ChartStore, chart_digests, chart_key
+from report.downsample import downsample_counts, downsample_indices, lttb_indices, minmax_indices
+from report.entity_index import EntityIndex, EntityIndexes
+from report.page_cache import PageCache, etag_matches
+from report.utils import columnar
+from python_package.employee_events import configure_pool
+
+project_root = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def client(tmp_path):
+    """
+    Fixture that serves the dashboard from a temporary copy of the database, drawing charts inline.
+    """
+    from fastapi.testclient import TestClient
+
+    shutil.copy(project_root / "python_package" / "employee_events" / "employee_events.db", tmp_path)
+    configure_pool(db_path=tmp_path / "employee_events.db")
+    # The dashboard imports its sibling modules from the report directory
+    sys.path.insert(0, str(project_root / "report"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        import dashboard
+        import chart_renderer
+        chart_renderer.configure_renderer(0)
+        dashboard.page_cache.clear()
+        with TestClient(dashboard.app) as test_client:
+            yield test_client
+    sys.path.remove(str(project_root / "report"))
+    configure_pool()
+
+
+# Define a test function called `test_chart_store_is_content_addressed_and_bounded`
+def test_chart_store_is_content_addressed_and_bounded(tmp_path):
+    """
+    Test that charts are stored under the digest of their bytes, looked up by inputs and evicted LRU.
+    """
+    store = ChartStore(maxsize=2)
+    key = chart_key("employee", 1, "line", "v1")
+    assert key != chart_key("team", 1, "line", "v1")
+    assert store.lookup(key) is None
+
+    digest = store.put(b"first", key)
+    assert store.lookup(key) == digest
+    assert store.get(digest) == b"first"
+    assert store.put(b"first") == digest
+
+    store.put(b"second")
+    store.put(b"third")
+    assert store.get(digest) is None
+    assert store.lookup(key) is None
+    assert store.info()["images"] == 2
+
+    # A shared directory keeps evicted charts available to every worker
+    shared = ChartStore(maxsize=1, directory=tmp_path)
+    digest = shared.put(b"first", key)
+    shared.put(b"second")
+    assert ChartStore(directory=tmp_path).get(digest) == b"first"
+    assert shared.get("../" + digest) is None
+
+
+# Define a test function called `test_render_chart_inline_and_on_pool`
+def test_render_chart_inline_and_on_pool():
+    """
+    Test that charts render to PNG both in the calling thread and on the process pool.
+    """
+    spec = {"value": 0.25, "title": "Risk"}
+    try:
+        configure_renderer(0)
+        assert get_renderer() is None
+        assert render_chart("bar", spec).startswith(b"\x89PNG")
+
+        configure_renderer(1)
+        line = {
+            "x": ["2023-01-01", "2023-01-02"],
+            "series": {"Positive": [1, 2], "Negative": [0, 1]},
+            "title": "Events",
+        }
+        assert render_chart("line", line).startswith(b"\x89PNG")
+
+        with pytest.raises(ValueError):
+            render_chart("pie", spec)
+    finally:
+        shutdown_renderer()
+
+
+# Define a test function called `test_render_chart_rebuilds_a_broken_pool_and_times_out`
+def test_render_chart_rebuilds_a_broken_pool_and_times_out(monkeypatch):
+    """
+    Test that a dead worker gets the pool rebuilt and that a timeout raises instead of drawing inline.
+    """
+    spec = {"value": 0.25, "title": "Risk"}
+    try:
+        configure_renderer(1)
+        pool = get_renderer()
+        assert render_chart("bar", spec).startswith(b"\x89PNG")
+        for process in list(pool._processes.values()):
+            process.kill()
+            process.join()
+        assert render_chart("bar", spec).startswith(b"\x89PNG")
+        assert get_renderer() not in (None, pool)
+
+        # A chart that fails to draw is raised as is, without replacing the pool
+        pool = get_renderer()
+        with pytest.raises(KeyError):
+            render_chart("bar", {"title": "Risk"})
+        assert get_renderer() is pool
+
+        # A new pool cannot start its worker in no time
+        configure_renderer(1)
+        monkeypatch.setattr(chart_renderer, "RENDER_TIMEOUT", 0)
+        with pytest.raises(concurrent.futures.TimeoutError):
+            render_chart("bar", spec)
+    finally:
+        shutdown_renderer()
+
+
+# Define a test function called `test_columnar_is_plain_json`
+def test_columnar_is_plain_json():
+    """
+    Test that DataFrames become one JSON-serializable list per column.
+    """
+    df = pd.DataFrame({
+        "event_date": ["2023-01-01", "2023-01-02"],
+        "total_positive_events": np.array([1, 2], dtype="int64"),
+        "risk": [0.5, np.nan],
+    })
+    data = columnar(df, {"event_date": "event_date", "positive_events": "total_positive_events"})
+    assert data == {"event_date": ["2023-01-01", "2023-01-02"], "positive_events": [1, 2]}
+    assert type(data["positive_events"][0]) is int
+
+    assert json.loads(json.dumps(columnar(df)))["risk"] == [0.5, None]
+
+
+# Define a test function called `test_downsampling_is_bounded_and_keeps_totals`
+def test_downsampling_is_bounded_and_keeps_totals():
+    """
+    Test that long histories are cut to the point budget without losing peaks or totals.
+    """
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=5000).cumsum()
+    y[1234] = 1000.0
+    rows = lttb_indices(np.arange(len(y)), y, 100)
+    assert len(rows) == 100
+    assert rows[0] == 0 and rows[-1] == len(y) - 1 and 1234 in rows
+    assert np.all(np.diff(rows) > 0)
+
+    extremes = minmax_indices(y, 10)
+    assert y.argmin() in extremes and y.argmax() in extremes
+
+    dates = np.datetime64("2020-01-01") + np.arange(5000)
+    assert len(downsample_indices(dates[:50], [y[:50]], 100)) == 50
+    assert len(downsample_indices(dates.astype(str), [y, -y], 100)) <= 100
+
+    counts = rng.integers(0, 5, size=(5000, 2))
+    rows, sampled = downsample_counts(dates, counts, 100)
+    assert len(rows) <= 100
+    np.testing.assert_array_equal(sampled.cumsum(axis=0), counts.cumsum(axis=0)[rows])
+
+
+# Define a test function called `test_page_cache_serves_stale_pages_while_refreshing`
+def test_page_cache_serves_stale_pages_while_refreshing():
+    """
+    Test that pages are fresh for one version, then stale for a bounded time with one refresh.
+    """
+    cache = PageCache(stale_seconds=60)
+    key = ("employee", 1, None, None, 50, "server")
+    assert cache.lookup(key, ("v1", "m1")) == (None, False)
+
+    page = cache.put(key, ("v1", "m1"), b"<html>1</html>")
+    cached, fresh = cache.lookup(key, ("v1", "m1"))
+    assert fresh and cached.body == b"<html>1</html>" and cached.etag == page.etag
+    assert etag_matches(page.etag, page.etag)
+    assert etag_matches(f'"other", W/{page.etag}', page.etag)
+    assert not etag_matches(None, page.etag)
+    assert page.etag != cache.put(("team", 1), ("v1", "m1"), b"<html>2</html>").etag
+
+    # A new data version makes the page stale; only one caller refreshes it
+    cached, fresh = cache.lookup(key, ("v2", "m1"))
+    assert not fresh and cached.etag == page.etag
+    assert cache.start_refresh(key)
+    assert not cache.start_refresh(key)
+    cache.finish_refresh(key)
+
+    cache.stale_seconds = 0
+    assert cache.lookup(key, ("v2", "m1")) == (None, False)
+    assert cache.info()["stale"] == 1
+
+
+# Define a test function called `test_table_renderer_escapes_whole_columns`
+def test_table_renderer_escapes_whole_columns():
+    """
+    Test that tables are escaped per cell, render missing values empty and stream in chunks.
+    """
+    assert escape_column(["<b>", "a & b", "\0\"'"]) == ["&lt;b&gt;", "a &amp; b", "\0&quot;&#x27;"]
+    assert escape_column(pd.Series([1, None, 2.5], dtype=object)) == ["1", "", "2.5"]
+    assert escape_column(np.array([1.5, np.nan])) == ["1.5", ""]
+
+    df = pd.DataFrame({"note_date": ["2023-01-01", "2023-01-02"], "note": ["<i>hi</i>", "x"]})
+    assert render_rows(df) == (
+        "<tr><td>2023-01-01</td><td>&lt;i&gt;hi&lt;/i&gt;</td></tr>"
+        "<tr><td>2023-01-02</td><td>x</td></tr>"
+    )
+    assert render_rows(df, ["note"]) == "<tr><td>&lt;i&gt;hi&lt;/i&gt;</td></tr><tr><td>x</td></tr>"
+    assert render_rows(df.iloc[:0]) == ""
+
+    chunks = list(iter_table(df, headers=["Date", "Note"], chunk_rows=1))
+    assert len(chunks) == 4
+    assert chunks[0] == "<table><thead><tr><th>Date</th><th>Note</th></tr></thead><tbody>"
+    assert "".join(chunks) == render_table(df, headers=["Date", "Note"])
+
+
+# Define a test function called `test_entity_index_matches_word_prefixes`
+def test_entity_index_matches_word_prefixes():
+    """
+    Test that entities are found by a prefix of any word of their name and the index follows the data version.
+    """
+    names = [("John Smith", 1), ("Anna Smithers", 2), ("Jo Ann Lee", 3), ("Bob Jones", 4)]
+    index = EntityIndex(names)
+
+    assert index.search("SMI") == [("Anna Smithers", 2), ("John Smith", 1)]
+    assert index.search("jo") == [("Bob Jones", 4), ("Jo Ann Lee", 3), ("John Smith", 1)]
+    assert index.search("jo  ann") == [("Jo Ann Lee", 3)]
+    # The limit keeps the first names, not the first matched words
+    assert index.search("jo", limit=1) == [("Bob Jones", 4)]
+    assert index.search("jo", limit=2) == [("Bob Jones", 4), ("Jo Ann Lee", 3)]
+    assert index.search("zz") == []
+    assert index.search(" ", limit=2) == [("Anna Smithers", 2), ("Bob Jones", 4)]
+    assert index.name(3) == "Jo Ann Lee" and index.name(9) is None
+
+    indexes = EntityIndexes()
+    assert len(indexes.get("employee", "v1", lambda: names)) == 4
+    assert len(indexes.get("employee", "v1", lambda: [])) == 4
+    assert len(indexes.get("employee", "v2", lambda: names[:1])) == 1
+    assert indexes.builds == 2
+
+
+# Define a test function called `test_chart_image_of_unknown_entity_is_404`
+def test_chart_image_of_unknown_entity_is_404(client):
+    """
+    Test that the server-rendered chart of a missing employee or team is a 404, not an error.
+    """
+    for path in ("/employee/9999/charts/bar", "/employee/9999/charts/line", "/team/99/charts/bar"):
+        assert client.get(path, follow_redirects=False).status_code == 404
+    response = client.get("/employee/1/charts/bar", follow_redirects=False)
+    assert response.status_code == 307
+    assert client.get(response.headers["location"]).headers["content-type"] == "image/png"
+
+
+# Define a test function called `test_chart_data_of_unknown_entity_is_404`
+def test_chart_data_of_unknown_entity_is_404(client):
+    """
+    Test that the chart data routes answer 404 for a missing employee or team instead of empty data.
+    """
+    for path in ("/api/employee/9999/events", "/api/employee/9999/risk",
+                 "/api/team/99/events", "/api/team/99/risk"):
+        response = client.get(path)
+        assert response.status_code == 404
+        assert "ID 99" in response.json()["detail"]
+
+    events = client.get("/api/employee/1/events", params={"points": 10})
+    assert events.status_code == 200
+    body = events.json()
+    assert set(body) == {"event_date", "positive_events", "negative_events"}
+    assert 0 < len(body["event_date"]) <= 10
+    risk = client.get("/api/team/1/risk")
+    assert risk.status_code == 200 and 0 <= risk.json()["risk"] <= 1
+
+
+# Define a test function called `test_cached_page_with_evicted_chart_is_rendered_again`
+def test_cached_page_with_evicted_chart_is_rendered_again(client, monkeypatch):
+    """
+    Test that a cached page is not served once a chart image it links to was evicted.
+    """
+    import dashboard
+
+    # Room for one page's two charts only
+    monkeypatch.setattr(dashboard, "chart_store", dashboard.ChartStore(maxsize=2))
+    first = client.get("/employee/1")
+    assert first.headers["x-cache"] == "miss"
+    charts = chart_digests(first.text)
+    assert len(charts) == 2
+    assert client.get("/employee/1").headers["x-cache"] == "hit"
+
+    # Another page's charts evict the first page's images
+    client.get("/employee/2")
+    assert not any(dashboard.chart_store.contains(digest) for digest in charts)
+
+    again = client.get("/employee/1")
+    assert again.headers["x-cache"] == "miss"
+    for digest in chart_digests(again.text):
+        assert client.get(f"/charts/{digest}.png").status_code == 200
+
+
+# Define a test function called `test_serving_pages_leaves_the_database_unchanged`
+def test_serving_pages_leaves_the_database_unchanged(client, tmp_path):
+    """
+    Test that starting the dashboard and serving a page never rewrites the database file.
+    """
+    assert client.get("/employee/1").status_code == 200
+    shipped = project_root / "python_package" / "employee_events" / "employee_events.db"
+    assert (tmp_path / "employee_events.db").read_bytes() == shipped.read_bytes()
+    assert not (tmp_path / "employee_events.db-wal").exists()
+
+
+# Define a test function called `test_export_writes_a_static_site`
+def test_export_writes_a_static_site(tmp_path):
+    """
+    Test that the export writes every page once, removes deleted entities and needs no server routes.
+    """
+    db = tmp_path / "employee_events.db"
+    shutil.copy(project_root / "python_package" / "employee_events" / "employee_events.db", db)
+    site = tmp_path / "site"
+    sys.path.insert(0, str(project_root / "report"))
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            import export
+            first = export.export(site, db, workers=2)
+        manifest = json.loads((site / "manifest.json").read_text())
+        keys = [f"{profile}/{entity_id}" for profile, model in export.MODELS.items()
+                for _, entity_id in model().names()]
+        assert sorted(manifest["pages"]) == sorted(keys)
+        assert first == {"rendered": len(keys), "skipped": 0, "removed": 0}
+        for key, page in manifest["pages"].items():
+            assert (site / key / "index.html").is_file()
+            assert page["charts"] and all((site / "charts" / f"{digest}.png").is_file() for digest in page["charts"])
+
+        # Nothing changed, so nothing is rendered again
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert export.export(site, db, workers=2) == {"rendered": 0, "skipped": len(keys), "removed": 0}
+
+        # A deleted employee's page is removed
+        removed = max(entity_id for _, entity_id in export.Employee().names())
+        connection = sqlite3.connect(db)
+        with connection:
+            for table in ("employee_events", "notes", "employee"):
+                connection.execute(f"DELETE FROM {table} WHERE employee_id = ?", [removed])
+        connection.close()
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert export.export(site, db, workers=2)["removed"] == 1
+        assert not (site / "employee" / str(removed) / "index.html").exists()
+        assert f"employee/{removed}" not in json.loads((site / "manifest.json").read_text())["pages"]
+
+        # Pages link each other and use no route of the running app
+        landing = (site / "index.html").read_text()
+        assert 'href="/employee/1/"' in landing and 'href="/team/1/"' in landing
+        server_only = ["/update_data", "/update_dropdown", "/entities/search", 'action="/search"', "/api/",
+                       "data-href", 'method="POST"', 'class="date-range"']
+        for page in site.rglob("*.html"):
+            html = page.read_text()
+            assert not [url for url in server_only if url in html], page
+    finally:
+        sys.path.remove(str(project_root / "report"))
+        configure_pool()
+
+
+def slow_notes(monkeypatch, dashboard, timeout=1.0, delay=3.0):
+    """
+    Make the notes table of every report take `delay` seconds, past a page deadline of `timeout`.
+    """
+    build_notes = dashboard.NotesTable.build_component
+
+    def build_slowly(self, entity_id, model):
+        time.sleep(delay)
+        return build_notes(self, entity_id, model)
+
+    monkeypatch.setattr(dashboard.NotesTable, "build_component", build_slowly)
+    monkeypatch.setattr(dashboard, "Report", functools.partial(dashboard.Report, timeout=timeout))
+
+
+# Define a test function called `test_streamed_report_sends_the_shell_first_and_is_cached`
+def test_streamed_report_sends_the_shell_first_and_is_cached(client):
+    """
+    Test that a streamed page sends its shell before the component slots, fills every slot and is cached.
+    """
+    import dashboard
+
+    # The shell is one chunk with a placeholder per slot; each component follows in its own chunk
+    async def chunks():
+        report = dashboard.Report()
+        request = dashboard.Request({"type": "http", "method": "GET", "path": "/employee/1",
+                                     "query_string": b"", "headers": []})
+        return [chunk async for chunk in report.stream(request, 1, dashboard.DataLoader(dashboard.Employee()))]
+
+    shell, *slots, end = asyncio.run(chunks())
+    assert 'data-slot="visualizations"' in shell and 'data-slot="notes"' in shell
+    assert '<template id="slot-' not in shell and 'id="report-header"' in shell
+    assert sorted(slot.split('"')[1] for slot in slots) == ["slot-notes", "slot-visualizations"]
+    assert end.rstrip().endswith("</html>")
+
+    response = client.get("/employee/1?stream=1")
+    assert response.headers["x-cache"] == "miss" and "etag" not in response.headers
+    body = response.text
+    for name in ("visualizations", "notes"):
+        assert body.index(f'data-slot="{name}"') < body.index(f'<template id="slot-{name}">')
+        assert body.count(f'fillSlot("{name}")') == 1
+
+    # The complete page is cached without placeholders
+    cached = client.get("/employee/1?stream=1")
+    assert cached.headers["x-cache"] == "hit" and cached.headers["etag"]
+    assert '<div data-slot=' not in cached.text and '<template id="slot-' not in cached.text
+    assert chart_digests(cached.text) == chart_digests(body)
+
+
+# Define a test function called `test_streamed_report_falls_back_past_the_deadline`
+def test_streamed_report_falls_back_past_the_deadline(client, monkeypatch):
+    """
+    Test that a streamed component that misses the deadline is sent as its fallback and the page is not cached.
+    """
+    import dashboard
+
+    # Store the charts first, so only the notes are slow
+    client.get("/employee/1")
+    dashboard.page_cache.clear()
+    slow_notes(monkeypatch, dashboard)
+
+    body = client.get("/employee/1?stream=1").text
+    assert f'<template id="slot-notes">{dashboard.NOTES_FALLBACK}</template>' in body
+    assert "Chart not available" not in body
+    assert client.get("/employee/1?stream=1").headers["x-cache"] == "miss"
+
+
+# Define a test function called `test_report_falls_back_past_the_deadline`
+def test_report_falls_back_past_the_deadline(client, monkeypatch):
+    """
+    Test that a component slower than the page deadline is replaced by its fallback and the page is not cached.
+    """
+    import dashboard
+
+    failed = []
+    with ThreadPoolExecutor(1) as threads:
+        slow = threads.submit(time.sleep, 1.0)
+        assert dashboard.component_result(slow, time.monotonic() + 0.1, "Slow", failed) is None
+    assert failed == ["Slow"]
+
+    # Store the charts first, so only the notes are slow
+    client.get("/employee/1")
+    dashboard.page_cache.clear()
+    slow_notes(monkeypatch, dashboard)
+
+    started = time.monotonic()
+    response = client.get("/employee/1")
+    assert time.monotonic() - started < 3.0
+    assert response.status_code == 200
+    assert dashboard.NOTES_FALLBACK in response.text and 'id="report-header"' in response.text
+    assert response.headers["cache-control"] == "no-store" and "etag" not in response.headers
+    assert client.get("/employee/1").headers["x-cache"] == "miss"
+
+
+# Define a test function called `test_stale_risk_scores_are_rescored_in_the_background`
+def test_stale_risk_scores_are_rescored_in_the_background(client, tmp_path):
+    """
+    Test that a request finding stale risk scores answers at once and has them re-scored off the request.
+    """
+    import dashboard
+    from python_package.employee_events import Employee
+    from python_package.employee_events.migrations import migrate
+
+    # Data changed while the dashboard runs: the scores written at startup are stale
+    migrate(tmp_path / "employee_events.db")
+    version = dashboard.BarChart.predictor_version
+    assert not Employee().risk_scores_fresh(version)
+
+    response = client.get("/api/employee/1/risk")
+    assert response.status_code == 200 and response.json()["risk"] is not None
+    deadline = time.monotonic() + 30
+    while not Employee().risk_scores_fresh(version) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert Employee().risk_score(1, version) == pytest.approx(response.json()["risk"])
+
+
+# Define a test function called `test_search_route_escapes_snippets_and_needs_the_index`
+def test_search_route_escapes_snippets_and_needs_the_index(client, tmp_path):
+    """
+    Test that note search is a 503 before the migration, escapes the highlighted notes and accepts punctuation.
+    """
+    from python_package.employee_events.ingest import ingest
+    from python_package.employee_events.migrations import migrate
+
+    response = client.get("/search", params={"q": "leadership"})
+    assert response.status_code == 503 and "migrate" in response.text
+
+    db_path = tmp_path / "employee_events.db"
+    migrate(db_path)
+    note = "Pasted <script>alert(1)</script> & Zyxwv into the review."
+    ingest(notes=[{"employee_id": 1, "note": note, "note_date": "2099-01-01"}], db_path=db_path)
+
+    response = client.get("/search", params={"q": "zyxw"})
+    assert response.status_code == 200
+    assert response.text.count("<li>") == 1
+    assert "&lt;script&gt;alert(1)&lt;/script&gt; &amp; <mark>Zyxwv</mark> into" in response.text
+    assert "<script>alert" not in response.text
+    assert 'href="/employee/1"' in response.text
+
+    # Nothing to match once punctuation is stripped: an empty result, not an FTS syntax error
+    response = client.get("/search", params={"q": '"* -- ()'})
+    assert response.status_code == 200
+    assert "No notes match" in response.text and "<li>" not in response.text
+
+
+# Define a test function called `test_report_revalidates_and_serves_stale_pages_while_refreshing`
+def test_report_revalidates_and_serves_stale_pages_while_refreshing(client, tmp_path):
+    """
+    Test that a matching ETag gets a 304 and that changed data serves the old page while it is refreshed.
+    """
+    from python_package.employee_events.ingest import ingest
+    from python_package.employee_events.migrations import migrate
+
+    path = "/employee/1?start=2099-01-01"
+    first = client.get(path)
+    assert first.headers["x-cache"] == "miss"
+    etag = first.headers["etag"]
+
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 304 and response.content == b""
+    assert response.headers["etag"] == etag and response.headers["x-cache"] == "hit"
+    assert client.get(path, headers={"If-None-Match": '"other"'}).status_code == 200
+
+    # New data makes the cached page stale: it is served once more and rendered again off the request
+    db_path = tmp_path / "employee_events.db"
+    migrate(db_path)
+    ingest(notes=[{"employee_id": 1, "note": "Refreshed note.", "note_date": "2099-01-01"}], db_path=db_path)
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.headers["x-cache"] == "stale" and response.headers["etag"] == etag
+    assert response.text == first.text and "Refreshed note." not in response.text
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        response = client.get(path)
+        if response.headers["x-cache"] == "hit" and "Refreshed note." in response.text:
+            break
+        time.sleep(0.1)
+    assert response.headers["x-cache"] == "hit" and "Refreshed note." in response.text
+    assert response.headers["etag"] != etag
+
+
+# Define a test function called `test_entity_search_route_returns_sorted_prefix_matches`
+def test_entity_search_route_returns_sorted_prefix_matches(client):
+    """
+    Test that the typeahead route returns the first prefix matches by name, up to the limit.
+    """
+    from python_package.employee_events import Employee, Team
+
+    names = Employee().names()
+    prefix = names[0][0].split()[-1][:2].casefold()
+    expected = sorted(
+        ((name, entity_id) for name, entity_id in names
+         if any(word.startswith(prefix) for word in name.casefold().split())),
+        key=lambda entity: (entity[0].casefold(), entity[1]),
+    )
+    assert expected
+    as_json = lambda entities: [{"id": entity_id, "name": name} for name, entity_id in entities]
+
+    response = client.get("/entities/search", params={"type": "employee", "q": prefix.upper(), "limit": 50})
+    assert response.status_code == 200
+    assert response.json() == {"results": as_json(expected[:50]), "total": len(names)}
+    response = client.get("/entities/search", params={"type": "employee", "q": prefix, "limit": 1})
+    assert response.json()["results"] == as_json(expected[:1])
+
+    teams = client.get("/entities/search", params={"type": "team", "limit": 2}).json()
+    assert teams["total"] == len(Team().names()) and len(teams["results"]) == 2
+    names = [team["name"].casefold() for team in teams["results"]]
+    assert names == sorted(names)
+
+    assert client.get("/entities/search", params={"type": "project"}).status_code == 422
+    assert client.get("/entities/search", params={"type": "team", "limit": 0}).status_code == 422
+
+    # The landing and report pages share one copy of the typeahead script
+    for path in ("/", "/employee/1"):
+        assert client.get(path).text.count("const TYPEAHEAD_DELAY = ") == 1